@@ -0,0 +1,207 @@
+"""
+In-process or subprocess aiohttp server imitating the Bybit endpoints the client calls.
+
+Bodies are encoded once per page size, so the server adds as little as possible to the
+measured time.
+"""
+import asyncio
+import hashlib
+import hmac
+import json
+import multiprocessing
+import time
+
+from aiohttp import web
+
+from . import _payloads
+
+ONLINE_ADS = "/v5/p2p/item/online"
+ACCOUNT_INFO = "/v5/p2p/user/personal/info"
+ADS_LIST = "/v5/p2p/item/personal/list"
+BALANCE = "/v5/asset/transfer/query-account-coins-balance"
+SERVER_TIME = "/v5/market/time"
+UPDATE_AD = "/v5/p2p/item/update"
+ORDER_LIST = "/v5/p2p/order/simplifyList"
+ORDER_INFO = "/v5/p2p/order/info"
+
+
+def _encode(data: dict) -> bytes:
+    return json.dumps(data, separators=(",", ":")).encode()
+
+
+class FakeBybitServer:
+    """
+    Args:
+        host (str, optional): Bind address. Default 127.0.0.1.
+        port (int, optional): Port, 0 picks a free one. Default 0.
+        latency (float, optional): Seconds added to every response, to imitate the network.
+        api_key, api_secret (str, optional): When both are given, HMAC signatures are checked and
+            bad ones answered with retCode 10004.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.0,
+        api_key: str = None,
+        api_secret: str = None
+    ):
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.api_key = api_key
+        self.api_secret = api_secret
+
+        self.requests = 0
+        # Params of every UPDATE_AD call, in order.
+        self.updates = []
+        # Raw orders ORDER_LIST and ORDER_INFO answer from, newest first. Tests fill it in.
+        self.orders = []
+        self._bodies = {}
+        self._runner = None
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def _body(self, key, build) -> bytes:
+        body = self._bodies.get(key)
+        if body is None:
+            body = self._bodies[key] = _encode(build())
+        return body
+
+    def _check_signature(self, request: web.Request, payload: str) -> bool:
+        if self.api_secret is None:
+            return True
+
+        headers = request.headers
+        sign_string = headers["X-BAPI-TIMESTAMP"] + self.api_key + headers["X-BAPI-RECV-WINDOW"] + payload
+        expected = hmac.new(self.api_secret.encode(), sign_string.encode(), hashlib.sha256).hexdigest()
+        return hmac.compare_digest(expected, headers.get("X-BAPI-SIGN", ""))
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        self.requests += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+        path = request.path
+        if path == SERVER_TIME:
+            now = time.time()
+            return web.Response(
+                body=_encode({
+                    "retCode": 0,
+                    "retMsg": "OK",
+                    "result": {"timeSecond": str(int(now)), "timeNano": str(int(now * 10 ** 9))},
+                    "time": int(now * 1000),
+                }),
+                content_type="application/json"
+            )
+
+        if request.method == "GET":
+            payload = request.query_string
+            params = dict(request.query)
+        else:
+            payload = await request.text()
+            params = json.loads(payload) if payload else {}
+
+        if not self._check_signature(request, payload):
+            return web.Response(
+                body=_encode({"retCode": 10004, "retMsg": "error sign!", "result": {}, "time": 0}),
+                content_type="application/json"
+            )
+
+        if path == ONLINE_ADS:
+            size = int(params.get("size", 10))
+            body = self._body((path, size), lambda: _payloads.ads_response(size, total_count=size * 10))
+        elif path == ADS_LIST:
+            size = int(params.get("size", 10))
+            body = self._body((path, size), lambda: _payloads.ads_list_response(size))
+        elif path == ACCOUNT_INFO:
+            body = self._body(path, _payloads.account_info_response)
+        elif path == BALANCE:
+            body = self._body(path, _payloads.balance_response)
+        elif path == UPDATE_AD:
+            self.updates.append(params)
+            body = self._body(path, _payloads.update_ad_response)
+        elif path == ORDER_LIST:
+            page, size = int(params.get("page", 1)), int(params.get("size", 30))
+            begin = int(params.get("beginTime") or 0)
+            end = int(params.get("endTime") or 2 ** 63)
+            matched = [item for item in self.orders if begin <= int(item["createDate"]) <= end]
+            body = _encode(_payloads.orders_response(matched[(page - 1) * size:page * size], len(matched)))
+        elif path == ORDER_INFO:
+            found = [item for item in self.orders if item["id"] == params.get("orderId")]
+            if not found:
+                body = _encode({"retCode": 912100202, "retMsg": "Order does not exist", "result": {}, "time": 0})
+            else:
+                body = _encode(_payloads.order_detail_response(found[0]))
+        else:
+            return web.Response(status=404)
+
+        return web.Response(body=body, content_type="application/json")
+
+    async def start(self) -> str:
+        app = web.Application()
+        app.router.add_route("*", "/{tail:.*}", self._handle)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        self.port = site._server.sockets[0].getsockname()[1]
+        return self.url
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def __aenter__(self) -> "FakeBybitServer":
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.stop()
+
+
+def _serve(kwargs: dict, ready, port) -> None:
+    async def main():
+        server = FakeBybitServer(**kwargs)
+        await server.start()
+        port.value = server.port
+        ready.set()
+        await asyncio.Event().wait()
+
+    asyncio.run(main())
+
+
+class FakeBybitProcess:
+    """
+    FakeBybitServer in a child process, so the server does not share the event loop and the CPU
+    with the client being measured.
+    """
+
+    def __init__(self, **kwargs):
+        self._kwargs = kwargs
+        self._process = None
+        self.host = kwargs.get("host", "127.0.0.1")
+        self.port = None
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def __enter__(self) -> "FakeBybitProcess":
+        ready = multiprocessing.Event()
+        port = multiprocessing.Value("i", 0)
+        self._process = multiprocessing.Process(target=_serve, args=(self._kwargs, ready, port), daemon=True)
+        self._process.start()
+        if not ready.wait(10):
+            self._process.terminate()
+            raise RuntimeError("Fake server did not start")
+        self.port = port.value
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self._process.terminate()
+        self._process.join()
@@ -0,0 +1,324 @@
+"""
+Synthetic API payloads shaped like real Bybit P2P responses.
+"""
+import random
+
+PAYMENT_IDS = ["14", "75", "377", "382", "581", "585", "62", "64"]
+
+
+def payment_term(i: int) -> dict:
+    return {
+        "accountNo": "",
+        "bankName": "Tinkoff",
+        "branchName": "",
+        "businessName": "",
+        "clabe": "",
+        "concept": "",
+        "debitCardNumber": "",
+        "firstName": "",
+        "id": str(9000 + i),
+        "lastName": "",
+        "mobile": "",
+        "payMessage": "",
+        "paymentConfig": {
+            "paymentDialect": "Tinkoff",
+            "paymentName": "Tinkoff",
+            "paymentTemplateItem": [
+                {"fieldName": "realName", "labelDialect": "Name", "placeholderDialect": "Enter name"},
+                {"fieldName": "accountNo", "labelDialect": "Account", "placeholderDialect": "Enter account"},
+            ],
+            "paymentType": 75,
+        },
+        "paymentExt1": "",
+        "paymentExt2": "",
+        "paymentExt3": "",
+        "paymentExt4": "",
+        "paymentExt5": "",
+        "paymentExt6": "",
+        "paymentTemplateVersion": 1,
+        "paymentType": "75",
+        "qrcode": "",
+        "realName": "Ivan Ivanov",
+        "realNameVerified": True,
+        "secondLastName": "",
+        "visible": 1,
+    }
+
+
+def market_ad(
+    i: int,
+    price: float = 95.0,
+    side: int = 1,
+    token_id: str = "USDT",
+    currency_id: str = "RUB",
+    rng: random.Random = None
+) -> dict:
+    rng = rng or random.Random(i)
+    payments = rng.sample(PAYMENT_IDS, rng.randint(1, 3))
+    last_quantity = round(rng.uniform(50, 20000), 4)
+
+    return {
+        "accountId": str(100000 + i),
+        "authStatus": 2,
+        "authTag": ["GA"],
+        "ban": False,
+        "baned": False,
+        "blocked": "",
+        "createDate": str(1730000000000 + i * 1000),
+        "currencyId": currency_id,
+        "executedQuantity": f"{rng.uniform(0, 500):.4f}",
+        "fee": "",
+        "finishNum": str(rng.randint(0, 5000)),
+        "frozenQuantity": "0.0000",
+        "id": str(1900000000000000000 + i),
+        "isOnline": True,
+        "itemType": "ORIGIN",
+        "lastLogoutTime": "1730000000000",
+        "lastQuantity": f"{last_quantity:.4f}",
+        "makerContact": False,
+        "maxAmount": f"{last_quantity * price:.2f}",
+        "minAmount": f"{rng.choice([500, 1000, 5000, 10000]):.2f}",
+        "nickName": f"trader_{i}",
+        "orderNum": rng.randint(0, 5000),
+        "paymentPeriod": 15,
+        "payments": payments,
+        "premium": "",
+        "price": f"{price:.2f}",
+        "priceType": 0,
+        "quantity": f"{last_quantity + 100:.4f}",
+        "recentExecuteRate": rng.randint(80, 100),
+        "recentOrderNum": rng.randint(0, 500),
+        "recommend": False,
+        "recommendTag": "",
+        "remark": "Fast release. Only verified accounts, no third party payments please.",
+        "side": side,
+        "status": 10,
+        "subsidyAd": False,
+        "symbolInfo": {
+            "buyAd": None,
+            "buyFeeRate": "0",
+            "currency": {"currencyId": currency_id, "exchangeId": "301", "id": "11", "orgId": "9001", "scale": 2},
+            "currencyId": currency_id,
+            "currencyLowerMaxQuote": "1000",
+            "currencyMaxQuote": "10000000",
+            "currencyMinQuote": "100",
+            "exchangeId": "301",
+            "id": "5",
+            "itemDownRange": "80",
+            "itemSideLimit": 2,
+            "itemUpRange": "120",
+            "kycCurrencyLimit": "1000000",
+            "lowerLimitAlarm": 90,
+            "orderAutoCancelMinute": 15,
+            "orderFinishMinute": 15,
+            "orgId": "9001",
+            "sellAd": None,
+            "sellFeeRate": "0",
+            "status": 1,
+            "token": {"exchangeId": "301", "id": "1", "orgId": "9001", "scale": "4", "sequence": 1, "tokenId": token_id},
+            "tokenId": token_id,
+            "tokenMaxQuote": "1000000",
+            "tokenMinQuote": "1",
+            "tradeSide": 9,
+            "upperLimitAlarm": 110,
+        },
+        "tokenId": token_id,
+        "tokenName": token_id,
+        "tradingPreferenceSet": {
+            "completeRateDay30": "",
+            "hasCompleteRateDay30": 0,
+            "hasNationalLimit": 0,
+            "hasOrderFinishNumberDay30": 0,
+            "hasRegisterTime": 0,
+            "hasUnPostAd": 0,
+            "isEmail": 0,
+            "isKyc": 1,
+            "isMobile": 0,
+            "nationalLimit": "",
+            "orderFinishNumberDay30": 0,
+            "registerTimeThreshold": 0,
+        },
+        "updateDate": str(1730000500000 + i * 1000),
+        "userId": str(200000 + i),
+        "userMaskId": f"s{i:08x}",
+        "userType": "PERSONAL",
+        "verificationOrderAmount": "0",
+        "verificationOrderLabels": [],
+        "verificationOrderSwitch": False,
+        "version": 3,
+        "paymentTerms": [payment_term(i)],
+        "feeRate": "0",
+    }
+
+
+def market_ads(count: int, side: int = 1, token_id: str = "USDT", currency_id: str = "RUB", seed: int = 0) -> list:
+    """
+    A book of `count` ads, sorted best price first.
+    """
+
+    rng = random.Random(seed)
+    prices = sorted(round(rng.uniform(90, 100), 2) for _ in range(count))
+    if side == 0:
+        prices.reverse()
+    return [market_ad(i, price, side, token_id, currency_id, rng) for i, price in enumerate(prices)]
+
+
+def ads_response(count: int, total_count: int = None, **kwargs) -> dict:
+    return {
+        "retCode": 0,
+        "retMsg": "SUCCESS",
+        "result": {"count": total_count if total_count is not None else count, "items": market_ads(count, **kwargs)},
+        "retExtInfo": {},
+        "time": 1730000000000,
+    }
+
+
+def _response(result: dict) -> dict:
+    return {
+        "retCode": 0,
+        "retMsg": "SUCCESS",
+        "result": result,
+        "retExtInfo": {},
+        "time": 1730000000000,
+    }
+
+
+def ads_list_response(count: int, **kwargs) -> dict:
+    """
+    GET_ADS_LIST page: the account's own ads.
+    """
+
+    items = market_ads(count, **kwargs)
+    for item in items:
+        item["userId"] = "200000"
+        item["nickName"] = "my_desk"
+    return _response({"count": count, "hiddenFlag": False, "items": items})
+
+
+def update_ad_response() -> dict:
+    return _response({
+        "needSecurityRisk": False,
+        "riskTokenType": "",
+        "riskVersion": "",
+        "securityRiskToken": "",
+    })
+
+
+def order(i: int, create_date: int, status: int = 50, side: int = 1) -> dict:
+    """
+    GET_ORDERS item: one of the account's orders.
+    """
+
+    return {
+        "id": str(1900000000000000000 + i),
+        "side": side,
+        "tokenId": "USDT",
+        "orderType": "ORIGIN",
+        "amount": f"{(i % 50 + 1) * 1000:.2f}",
+        "currencyId": "RUB",
+        "price": "92.50",
+        "notifyTokenQuantity": "",
+        "notifyTokenId": "",
+        "fee": "0",
+        "targetNickName": f"taker_{i}",
+        "targetUserId": str(300000 + i),
+        "status": status,
+        "selfUnreadMsgCount": "0",
+        "createDate": str(create_date),
+        "transferLastSeconds": "0",
+        "appealLastSeconds": "0",
+        "userId": "200000",
+        "sellerRealName": "",
+        "buyerRealName": "",
+        "judgeInfo": {"autoJudgeUnlockTime": "0", "dissentResult": "", "preDissent": "", "postDissent": ""},
+        "unreadMsgCount": "0",
+        "extension": {"isDelayWithdraw": False, "delayTime": "0", "startTime": "0"},
+        "bulkOrderFlag": False,
+    }
+
+
+def orders_response(items: list, count: int) -> dict:
+    return _response({"count": count, "items": items})
+
+
+def order_detail_response(item: dict) -> dict:
+    detail = dict(item)
+    detail.update({
+        "nickName": "my_desk",
+        "makerUserId": "200000",
+        "itemId": "1800000000000000000",
+        "quantity": f"{float(item['amount']) / 92.5:.4f}",
+        "paymentType": 377,
+        "paymentTermList": [payment_term(0)],
+        "confirmedPayTerm": payment_term(0),
+        "remark": "",
+        "transferDate": "0",
+        "updateDate": item["createDate"],
+        "cancelReason": "",
+    })
+    return _response(detail)
+
+
+def account_info_response() -> dict:
+    return _response({
+        "accountCreateDays": 712,
+        "accountId": "100000",
+        "authStatus": 2,
+        "averageReleaseTime": "1",
+        "averageTransferTime": "3",
+        "badAppraiseCount": 2,
+        "blocked": "",
+        "canSubOnline": True,
+        "contactConfig": False,
+        "contactCount": 0,
+        "curPrivilegeInfo": [{"name": "VA", "data": "1"}, {"name": "BA", "data": "0"}],
+        "defaultNickName": False,
+        "email": "a***@example.com",
+        "executeNum": 5120,
+        "firstTradeDays": 701,
+        "goodAppraiseCount": 2310,
+        "goodAppraiseRate": "99",
+        "hasUnPostAd": 0,
+        "isOnline": True,
+        "kycCountryCode": "RU",
+        "kycLevel": 2,
+        "last30TradeCurrency": ["RUB", "KZT"],
+        "lastLogoutTime": "1730000000000",
+        "lostRoleAffected": False,
+        "mobile": "",
+        "nickName": "my_desk",
+        "openApiSwitch": 1,
+        "orderNum": 5300,
+        "paymentCount": 6,
+        "paymentRealNameUneditable": True,
+        "realName": "Ivan Ivanov",
+        "realNameEn": "Ivan Ivanov",
+        "realNameMask": "I*** I***",
+        "recentFinishCount": 420,
+        "recentRate": 98,
+        "recentTradeAmount": "412345.12",
+        "registerTime": "1668000000000",
+        "totalFinishBuyCount": 2500,
+        "totalFinishCount": 5100,
+        "totalFinishSellCount": 2600,
+        "totalTradeAmount": "8812345.55",
+        "userCancelCountLimit": 3,
+        "userCurPrivilege": ["VA"],
+        "userId": "200000",
+        "userTag": [],
+        "userType": "PERSONAL",
+        "vipLevel": 1,
+        "vipProfit": [],
+        "whiteFlag": 0,
+    })
+
+
+def balance_response(coins=("USDT", "BTC", "ETH", "USDC", "TON")) -> dict:
+    return _response({
+        "accountType": "FUND",
+        "memberId": "200000",
+        "balance": [
+            {"coin": coin, "bonus": "0", "transferBalance": f"{1000 + i * 13.5:.8f}", "walletBalance": f"{1000 + i * 13.5:.8f}"}
+            for i, coin in enumerate(coins)
+        ],
+    })
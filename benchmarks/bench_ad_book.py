@@ -0,0 +1,87 @@
+"""
+Order book analytics: loops over MarketAd lists against the columnar AdBook.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_ad_book
+"""
+import time
+
+from bybit_p2p_async._ad_book import AdBook
+from bybit_p2p_async._classes import MarketAd
+
+from ._payloads import market_ads
+
+PAGE_SIZES = [100, 500, 2000]
+REPEAT = 50
+AMOUNT = 250000.0
+
+
+def best_time(func):
+    best = float("inf")
+    for _ in range(REPEAT):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def models_vwap(ads, amount):
+    left, quantity = amount, 0.0
+    for ad in sorted(ads, key=lambda ad: ad.price):
+        fiat = min(ad.max_amount, ad.last_quantity * ad.price, left)
+        quantity += fiat / ad.price
+        left -= fiat
+        if left <= 0:
+            return amount / quantity
+    return None
+
+
+def models_depth_at(ads, price):
+    return sum(min(ad.max_amount, ad.last_quantity * ad.price) for ad in ads if ad.price <= price)
+
+
+def models_filter(ads, payments, amount):
+    return [
+        ad for ad in ads
+        if set(ad._data["payments"]) & payments and ad.min_amount <= amount <= ad.max_amount
+    ]
+
+
+def models_best_match(ads, payments, amount):
+    return min(models_filter(ads, payments, amount), key=lambda ad: ad.price, default=None)
+
+
+def main():
+    print(f"{'ads':>6}{'operation':>16}{'MarketAd, us':>16}{'AdBook, us':>14}")
+    for size in PAGE_SIZES:
+        items = market_ads(size)
+        ads = [MarketAd.from_dict(item) for item in items]
+        book = AdBook(items)
+        mid_price = book.prices[len(book) // 2]
+
+        assert abs(models_vwap(ads, AMOUNT) - book.vwap(AMOUNT)) < 1e-9
+        assert abs(models_depth_at(ads, mid_price) - book.depth_at(mid_price)) < 1e-6
+
+        rows = [
+            ("build", lambda: [MarketAd.from_dict(item) for item in items], lambda: AdBook(items)),
+            ("best price", lambda: min(ad.price for ad in ads), book.best_price),
+            ("vwap", lambda: models_vwap(ads, AMOUNT), lambda: book.vwap(AMOUNT)),
+            ("depth at price", lambda: models_depth_at(ads, mid_price), lambda: book.depth_at(mid_price)),
+            (
+                "filter",
+                lambda: models_filter(ads, {"75", "377"}, 5000.0),
+                lambda: book.filter(payments=["75", "377"], amount=5000.0)
+            ),
+            (
+                "best match",
+                lambda: models_best_match(ads, {"75", "377"}, 5000.0),
+                lambda: book.best_match(payments=["75", "377"], amount=5000.0)
+            ),
+        ]
+        for name, models, columnar in rows:
+            print(f"{size:>6}{name:>16}{best_time(models) * 1e6:>16.1f}{best_time(columnar) * 1e6:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
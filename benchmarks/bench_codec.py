@@ -0,0 +1,74 @@
+"""
+JSON decode and encode cost of the available codecs on realistic GET_ONLINE_ADS pages.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_codec
+"""
+import json
+import time
+
+from bybit_p2p_async._codec import JsonCodec, MsgspecCodec, OrjsonCodec
+
+from ._payloads import ads_response
+
+PAGE_SIZES = [20, 100, 500]
+REPEAT = 30
+REQUEST_BODY = {
+    "tokenId": "USDT",
+    "currencyId": "RUB",
+    "side": "1",
+    "verificationFilter": 2,
+    "vaMaker": False,
+    "page": "1",
+    "size": "100",
+    "itemRegion": 1,
+    "canTrade": False,
+    "bulkMaker": False,
+    "payment": ["75", "377"],
+    "paymentPeriod": [],
+    "sortType": "OVERALL_RANKING",
+}
+
+
+def available_codecs():
+    codecs = [JsonCodec()]
+    for codec_cls in (OrjsonCodec, MsgspecCodec):
+        try:
+            codecs.append(codec_cls())
+        except ImportError:
+            print(f"{codec_cls.name} is not installed, skipped")
+    return codecs
+
+
+def best_time(func, arg, repeat=REPEAT):
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func(arg)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main():
+    codecs = available_codecs()
+
+    print()
+    print(f"{'ads':>6}{'size, KiB':>12}" + "".join(f"{codec.name + ', ms':>16}" for codec in codecs) + f"{'speedup':>10}")
+    for size in PAGE_SIZES:
+        body = json.dumps(ads_response(size)).encode()
+        timings = [best_time(codec.loads, body) for codec in codecs]
+        print(
+            f"{size:>6}{len(body) / 1024:>12.1f}"
+            + "".join(f"{value * 1000:>16.3f}" for value in timings)
+            + f"{timings[0] / min(timings):>9.1f}x"
+        )
+
+    print()
+    print(f"{'request body encode':<22}" + "".join(f"{codec.name + ', us':>16}" for codec in codecs))
+    timings = [best_time(codec.dumps, REQUEST_BODY, 1000) for codec in codecs]
+    print(f"{'':<22}" + "".join(f"{value * 1e6:>16.2f}" for value in timings))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+MarketAd construction time and memory: eager 1.0.1 models against the slotted lazy models.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_models
+"""
+import gc
+import time
+import tracemalloc
+
+from bybit_p2p_async._classes import MarketAd
+
+from . import _legacy
+from ._payloads import market_ads
+
+PAGE_SIZES = [100, 500, 2000]
+REPEAT = 20
+
+
+def best_time(func, items):
+    best = float("inf")
+    for _ in range(REPEAT):
+        started = time.perf_counter()
+        func(items)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def retained_memory(func, items):
+    gc.collect()
+    tracemalloc.start()
+    result = func(items)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return current
+
+
+def legacy(items):
+    return [_legacy.MarketAd(**item) for item in items]
+
+
+def lazy(items):
+    return [MarketAd.from_dict(item) for item in items]
+
+
+def lazy_price_and_limit(items):
+    ads = [MarketAd.from_dict(item) for item in items]
+    for ad in ads:
+        ad.price
+        ad.max_amount
+    return ads
+
+
+def main():
+    print(f"{'ads':>6}{'variant':>24}{'build, ms':>12}{'per ad, us':>12}{'retained, KiB':>16}")
+    for size in PAGE_SIZES:
+        items = market_ads(size)
+        for name, func in [
+            ("legacy eager", legacy),
+            ("lazy", lazy),
+            ("lazy + price/max", lazy_price_and_limit),
+        ]:
+            elapsed = best_time(func, items)
+            memory = retained_memory(func, items)
+            print(f"{size:>6}{name:>24}{elapsed * 1000:>12.3f}{elapsed / size * 1e6:>12.2f}{memory / 1024:>16.1f}")
+
+
+if __name__ == "__main__":
+    main()
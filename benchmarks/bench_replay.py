@@ -0,0 +1,76 @@
+"""
+Replay speed: a synthetic day of USDT/RUB snapshots every 2 seconds, replayed through
+get_ad_book() and get_market_ads() by a trivial strategy.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_replay
+    python -m benchmarks.bench_replay --snapshots 100000 --ads 200
+"""
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+
+from bybit_p2p_async import AdHistoryWriter, ReplayEngine
+
+from ._payloads import ads_response
+
+START_MS = 1730000000000
+STEP_MS = 2000
+
+
+def record(path: str, snapshots: int, ads: int) -> float:
+    random.seed(1)
+    items = ads_response(ads)["result"]["items"]
+    started = time.perf_counter()
+    with AdHistoryWriter(path) as history:
+        for i in range(snapshots):
+            # A few ads reprice between snapshots, like a live market.
+            for item in random.sample(items, min(5, len(items))):
+                item["price"] = f"{90 + random.random() * 5:.2f}"
+            history.append(items, START_MS + i * STEP_MS)
+    return time.perf_counter() - started
+
+
+async def replay(path: str, call: str, latency: float) -> dict:
+    async def strategy(client, now):
+        if call == "book":
+            status, (count, book) = await client.get_ad_book(token_id="USDT", currency_id="RUB", side="buy")
+            book.best_price()
+        else:
+            status, (count, ads) = await client.get_market_ads(token_id="USDT", currency_id="RUB", side="buy", size=20)
+            ads[0].price
+
+    engine = ReplayEngine(path, strategy, latency=latency)
+    try:
+        return await engine.run()
+    finally:
+        engine.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--snapshots", type=int, default=43200, help="Recorded snapshots. Default: one day.")
+    parser.add_argument("--ads", type=int, default=100, help="Ads per snapshot.")
+    parser.add_argument("--latency", type=float, default=0.05, help="Simulated round trip, seconds.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "history.bpah")
+        elapsed = record(path, args.snapshots, args.ads)
+        size = os.path.getsize(path)
+        print(f"recorded {args.snapshots} snapshots of {args.ads} ads in {elapsed:.2f} s, "
+              f"{size / 2 ** 20:.1f} MiB, {size / args.snapshots:.0f} bytes per snapshot")
+        print()
+
+        print(f"{'call':<16}{'books/s':>12}{'speed-up':>12}{'wall, s':>10}")
+        for call in ("book", "market_ads"):
+            stats = asyncio.run(replay(path, call, args.latency))
+            print(f"{call:<16}{stats['books_per_second']:>12.0f}{stats['speedup']:>11.0f}x{stats['wall_seconds']:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Per-call request preparation: the 1.0.1 casting scans against compiled request plans.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_request_plan
+"""
+import json
+import timeit
+
+from bybit_p2p_async._codec import JsonCodec
+from bybit_p2p_async._p2p_helper import P2PMethods
+from bybit_p2p_async._p2p_method import P2PMethod
+from bybit_p2p_async._request_plan import RequestPlan
+
+from ._legacy import RequestPreparation
+
+NUMBER = 20000
+
+MARKET_ADS_PARAMS = {
+    "tokenId": "USDT",
+    "currencyId": "RUB",
+    "side": "1",
+    "verificationFilter": 2,
+    "vaMaker": False,
+    "page": "1",
+    "size": "100",
+    "itemRegion": 1,
+    "canTrade": False,
+    "bulkMaker": False,
+    "payment": ["75", "377"],
+    "paymentPeriod": [],
+    "sortType": "OVERALL_RANKING",
+}
+# Numbers that have to become strings, including inside tradingPreferenceSet.
+UPDATE_AD_PARAMS = {
+    "id": 1900000000000000001,
+    "priceType": 0,
+    "premium": "",
+    "price": 95.5,
+    "minAmount": 1000.0,
+    "maxAmount": 150000,
+    "remark": "Fast release",
+    "tradingPreferenceSet": {
+        "hasUnPostAd": 0,
+        "isKyc": 1,
+        "isEmail": 0,
+        "isMobile": 0,
+        "hasRegisterTime": 0,
+        "registerTimeThreshold": 0,
+        "orderFinishNumberDay30": 0,
+        "completeRateDay30": "",
+        "nationalLimit": "",
+        "hasOrderFinishNumberDay30": 0,
+        "hasCompleteRateDay30": 0,
+        "hasNationalLimit": 0,
+    },
+    "paymentIds": ["9001"],
+    "actionType": "MODIFY",
+    "quantity": 1500,
+    "paymentPeriod": 15,
+}
+UPDATE_AD = P2PMethod("/v5/p2p/item/update", "POST", ["id", "price"])
+
+
+def copy(params):
+    # The legacy code casts in place, so every call gets a fresh copy, as P2PRequests builds one per call.
+    return json.loads(json.dumps(params))
+
+
+def main():
+    legacy = RequestPreparation()
+    codec = JsonCodec()
+
+    print(f"{'params':<14}{'variant':<22}{'per call, us':>14}")
+    for name, method, params in [
+        ("market ads", P2PMethods.GET_ONLINE_ADS, MARKET_ADS_PARAMS),
+        ("update ad", UPDATE_AD, UPDATE_AD_PARAMS),
+    ]:
+        plan = RequestPlan(method, "https://api.bybit.com")
+        assert json.loads(plan.encode(plan.prepare(copy(params)), codec)) == json.loads(
+            legacy.prepare(method.required_params, copy(params))
+        )
+
+        fresh = [copy(params) for _ in range(NUMBER)]
+        it = iter(fresh)
+        legacy_cast = timeit.timeit(lambda: legacy._cast_values(next(it)), number=NUMBER)
+        plan_cast = timeit.timeit(lambda: plan.prepare(params) if not plan.missing(params) else None, number=NUMBER)
+
+        fresh = [copy(params) for _ in range(NUMBER)]
+        it = iter(fresh)
+        legacy_full = timeit.timeit(lambda: legacy.prepare(method.required_params, next(it)), number=NUMBER)
+        plan_full = timeit.timeit(
+            lambda: plan.encode(plan.prepare(params), codec) if not plan.missing(params) else None,
+            number=NUMBER
+        )
+
+        for variant, elapsed in [
+            ("legacy cast", legacy_cast),
+            ("plan cast", plan_cast),
+            ("legacy cast + json", legacy_full),
+            ("plan cast + json", plan_full),
+        ]:
+            print(f"{name:<14}{variant:<22}{elapsed / NUMBER * 1e6:>14.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+"""
+End-to-end request path against a local fake Bybit server: requests per second and p50/p99
+latency per endpoint and concurrency level, plus the per-call cost of the client-side steps
+(signing, JSON decode, MarketAd construction).
+
+Run from the repository root:
+
+    python -m benchmarks.bench_requests
+    python -m benchmarks.bench_requests --concurrency 1,16,64 --requests 2000 --json after.json
+    python -m benchmarks.bench_requests --compare before.json
+
+--json writes the results for regression tracking, --compare prints the change against a saved run.
+"""
+import argparse
+import asyncio
+import json
+import platform
+import sys
+import time
+import timeit
+
+import aiohttp
+
+from bybit_p2p_async import P2P
+from bybit_p2p_async._classes import MarketAd
+from bybit_p2p_async._codec import default_codec
+from bybit_p2p_async._signer import HmacSigner
+
+from ._fake_server import FakeBybitProcess, FakeBybitServer
+from ._payloads import ads_response
+
+API_KEY = "XXXXXXXXXXXXXXXXXX"
+API_SECRET = "YYYYYYYYYYYYYYYYYYYYYYYYYYYYYYYYYYYY"
+ADS_PAGE = 100
+
+ENDPOINTS = {
+    "online_ads": lambda api: api.get_market_ads(currency_id="RUB", size=ADS_PAGE),
+    "online_ads_raw": lambda api: api.get_market_ads(currency_id="RUB", size=ADS_PAGE, raw=True),
+    "online_ads_bytes": lambda api: api.get_market_ads_bytes(currency_id="RUB", size=ADS_PAGE),
+    "account_info": lambda api: api.get_account_information(),
+    "ads_list": lambda api: api.get_ads_list(size=50),
+    "balance": lambda api: api.get_current_balance(),
+}
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+async def measure(base_url: str, endpoint: str, concurrency: int, requests: int) -> dict:
+    call = ENDPOINTS[endpoint]
+    latencies = []
+
+    async with P2P(
+        api_key=API_KEY,
+        api_secret=API_SECRET,
+        base_url=base_url,
+        rate_limit=False,
+        pool_limit=max(100, concurrency)
+    ) as api:
+        # Warm up the pool, the request plans and the server-side body cache.
+        await asyncio.gather(*(call(api) for _ in range(min(concurrency, 32))))
+
+        remaining = requests
+
+        async def worker():
+            nonlocal remaining
+            while remaining > 0:
+                remaining -= 1
+                started = time.perf_counter()
+                status, data = await call(api)
+                latencies.append(time.perf_counter() - started)
+                if not status:
+                    raise RuntimeError(f"{endpoint}: {data}")
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    return {
+        "bench": "request",
+        "endpoint": endpoint,
+        "concurrency": concurrency,
+        "rps": len(latencies) / elapsed,
+        "p50_ms": percentile(latencies, 0.5) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+    }
+
+
+def components() -> list:
+    codec = default_codec()
+    signer = HmacSigner(API_KEY, API_SECRET, 5000)
+    payload = codec.dumps({"tokenId": "USDT", "currencyId": "RUB", "side": "1", "page": "1", "size": str(ADS_PAGE)})
+    body = codec.dumps(ads_response(ADS_PAGE))
+    items = codec.loads(body)["result"]["items"]
+
+    def build_ads():
+        for ad in [MarketAd.from_dict(item) for item in items]:
+            ad.price
+
+    results = []
+    for name, func, number in [
+        ("sign", lambda: signer.sign(1730000000000, payload), 20000),
+        (f"decode_{ADS_PAGE}_ads", lambda: codec.loads(body), 200),
+        (f"build_{ADS_PAGE}_ads", build_ads, 200),
+    ]:
+        best = min(timeit.repeat(func, number=number, repeat=5)) / number
+        results.append({"bench": "component", "endpoint": name, "concurrency": 0, "us": best * 1e6})
+    return results
+
+
+def key(result: dict) -> tuple:
+    return (result["bench"], result["endpoint"], result["concurrency"])
+
+
+def print_results(results: list, baseline: dict) -> None:
+    def change(result, field):
+        old = baseline.get(key(result))
+        if old is None or not old.get(field):
+            return ""
+        return f"{(result[field] / old[field] - 1) * 100:+7.1f}%"
+
+    print(f"{'endpoint':<16}{'conc':>6}{'rps':>10}{'':>9}{'p50, ms':>10}{'p99, ms':>10}{'':>9}")
+    for result in results:
+        if result["bench"] != "request":
+            continue
+        print(
+            f"{result['endpoint']:<16}{result['concurrency']:>6}{result['rps']:>10.0f}{change(result, 'rps'):>9}"
+            f"{result['p50_ms']:>10.2f}{result['p99_ms']:>10.2f}{change(result, 'p99_ms'):>9}"
+        )
+
+    print()
+    print(f"{'component':<22}{'per call, us':>14}{'':>9}")
+    for result in results:
+        if result["bench"] == "component":
+            print(f"{result['endpoint']:<22}{result['us']:>14.2f}{change(result, 'us'):>9}")
+
+
+async def run_requests(base_url: str, endpoints, levels, requests) -> list:
+    results = []
+    for endpoint in endpoints:
+        for concurrency in levels:
+            results.append(await measure(base_url, endpoint, concurrency, requests))
+    return results
+
+
+async def run_in_process(endpoints, levels, requests, latency) -> list:
+    async with FakeBybitServer(latency=latency) as server:
+        return await run_requests(server.url, endpoints, levels, requests)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", default="1,8,32,128", help="Comma separated concurrency levels.")
+    parser.add_argument("--requests", type=int, default=1000, help="Requests per endpoint and level.")
+    parser.add_argument("--endpoints", default=",".join(ENDPOINTS), help="Comma separated: " + ", ".join(ENDPOINTS))
+    parser.add_argument("--latency", type=float, default=0.0, help="Server-side delay per response, seconds.")
+    parser.add_argument("--in-process", action="store_true", help="Run the server in the benchmark's event loop.")
+    parser.add_argument("--json", help="Write results to this file.")
+    parser.add_argument("--compare", help="Results file of an earlier run to compare with.")
+    args = parser.parse_args()
+
+    levels = [int(level) for level in args.concurrency.split(",")]
+    endpoints = args.endpoints.split(",")
+
+    if args.in_process:
+        results = asyncio.run(run_in_process(endpoints, levels, args.requests, args.latency))
+    else:
+        with FakeBybitProcess(latency=args.latency) as server:
+            results = asyncio.run(run_requests(server.url, endpoints, levels, args.requests))
+    results += components()
+
+    baseline = {}
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = {key(result): result for result in json.load(f)["results"]}
+
+    print(f"python {platform.python_version()}, aiohttp {aiohttp.__version__}, codec {default_codec().name}")
+    print()
+    print_results(results, baseline)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(
+                {
+                    "python": platform.python_version(),
+                    "aiohttp": aiohttp.__version__,
+                    "codec": default_codec().name,
+                    "platform": sys.platform,
+                    "requests": args.requests,
+                    "results": results,
+                },
+                f,
+                indent=2
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Signatures per second: the per-call signing of 1.0.1 against the cached signers.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_signing
+"""
+import asyncio
+import base64
+import hashlib
+import hmac
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from Crypto.Hash import SHA256
+from Crypto.PublicKey import RSA
+from Crypto.Signature import PKCS1_v1_5
+
+from bybit_p2p_async._signer import HmacSigner, RsaSigner
+
+API_KEY = "XXXXXXXXXXXXXXXXXX"
+RECV_WINDOW = 5000
+PAYLOAD = json.dumps({
+    "tokenId": "USDT",
+    "currencyId": "RUB",
+    "side": "1",
+    "page": "1",
+    "size": "100",
+})
+
+
+def legacy_hmac(api_secret, timestamp, payload):
+    sign_string = str(timestamp) + API_KEY + str(RECV_WINDOW) + payload
+    return hmac.new(bytes(api_secret, "utf-8"), sign_string.encode("utf-8"), hashlib.sha256).hexdigest()
+
+
+def legacy_rsa(api_secret, timestamp, payload):
+    sign_string = str(timestamp) + API_KEY + str(RECV_WINDOW) + payload
+    digest = SHA256.new(sign_string.encode("utf-8"))
+    return base64.b64encode(PKCS1_v1_5.new(RSA.importKey(api_secret)).sign(digest)).decode()
+
+
+def rate(func, seconds=1.0):
+    count = 0
+    started = time.perf_counter()
+    deadline = started + seconds
+    while time.perf_counter() < deadline:
+        func(count, PAYLOAD)
+        count += 1
+    return count / (time.perf_counter() - started)
+
+
+async def loop_stall(signer, concurrency=32, total=256):
+    """
+    Longest gap between ticks of a 1 ms heartbeat while `total` RSA signatures are produced.
+    """
+
+    stall = 0.0
+    done = asyncio.Event()
+
+    async def heartbeat():
+        nonlocal stall
+        last = time.perf_counter()
+        while not done.is_set():
+            await asyncio.sleep(0.001)
+            now = time.perf_counter()
+            stall = max(stall, now - last)
+            last = now
+
+    async def worker(n):
+        for i in range(n):
+            await signer.asign(i, PAYLOAD)
+
+    beat = asyncio.create_task(heartbeat())
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(total // concurrency) for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    done.set()
+    await beat
+    return total / elapsed, stall
+
+
+def main():
+    hmac_secret = "Y" * 36
+    rsa_secret = RSA.generate(2048).export_key().decode()
+
+    hmac_signer = HmacSigner(API_KEY, hmac_secret, RECV_WINDOW)
+    rsa_signer = RsaSigner(API_KEY, rsa_secret, RECV_WINDOW)
+
+    assert hmac_signer.sign(1, PAYLOAD) == legacy_hmac(hmac_secret, 1, PAYLOAD)
+    assert rsa_signer.sign(1, PAYLOAD) == legacy_rsa(rsa_secret, 1, PAYLOAD)
+
+    rows = [
+        ("hmac legacy", rate(lambda ts, p: legacy_hmac(hmac_secret, ts, p))),
+        ("hmac cached", rate(hmac_signer.sign)),
+        ("rsa legacy", rate(lambda ts, p: legacy_rsa(rsa_secret, ts, p))),
+        ("rsa cached", rate(rsa_signer.sign)),
+    ]
+
+    print(f"{'signer':<16}{'signatures/s':>14}")
+    for name, value in rows:
+        print(f"{name:<16}{value:>14.0f}")
+
+    print()
+    print(f"{'rsa asign':<16}{'signatures/s':>14}{'max loop stall, ms':>22}")
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        for name, signer in [
+            ("on loop", rsa_signer),
+            ("thread pool", RsaSigner(API_KEY, rsa_secret, RECV_WINDOW, executor)),
+        ]:
+            per_second, stall = asyncio.run(loop_stall(signer))
+            print(f"{name:<16}{per_second:>14.0f}{stall * 1000:>22.2f}")
+
+
+if __name__ == "__main__":
+    main()
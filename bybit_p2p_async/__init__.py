@@ -1,3 +1,22 @@
+from ._account_pool import P2PAccountPool
+from ._ad_book import AdBook
+from ._ad_diff import AdChange, AdDiff, AdSnapshotDiffer
+from ._ad_history import AdHistoryReader, AdHistoryWriter, HistorySnapshot
+from ._cache import ResponseCache
+from ._cassette import RecordingTransport, ReplayTransport
+from ._clock import ServerClock
+from ._codec import JsonCodec, MsgspecCodec, OrjsonCodec
+from ._fixed_point import format_fixed, from_fixed, to_fixed
+from ._metrics import Metrics
+from ._order_sync import OrderStore, OrderSync
+from ._poller import AdaptivePoller
+from ._rate_limiter import RateLimiter
+from ._replay import ReplayClient, ReplayEngine, SimulatedClock
+from ._repricer import AutoRepricer, RepriceRule
+from ._retry import RetryBudget, RetryPolicy
+from ._scanner import MarketScanner, MarketScanResult, MarketSnapshot, MarketSpec
+from ._scheduler import FairScheduler
+from ._transport import P2PTransport
 from .p2p import P2P
 
 VERSION = "1.0.1"
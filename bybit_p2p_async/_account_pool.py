@@ -0,0 +1,124 @@
+import asyncio
+from typing import Awaitable, Callable, Dict, Iterable, Iterator, Optional, Tuple, Union
+
+from ._clock import ServerClock
+from ._scheduler import FairScheduler
+from ._transport import P2PTransport
+from .p2p import P2P
+
+
+class P2PAccountPool:
+    """
+    Many accounts in one process, sharing one connection pool.
+
+    Every account gets its own P2P client with its own signer and rate limiter, since Bybit
+    limits each account separately. The clients share one transport, so they share TCP and TLS
+    connections and the DNS cache. They also share one FairScheduler, which caps requests in
+    flight and serves accounts in turn. With time_sync, one server clock serves every account.
+
+    Args:
+        accounts (Iterable[Tuple[str, str]] | Dict[str, Tuple[str, str]], optional): (api_key, api_secret)
+            pairs, or names mapped to them. Accounts are named by API key by default.
+        concurrency (int, optional): Requests in flight across all accounts. Default 32.
+        transport (P2PTransport, optional): Shared transport. A new one sized to `concurrency` by default.
+        time_sync (bool, optional): Stamp requests with one shared ServerClock. Default False.
+        **client_kwargs: Passed to every P2P client, e.g. testnet, recv_window, codec or metrics.
+    """
+
+    def __init__(
+        self,
+        accounts: Union[Iterable[Tuple[str, str]], Dict[str, Tuple[str, str]]] = (),
+        concurrency: int = 32,
+        transport: P2PTransport = None,
+        time_sync: bool = False,
+        **client_kwargs
+    ):
+        self._owns_transport = transport is None
+        self._transport = transport if transport is not None else P2PTransport(limit=concurrency)
+        self._scheduler = FairScheduler(concurrency)
+        if time_sync:
+            client_kwargs.setdefault("clock", ServerClock())
+        self._client_kwargs = client_kwargs
+
+        self._clients: Dict[str, P2P] = {}
+
+        items = accounts.items() if isinstance(accounts, dict) else ((None, account) for account in accounts)
+        for name, (api_key, api_secret) in items:
+            self.add(api_key, api_secret, name)
+
+    def add(self, api_key: str, api_secret: str, name: str = None, **kwargs) -> P2P:
+        """
+        Add an account. `kwargs` override the pool-wide client arguments for it, e.g. rsa=True.
+        """
+
+        name = name if name is not None else api_key
+        if name in self._clients:
+            raise ValueError(f"Account {name} is already in the pool")
+
+        client = P2P(
+            api_key=api_key,
+            api_secret=api_secret,
+            **{
+                **self._client_kwargs,
+                **kwargs,
+                "transport": self._transport,
+                "scheduler": self._scheduler,
+            }
+        )
+        self._clients[name] = client
+        return client
+
+    def remove(self, name: str) -> Optional[P2P]:
+        return self._clients.pop(name, None)
+
+    def __getitem__(self, name: str) -> P2P:
+        return self._clients[name]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._clients
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._clients)
+
+    def __len__(self) -> int:
+        return len(self._clients)
+
+    @property
+    def clients(self) -> Dict[str, P2P]:
+        return dict(self._clients)
+
+    async def gather(
+        self,
+        call: Callable[[P2P], Awaitable],
+        names: Iterable[str] = None
+    ) -> Dict[str, object]:
+        """
+        Run `call(client)` for every account (or the given ones) concurrently.
+
+        Returns:
+            Dict[str, object]: Result by account name. A raised exception is returned as the result.
+        """
+
+        names = list(self._clients if names is None else names)
+        results = await asyncio.gather(
+            *(call(self._clients[name]) for name in names),
+            return_exceptions=True
+        )
+        return dict(zip(names, results))
+
+    def stats(self) -> dict:
+        return {
+            "accounts": len(self._clients),
+            "scheduler": self._scheduler.stats(),
+            "pool": self._transport.pool_stats(),
+        }
+
+    async def close(self) -> None:
+        if self._owns_transport:
+            await self._transport.close()
+
+    async def __aenter__(self) -> "P2PAccountPool":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
@@ -0,0 +1,371 @@
+from array import array
+from bisect import bisect_left, bisect_right
+from itertools import accumulate, compress
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from ._fixed_point import DEFAULT_PRICE_SCALE, _nested_scale
+
+SIDE_BUY = 0
+SIDE_SELL = 1
+
+# Row sets are ints with bit i set for row i. One truth value per row becomes a row set with a
+# single int() call, and a row set becomes a compress() selector with a single translate().
+_TO_BITS = bytes.maketrans(b"\0\1", b"01")
+_FROM_BITS = bytes.maketrans(b"01", b"\0\1")
+
+
+def _rows(flags: List[bool]) -> int:
+    return int(bytes(flags)[::-1].translate(_TO_BITS), 2) if flags else 0
+
+
+def _selector(rows: int, count: int) -> bytes:
+    return format(rows, "b").zfill(count)[::-1].encode("ascii").translate(_FROM_BITS)
+
+
+class AdBook:
+    """
+    Order book of market ads stored as columns, sorted best price first.
+
+    Sell ads (side 1) are sorted by ascending price and buy ads (side 0) by descending price,
+    so index 0 is always the best ad for the taker. Cumulative fiat depth is computed once at
+    construction, which turns best price, depth and effective price queries into O(1) or
+    O(log n) lookups.
+
+    Columns are array.array objects: ids, user_ids and fixed_prices ("q"); prices, min_amounts,
+    max_amounts, last_quantities and finish_rates ("d"). payment_masks holds one int per ad with a
+    bit set for every payment method, see payment_bit(); bits are assigned in the order payment
+    methods are first seen. fixed_prices are the prices in units of 10**-price_scale, the scaled
+    float price rounded to an integer, which is exact for prices with at most price_scale
+    decimals; ads are sorted by them.
+
+    Building a book parses every field of every ad once, so it costs several times more than
+    wrapping the same items in lazy MarketAd objects. It pays off from the first query: price,
+    depth and VWAP lookups take well under a microsecond. filter() and best_match() scan one
+    column per condition and combine the results as integer bit sets.
+
+    Args:
+        items (Iterable[dict]): Raw ad dicts, as in the "items" of GET_ONLINE_ADS.
+        side (int, optional): Ad side, 0 for buy ads and 1 for sell ads. Taken from the first ad by default.
+        price_scale (int, optional): Price decimals. Taken from the first ad's symbolInfo.currency.scale by default.
+    """
+
+    __slots__ = (
+        "side", "price_scale", "ids", "user_ids", "fixed_prices", "prices", "min_amounts", "max_amounts", "last_quantities",
+        "finish_rates", "payment_masks", "payment_index", "cum_fiat", "cum_quantity", "_sort_keys",
+        "_fiat", "_fiat_quantity"
+    )
+
+    def __init__(
+        self,
+        items: Iterable[dict] = (),
+        side: int = None,
+        price_scale: int = None
+    ):
+        items = list(items)
+        if side is None:
+            side = int(items[0]["side"]) if items else SIDE_SELL
+        self.side = side
+        if price_scale is None:
+            price_scale = _nested_scale(items[0].get("symbolInfo"), "currency", DEFAULT_PRICE_SCALE) if items else DEFAULT_PRICE_SCALE
+        self.price_scale = price_scale
+
+        # Sort the raw dicts once by exact price, then read every column in that order.
+        # Prices have price_scale decimals at most, so rounding the scaled float recovers the exact
+        # value, and it is much faster than parsing every string with to_fixed().
+        prices = [float(item["price"]) for item in items]
+        factor = 10 ** price_scale
+        fixed_prices = [round(price * factor) for price in prices]
+        order = sorted(range(len(items)), key=fixed_prices.__getitem__, reverse=side == SIDE_BUY)
+        items = [items[i] for i in order]
+
+        self.payment_index: Dict[str, int] = {}
+        # Most ads share a handful of payment combinations, so each one is turned into a mask once.
+        masks: Dict[tuple, int] = {}
+        payments = [tuple(item.get("payments") or ()) for item in items]
+        for combination in dict.fromkeys(payments):
+            masks[combination] = self._mask(combination)
+
+        self._set_columns(
+            [int(item["id"]) for item in items],
+            [int(item.get("userId") or 0) for item in items],
+            [fixed_prices[i] for i in order],
+            [prices[i] for i in order],
+            [float(item.get("minAmount") or 0) for item in items],
+            [float(item.get("maxAmount") or 0) for item in items],
+            [float(item.get("lastQuantity") or 0) for item in items],
+            [float(item.get("recentExecuteRate") or 0) for item in items],
+            [masks[combination] for combination in payments],
+        )
+
+    def _mask(self, payments) -> int:
+        mask = 0
+        for payment in payments:
+            mask |= 1 << self.payment_bit(payment)
+        return mask
+
+    def _set_columns(
+        self, ids, user_ids, fixed_prices, prices, min_amounts, max_amounts, last_quantities, finish_rates, masks,
+        fiat=None, fiat_quantity=None
+    ) -> None:
+        self.ids = array("q", ids)
+        self.user_ids = array("q", user_ids)
+        self.fixed_prices = array("q", fixed_prices)
+        self.prices = array("d", prices)
+        self.min_amounts = array("d", min_amounts)
+        self.max_amounts = array("d", max_amounts)
+        self.last_quantities = array("d", last_quantities)
+        self.finish_rates = array("d", finish_rates)
+        self.payment_masks: List[int] = list(masks)
+
+        # Fiat an ad can absorb: its limit, or the token amount left at its price if that is smaller.
+        if fiat is None:
+            fiat = array("d", [
+                min(limit, quantity * price) for limit, quantity, price in zip(max_amounts, last_quantities, prices)
+            ])
+            fiat_quantity = array("d", [value / price if price else 0.0 for value, price in zip(fiat, prices)])
+        self._fiat = fiat
+        self._fiat_quantity = fiat_quantity
+        self.cum_fiat = array("d", accumulate(fiat))
+        self.cum_quantity = array("d", accumulate(fiat_quantity))
+
+        # Ascending keys for bisect: prices for sell ads, negated prices for buy ads.
+        self._sort_keys = self.prices if self.side == SIDE_SELL else array("d", [-price for price in prices])
+
+    @classmethod
+    def from_ads(cls, ads: Iterable, side: int = None) -> "AdBook":
+        """
+        Build a book from MarketAd objects, reading their raw dicts.
+        """
+
+        return cls([ad._data for ad in ads], side)
+
+    @classmethod
+    def from_columns(
+        cls,
+        side: int,
+        price_scale: int,
+        ids: List[int],
+        user_ids: List[int],
+        fixed_prices: List[int],
+        min_amounts: List[float],
+        max_amounts: List[float],
+        last_quantities: List[float],
+        payment_masks: List[int],
+        payment_index: Dict[str, int],
+        finish_rates: List[float] = None
+    ) -> "AdBook":
+        """
+        Build a book from columns in any order, e.g. read from an AdHistoryReader file.
+
+        Prices are fixed-point, in units of 10**-price_scale. Payment masks use the bits of
+        `payment_index`, which the book keeps and extends; books sharing one index share masks.
+        """
+
+        order = sorted(range(len(ids)), key=fixed_prices.__getitem__, reverse=side == SIDE_BUY)
+        factor = 10 ** price_scale
+        if finish_rates is None:
+            finish_rates = [0.0] * len(ids)
+
+        book = cls.__new__(cls)
+        book.side = side
+        book.price_scale = price_scale
+        book.payment_index = payment_index
+
+        book._set_columns(
+            [ids[i] for i in order],
+            [user_ids[i] for i in order],
+            [fixed_prices[i] for i in order],
+            [fixed_prices[i] / factor for i in order],
+            [min_amounts[i] for i in order],
+            [max_amounts[i] for i in order],
+            [last_quantities[i] for i in order],
+            [finish_rates[i] for i in order],
+            [payment_masks[i] for i in order],
+        )
+        return book
+
+    def payment_bit(self, payment: str) -> int:
+        payment = str(payment)
+        bit = self.payment_index.get(payment)
+        if bit is None:
+            bit = self.payment_index[payment] = len(self.payment_index)
+        return bit
+
+    def payment_mask(self, payments: Iterable[str]) -> int:
+        mask = 0
+        for payment in payments:
+            bit = self.payment_index.get(str(payment))
+            if bit is not None:
+                mask |= 1 << bit
+        return mask
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def best_price(self) -> Optional[float]:
+        return self.prices[0] if self.prices else None
+
+    def best_fixed_price(self) -> Optional[int]:
+        return self.fixed_prices[0] if self.fixed_prices else None
+
+    def depth(self) -> float:
+        """
+        Total fiat the book can absorb.
+        """
+
+        return self.cum_fiat[-1] if self.cum_fiat else 0.0
+
+    def depth_at(self, price: float) -> float:
+        """
+        Fiat available at prices equal to or better than `price`.
+        """
+
+        key = price if self.side == SIDE_SELL else -price
+        count = bisect_right(self._sort_keys, key)
+        return self.cum_fiat[count - 1] if count else 0.0
+
+    def depth_curve(self) -> List[Tuple[float, float]]:
+        """
+        (price, cumulative fiat) for every ad, best price first.
+        """
+
+        return list(zip(self.prices, self.cum_fiat))
+
+    def vwap(self, amount: float) -> Optional[float]:
+        """
+        Effective price of taking `amount` fiat by sweeping the book from the best price.
+
+        Per-order minimum amounts are not taken into account. None if the book is not deep enough.
+        """
+
+        if amount <= 0 or not self.cum_fiat:
+            return None
+
+        i = bisect_left(self.cum_fiat, amount)
+        if i == len(self.cum_fiat):
+            return None
+
+        fiat_before = self.cum_fiat[i - 1] if i else 0.0
+        quantity_before = self.cum_quantity[i - 1] if i else 0.0
+        quantity = quantity_before + (amount - fiat_before) / self.prices[i]
+        return amount / quantity
+
+    def best_for_amount(self, amount: float) -> Optional[int]:
+        """
+        Index of the best ad that accepts `amount` fiat in a single order, or None.
+        """
+
+        for i, (low, high) in enumerate(zip(self.min_amounts, self.max_amounts)):
+            if low <= amount <= high:
+                return i
+        return None
+
+    def filter(
+        self,
+        min_price: float = None,
+        max_price: float = None,
+        payments: Iterable[str] = None,
+        min_finish_rate: float = None,
+        amount: float = None,
+        exclude_user_ids: Iterable[int] = None
+    ) -> "AdBook":
+        """
+        A new book with the ads that match every given condition.
+
+        Finding the matching rows is cheap, but every column of the new book is copied row by row,
+        which costs about as much as a list comprehension over MarketAd objects. When only the best
+        match is needed, best_match() skips the copy.
+
+        Args:
+            min_price (float, optional): Lowest price.
+            max_price (float, optional): Highest price.
+            payments (Iterable[str], optional): Payment method ids. An ad matches if it accepts any of them.
+            min_finish_rate (float, optional): Lowest recent execution rate, percent.
+            amount (float, optional): Fiat amount that has to fit in the ad limits.
+            exclude_user_ids (Iterable[int], optional): Drop ads of these users, e.g. your own.
+        """
+
+        selected = self._select(min_price, max_price, payments, min_finish_rate, amount, exclude_user_ids)
+
+        book = AdBook.__new__(AdBook)
+        book.side = self.side
+        book.price_scale = self.price_scale
+        book.payment_index = self.payment_index
+
+        selector = _selector(selected, len(self))
+        columns = [
+            array(column.typecode, list(compress(column, selector)))
+            for column in (
+                self.ids, self.user_ids, self.fixed_prices, self.prices, self.min_amounts, self.max_amounts,
+                self.last_quantities, self.finish_rates
+            )
+        ]
+        columns.append(list(compress(self.payment_masks, selector)))
+        book._set_columns(
+            *columns,
+            fiat=array("d", list(compress(self._fiat, selector))),
+            fiat_quantity=array("d", list(compress(self._fiat_quantity, selector)))
+        )
+        return book
+
+    def best_match(
+        self,
+        min_price: float = None,
+        max_price: float = None,
+        payments: Iterable[str] = None,
+        min_finish_rate: float = None,
+        amount: float = None,
+        exclude_user_ids: Iterable[int] = None
+    ) -> Optional[int]:
+        """
+        Index of the best-priced ad matching every condition, or None. Same arguments as filter().
+        """
+
+        selected = self._select(min_price, max_price, payments, min_finish_rate, amount, exclude_user_ids)
+        return (selected & -selected).bit_length() - 1 if selected else None
+
+    def _select(self, min_price, max_price, payments, min_finish_rate, amount, exclude_user_ids) -> int:
+        # Rows matching every condition, as an int with bit i set for row i.
+        count = len(self)
+        selected = (1 << count) - 1
+
+        # Prices are sorted, so a price range is a contiguous run of rows.
+        if min_price is not None or max_price is not None:
+            keys = self._sort_keys
+            if self.side == SIDE_SELL:
+                low = bisect_left(keys, min_price) if min_price is not None else 0
+                high = bisect_right(keys, max_price) if max_price is not None else count
+            else:
+                low = bisect_left(keys, -max_price) if max_price is not None else 0
+                high = bisect_right(keys, -min_price) if min_price is not None else count
+            selected &= ((1 << high) - 1) & ~((1 << low) - 1) if high > low else 0
+        if payments is not None:
+            mask = self.payment_mask(payments)
+            selected &= _rows([ad_mask & mask != 0 for ad_mask in self.payment_masks])
+        if min_finish_rate is not None:
+            selected &= _rows([rate >= min_finish_rate for rate in self.finish_rates])
+        if amount is not None:
+            selected &= _rows([low <= amount <= high for low, high in zip(self.min_amounts, self.max_amounts)])
+        if exclude_user_ids is not None:
+            excluded = {int(user_id) for user_id in exclude_user_ids}
+            selected &= ~_rows([user_id in excluded for user_id in self.user_ids])
+        return selected
+
+    def to_numpy(self) -> dict:
+        """
+        Columns as NumPy arrays sharing memory with the book. Requires numpy.
+        """
+
+        try:
+            import numpy as np
+        except ImportError:
+            raise ImportError("AdBook.to_numpy() requires numpy: pip install numpy")
+
+        columns = {
+            "ids": np.frombuffer(self.ids, dtype=np.int64),
+            "user_ids": np.frombuffer(self.user_ids, dtype=np.int64),
+            "fixed_prices": np.frombuffer(self.fixed_prices, dtype=np.int64),
+        }
+        for name in ("prices", "min_amounts", "max_amounts", "last_quantities", "finish_rates", "cum_fiat", "cum_quantity"):
+            columns[name] = np.frombuffer(getattr(self, name), dtype=np.float64)
+        return columns
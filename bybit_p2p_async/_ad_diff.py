@@ -0,0 +1,190 @@
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Bybit bumps "version" only when the owner edits an ad. These fields move with trading and
+# the owner's activity without a version change, so they are always compared. The price of a
+# floating-price ad follows the index price the same way.
+VOLATILE_FIELDS = (
+    "price",
+    "premium",
+    "lastQuantity",
+    "frozenQuantity",
+    "executedQuantity",
+    "isOnline",
+    "lastLogoutTime",
+    "orderNum",
+    "finishNum",
+    "recentOrderNum",
+    "recentExecuteRate",
+)
+
+
+def _raw(item) -> dict:
+    return item if isinstance(item, dict) else item._data
+
+
+class AdChange:
+    """
+    An ad present in both snapshots with different values.
+
+    Attributes:
+        id (str): Ad id.
+        old: The ad in the previous snapshot, as it was passed in (a dict or a MarketAd).
+        new: The ad in the current snapshot.
+        fields (Tuple[str, ...]): Names of the raw fields that changed.
+    """
+
+    __slots__ = ("id", "old", "new", "fields")
+
+    def __init__(self, id: str, old, new, fields: Tuple[str, ...]):
+        self.id = id
+        self.old = old
+        self.new = new
+        self.fields = fields
+
+    def __repr__(self) -> str:
+        return f"AdChange(id={self.id!r}, fields={self.fields!r})"
+
+
+class AdDiff:
+    """
+    Difference between two snapshots of one market. Empty diffs are falsy.
+
+    Attributes:
+        added (list): Ads that appeared, in snapshot order.
+        removed (list): Ads that disappeared, in previous snapshot order.
+        changed (List[AdChange]): Ads that changed, in snapshot order.
+        unchanged (int): Number of ads that did not change.
+    """
+
+    __slots__ = ("added", "removed", "changed", "unchanged")
+
+    def __init__(self, added: list, removed: list, changed: List[AdChange], unchanged: int):
+        self.added = added
+        self.removed = removed
+        self.changed = changed
+        self.unchanged = unchanged
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed or self.changed)
+
+    def __len__(self) -> int:
+        return len(self.added) + len(self.removed) + len(self.changed)
+
+    def __repr__(self) -> str:
+        return (
+            f"AdDiff(added={len(self.added)}, removed={len(self.removed)}, "
+            f"changed={len(self.changed)}, unchanged={self.unchanged})"
+        )
+
+
+class AdSnapshotDiffer:
+    """
+    Diffs successive snapshots of one market by ad id in O(n).
+
+    Ads with the same "version" and "updateDate" as in the previous snapshot only have the
+    VOLATILE_FIELDS compared; the rest are compared field by field. Each call to diff() makes
+    the given snapshot the previous one for the next call.
+
+    Snapshots should cover the same slice of the market: an ad that drops off the requested page
+    is reported as removed.
+
+    Args:
+        fields (Iterable[str], optional): Compare only these raw fields. All fields by default.
+        ignore (Iterable[str], optional): Raw fields never compared, e.g. "lastLogoutTime".
+        use_version (bool, optional): Take the version/updateDate fast path. Default True.
+    """
+
+    def __init__(
+        self,
+        fields: Iterable[str] = None,
+        ignore: Iterable[str] = (),
+        use_version: bool = True
+    ):
+        ignore = frozenset(ignore)
+        self._fields: Optional[Tuple[str, ...]] = (
+            tuple(field for field in fields if field not in ignore) if fields is not None else None
+        )
+        self._ignore = ignore
+        self._volatile = tuple(
+            field for field in VOLATILE_FIELDS
+            if field not in ignore and (self._fields is None or field in self._fields)
+        )
+        self._use_version = use_version
+
+        self._previous: Dict[str, tuple] = {}
+
+    @property
+    def snapshot(self) -> list:
+        """
+        The previous snapshot, as passed to the last diff() call.
+        """
+
+        return [item for item, _ in self._previous.values()]
+
+    def reset(self) -> None:
+        self._previous = {}
+
+    def diff(self, items: Iterable) -> AdDiff:
+        """
+        Compare a new snapshot with the previous one and remember it.
+
+        Args:
+            items (Iterable[dict | MarketAd]): Raw ad dicts or MarketAd objects.
+
+        Returns:
+            AdDiff: Added, removed and changed ads. Against an empty state every ad is added.
+        """
+
+        previous = self._previous
+        current: Dict[str, tuple] = {}
+
+        added = []
+        changed = []
+        unchanged = 0
+
+        for item in items:
+            data = _raw(item)
+            key = data["id"]
+            current[key] = (item, data)
+
+            old = previous.get(key)
+            if old is None:
+                added.append(item)
+                continue
+
+            fields = self._changed_fields(old[1], data)
+            if fields:
+                changed.append(AdChange(key, old[0], item, fields))
+            else:
+                unchanged += 1
+
+        if len(current) - len(added) == len(previous):
+            removed = []
+        else:
+            removed = [item for key, (item, _) in previous.items() if key not in current]
+
+        self._previous = current
+        return AdDiff(added, removed, changed, unchanged)
+
+    def _changed_fields(self, old: dict, new: dict) -> Tuple[str, ...]:
+        if old is new:
+            return ()
+
+        if (
+            self._use_version
+            and "version" in new
+            and old.get("version") == new["version"]
+            and old.get("updateDate") == new.get("updateDate")
+        ):
+            fields = [field for field in self._volatile if old.get(field) != new.get(field)]
+            return tuple(fields) if fields else ()
+
+        if self._fields is not None:
+            return tuple(field for field in self._fields if old.get(field) != new.get(field))
+
+        ignore = self._ignore
+        fields = [key for key, value in new.items() if key not in ignore and old.get(key, value) != value]
+        if old.keys() != new.keys():
+            # A field appeared or disappeared.
+            fields.extend(key for key in old.keys() ^ new.keys() if key not in ignore)
+        return tuple(fields)
@@ -0,0 +1,497 @@
+import mmap
+import os
+import struct
+import sys
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from itertools import repeat
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from ._ad_book import SIDE_BUY, SIDE_SELL, AdBook
+from ._fixed_point import DEFAULT_PRICE_SCALE, DEFAULT_QUANTITY_SCALE, to_fixed
+
+HISTORY_MAGIC = b"BPAH"
+HISTORY_VERSION = 1
+
+# magic, version, price scale, quantity scale, reserved.
+_FILE_HEADER = struct.Struct("<4sHBBQ")
+# magic, chunk length, timestamp ms, rows, new dictionary strings, their byte length, market code.
+_CHUNK_HEADER = struct.Struct("<4sIqIIII")
+_CHUNK_MAGIC = b"CHNK"
+
+# int64 columns of a chunk, in file order, followed by the uint32 payments column.
+INT_COLUMNS = ("ids", "user_ids", "prices", "min_amounts", "max_amounts", "quantities")
+
+
+def _pad(size: int) -> int:
+    # Columns start at 8-byte boundaries, so they can be viewed in place.
+    return -size % 8
+
+
+# Markets are named after the side of their ads: "USDT/RUB/sell" holds sell ads (side 1), which
+# get_market_ads(side="buy") returns.
+def _market_of(item: dict) -> str:
+    side = "buy" if str(item.get("side", "0")) == "0" else "sell"
+    return f"{item.get('tokenId', '')}/{item.get('currencyId', '')}/{side}"
+
+
+def market_for_request(token_id: str, currency_id: str, side: str) -> str:
+    """
+    Market name of the ads get_market_ads() returns for a request `side`: "buy" lists sell ads.
+    """
+
+    ad_side = "sell" if side.lower() == "buy" else "buy"
+    return f"{token_id}/{currency_id}/{ad_side}"
+
+
+class AdHistoryWriter:
+    """
+    Appends market ad snapshots to a chunked, columnar binary file.
+
+    Every snapshot becomes one chunk: a header with its timestamp and market, the strings it adds
+    to the file's dictionary, then one column per field. Ad id, user id, price, limits and
+    quantity are int64 (prices and limits in units of 10**-price_scale, quantities in units of
+    10**-quantity_scale). Payment method combinations and market names are stored once in the
+    dictionary and referenced by uint32 codes.
+
+    Chunks are only ever appended. An existing file is continued; a chunk cut short by a crash
+    is dropped on reopening. Read the file with AdHistoryReader.
+
+    Args:
+        path (str): History file.
+        price_scale (int, optional): Decimals kept for prices and limits. Default 2. Ignored when
+            continuing a file, which keeps its own.
+        quantity_scale (int, optional): Decimals kept for quantities. Default 4. Same as above.
+    """
+
+    def __init__(
+        self,
+        path,
+        price_scale: int = DEFAULT_PRICE_SCALE,
+        quantity_scale: int = DEFAULT_QUANTITY_SCALE
+    ):
+        self._strings: Dict[str, int] = {}
+        self._last_timestamp = None
+        self.chunks = 0
+
+        if os.path.exists(path) and os.path.getsize(path) > 0:
+            with AdHistoryReader(path) as reader:
+                price_scale, quantity_scale = reader.price_scale, reader.quantity_scale
+                self._strings = {string: code for code, string in enumerate(reader.strings)}
+                self._last_timestamp = reader.end
+                self.chunks = len(reader)
+                end = reader.size
+            self._file = open(path, "r+b")
+            self._file.truncate(end)
+            self._file.seek(end)
+        else:
+            self._file = open(path, "wb")
+            self._file.write(_FILE_HEADER.pack(HISTORY_MAGIC, HISTORY_VERSION, price_scale, quantity_scale, 0))
+
+        self.price_scale = price_scale
+        self.quantity_scale = quantity_scale
+
+    def _code(self, string: str, new: List[str]) -> int:
+        code = self._strings.get(string)
+        if code is None:
+            code = self._strings[string] = len(self._strings)
+            new.append(string)
+        return code
+
+    def append(
+        self,
+        items: Iterable,
+        timestamp_ms: int = None,
+        market: str = None
+    ) -> None:
+        """
+        Write one snapshot.
+
+        Args:
+            items (Iterable[dict | MarketAd]): Raw ad dicts or MarketAd objects.
+            timestamp_ms (int, optional): Snapshot time, not earlier than the previous one. Now by default.
+            market (str, optional): Market name, "token/currency/ad side". Taken from the first ad by default,
+                e.g. "USDT/RUB/sell" for the ads of get_market_ads(side="buy").
+        """
+
+        items = [getattr(item, "_data", item) for item in items]
+        if timestamp_ms is None:
+            timestamp_ms = int(time.time() * 10 ** 3)
+        if self._last_timestamp is not None and timestamp_ms < self._last_timestamp:
+            raise ValueError(f"Snapshot at {timestamp_ms} is older than the last one at {self._last_timestamp}")
+        if market is None:
+            market = _market_of(items[0]) if items else ""
+
+        new: List[str] = []
+        market_code = self._code(market, new)
+
+        # The same few payment combinations repeat across ads, so each is looked up once.
+        combinations: Dict[tuple, int] = {}
+        payment_codes = array("I")
+        for item in items:
+            combination = tuple(item.get("payments") or ())
+            code = combinations.get(combination)
+            if code is None:
+                code = combinations[combination] = self._code(",".join(combination), new)
+            payment_codes.append(code)
+
+        price_scale, quantity_scale = self.price_scale, self.quantity_scale
+        columns = [
+            array("q", [int(item["id"]) for item in items]),
+            array("q", [int(item.get("userId") or 0) for item in items]),
+            array("q", [to_fixed(item["price"], price_scale) for item in items]),
+            array("q", [to_fixed(item.get("minAmount") or "0", price_scale) for item in items]),
+            array("q", [to_fixed(item.get("maxAmount") or "0", price_scale) for item in items]),
+            array("q", [to_fixed(item.get("lastQuantity") or "0", quantity_scale) for item in items]),
+        ]
+
+        encoded = [string.encode("utf-8") for string in new]
+        lengths = array("I", [len(string) for string in encoded])
+        blob = b"".join(encoded)
+
+        parts = [lengths.tobytes(), blob]
+        strings_size = len(parts[0]) + len(blob)
+        parts.append(b"\0" * _pad(strings_size))
+        parts.extend(column.tobytes() for column in columns)
+        parts.append(payment_codes.tobytes())
+        parts.append(b"\0" * _pad(len(parts[-1])))
+
+        body = b"".join(parts)
+        header = _CHUNK_HEADER.pack(
+            _CHUNK_MAGIC, _CHUNK_HEADER.size + len(body), timestamp_ms, len(items), len(new), len(blob), market_code
+        )
+        self._file.write(header + body)
+
+        self._last_timestamp = timestamp_ms
+        self.chunks += 1
+
+    def append_snapshot(self, snapshot, timestamp_ms: int = None) -> None:
+        """
+        Write every successful result of a MarketScanner snapshot, one chunk per market, named
+        after the side of the ads rather than the side requested.
+        """
+
+        if timestamp_ms is None:
+            timestamp_ms = int(snapshot.started_at * 10 ** 3)
+        for result in snapshot:
+            if result.ok:
+                spec = result.spec
+                self.append(result.ads, timestamp_ms, market_for_request(spec.token_id, spec.currency_id, spec.side))
+
+    def flush(self) -> None:
+        self._file.flush()
+
+    def close(self) -> None:
+        if not self._file.closed:
+            self._file.close()
+
+    def __enter__(self) -> "AdHistoryWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+
+class HistorySnapshot:
+    """
+    One recorded snapshot. Columns are memoryviews into the reader's mapping: nothing is copied
+    or parsed until read, and they stay valid until the reader is closed.
+    """
+
+    __slots__ = ("timestamp", "market", "ids", "user_ids", "prices", "min_amounts", "max_amounts",
+                 "quantities", "payment_codes", "_reader")
+
+    def __init__(self, reader: "AdHistoryReader", timestamp: int, market: str, columns: list, payment_codes):
+        self._reader = reader
+        self.timestamp = timestamp
+        self.market = market
+        (self.ids, self.user_ids, self.prices, self.min_amounts, self.max_amounts, self.quantities) = columns
+        self.payment_codes = payment_codes
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @property
+    def side(self) -> int:
+        return SIDE_BUY if self.market.endswith("/buy") else SIDE_SELL
+
+    def payments(self, i: int) -> List[str]:
+        return list(self._reader._payment_list(self.payment_codes[i]))
+
+    def to_book(self) -> AdBook:
+        """
+        The snapshot as an AdBook, built from the columns without going through dicts.
+        """
+
+        reader = self._reader
+        price_factor, quantity_factor = 10 ** reader.price_scale, 10 ** reader.quantity_scale
+        mask = reader._payment_mask
+
+        return AdBook.from_columns(
+            self.side,
+            reader.price_scale,
+            self.ids.tolist(),
+            self.user_ids.tolist(),
+            self.prices.tolist(),
+            [value / price_factor for value in self.min_amounts],
+            [value / price_factor for value in self.max_amounts],
+            [value / quantity_factor for value in self.quantities],
+            [mask(code) for code in self.payment_codes],
+            reader.payment_index,
+        )
+
+    def items(self) -> List[dict]:
+        """
+        The ads as minimal raw dicts, with the same keys and string values as the API uses.
+        Enough for MarketAd, AdBook and AdSnapshotDiffer.
+        """
+
+        reader = self._reader
+        price_scale, quantity_scale = reader.price_scale, reader.quantity_scale
+        token_id, currency_id, side = (self.market.split("/") + ["", "", ""])[:3]
+        side = "0" if side == "buy" else "1"
+        # Shared by every ad, so MarketAd and AdBook pick up the file's scales.
+        symbol_info = {
+            "currency": {"currencyId": currency_id, "scale": price_scale},
+            "token": {"tokenId": token_id, "scale": quantity_scale},
+        }
+
+        # Below 2**53 the scaled float is the nearest double to the exact value, so printing it
+        # with `scale` decimals gives the same string as format_fixed(), several times faster.
+        price_factor, quantity_factor = 10 ** price_scale, 10 ** quantity_scale
+        price_format, quantity_format = f"%.{price_scale}f", f"%.{quantity_scale}f"
+        payments = reader._payment_list
+
+        return [
+            {
+                "id": str(ad_id),
+                "userId": str(user_id),
+                "price": price_format % (price / price_factor),
+                "minAmount": price_format % (low / price_factor),
+                "maxAmount": price_format % (high / price_factor),
+                "lastQuantity": quantity_format % (quantity / quantity_factor),
+                "payments": list(payments(code)),
+                "tokenId": token_id,
+                "currencyId": currency_id,
+                "side": side,
+                "symbolInfo": symbol_info,
+            }
+            for ad_id, user_id, price, low, high, quantity, code in zip(
+                self.ids, self.user_ids, self.prices, self.min_amounts, self.max_amounts, self.quantities,
+                self.payment_codes
+            )
+        ]
+
+    def __repr__(self) -> str:
+        return f"HistorySnapshot({self.market}, {self.timestamp}, {len(self)} ads)"
+
+
+class AdHistoryReader:
+    """
+    Reads a file written by AdHistoryWriter through a read-only memory map.
+
+    Opening walks the chunk headers only, to build the time index and the string dictionary;
+    column data is not touched until a snapshot's columns are read. Time ranges are found by
+    binary search.
+
+    Args:
+        path (str): History file.
+    """
+
+    def __init__(
+        self,
+        path
+    ):
+        if sys.byteorder != "little":
+            raise RuntimeError("AdHistoryReader reads columns in place and needs a little-endian machine")
+
+        self._file = open(path, "rb")
+        try:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ValueError(f"{path} is empty")
+        self._view = memoryview(self._mmap)
+
+        magic, version, self.price_scale, self.quantity_scale, _ = _FILE_HEADER.unpack_from(self._mmap, 0)
+        if magic != HISTORY_MAGIC:
+            raise ValueError(f"{path} is not an ad history file")
+        if version != HISTORY_VERSION:
+            raise ValueError(f"Unsupported ad history version {version}")
+
+        self.strings: List[str] = []
+        self._timestamps = array("q")
+        self._offsets: List[int] = []
+        self._markets = array("I")
+        self._market_codes: Dict[str, int] = {}
+        # Chunk positions and timestamps of each market, built on first use by snapshot_at().
+        self._by_market: Dict[int, tuple] = {}
+        # Shared by every book from to_book(), so each payment combination is turned into a mask once.
+        self.payment_index: Dict[str, int] = {}
+        self._masks: Dict[int, int] = {}
+        self._payment_lists: Dict[int, tuple] = {}
+
+        self.size = self._index()
+
+    def _index(self) -> int:
+        # Returns where the last complete chunk ends.
+        view, size = self._view, len(self._mmap)
+        offset = _FILE_HEADER.size
+
+        while offset + _CHUNK_HEADER.size <= size:
+            magic, length, timestamp, rows, count, blob_size, market = _CHUNK_HEADER.unpack_from(view, offset)
+            if magic != _CHUNK_MAGIC or offset + length > size:
+                break
+
+            start = offset + _CHUNK_HEADER.size
+            lengths = view[start:start + 4 * count].cast("I")
+            position = start + 4 * count
+            for length_ in lengths:
+                self.strings.append(str(view[position:position + length_], "utf-8"))
+                position += length_
+            lengths.release()
+
+            self._timestamps.append(timestamp)
+            self._offsets.append(offset)
+            self._markets.append(market)
+            offset += length
+
+        self._market_codes = {self.strings[code]: code for code in set(self._markets)}
+        return offset
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def _payment_list(self, code: int) -> tuple:
+        payments = self._payment_lists.get(code)
+        if payments is None:
+            combination = self.strings[code]
+            payments = self._payment_lists[code] = tuple(combination.split(",")) if combination else ()
+        return payments
+
+    def _payment_mask(self, code: int) -> int:
+        mask = self._masks.get(code)
+        if mask is None:
+            mask, index = 0, self.payment_index
+            for payment in self._payment_list(code):
+                bit = index.get(payment)
+                if bit is None:
+                    bit = index[payment] = len(index)
+                mask |= 1 << bit
+            self._masks[code] = mask
+        return mask
+
+    @property
+    def start(self) -> Optional[int]:
+        return self._timestamps[0] if self._timestamps else None
+
+    @property
+    def end(self) -> Optional[int]:
+        return self._timestamps[-1] if self._timestamps else None
+
+    @property
+    def markets(self) -> List[str]:
+        return sorted(self._market_codes)
+
+    def _snapshot(self, i: int) -> HistorySnapshot:
+        view, offset = self._view, self._offsets[i]
+        _, _, timestamp, rows, count, blob_size, market = _CHUNK_HEADER.unpack_from(view, offset)
+
+        position = offset + _CHUNK_HEADER.size
+        strings_size = 4 * count + blob_size
+        position += strings_size + _pad(strings_size)
+
+        columns = []
+        for _ in INT_COLUMNS:
+            columns.append(view[position:position + 8 * rows].cast("q"))
+            position += 8 * rows
+        payment_codes = view[position:position + 4 * rows].cast("I")
+
+        return HistorySnapshot(self, timestamp, self.strings[market], columns, payment_codes)
+
+    def snapshot_at(self, timestamp: int, market: str) -> Optional[HistorySnapshot]:
+        """
+        The last snapshot of a market taken at or before `timestamp`, or None.
+        """
+
+        code = self._market_codes.get(market)
+        if code is None:
+            return None
+
+        index = self._by_market.get(code)
+        if index is None:
+            positions = [i for i, market_code in enumerate(self._markets) if market_code == code]
+            index = self._by_market[code] = (array("q", [self._timestamps[i] for i in positions]), positions)
+
+        timestamps, positions = index
+        i = bisect_right(timestamps, timestamp)
+        return self._snapshot(positions[i - 1]) if i else None
+
+    def _range(self, start: int = None, end: int = None) -> range:
+        low = 0 if start is None else bisect_left(self._timestamps, start)
+        high = len(self._timestamps) if end is None else bisect_left(self._timestamps, end)
+        return range(low, high)
+
+    def snapshots(
+        self,
+        start: int = None,
+        end: int = None,
+        market: str = None
+    ) -> Iterator[HistorySnapshot]:
+        """
+        Snapshots with start <= timestamp < end, in time order, optionally of one market only.
+
+        Args:
+            start (int, optional): First timestamp, ms. From the beginning by default.
+            end (int, optional): Timestamp to stop before, ms. To the end by default.
+            market (str, optional): Market name, e.g. "USDT/RUB/buy".
+        """
+
+        code = None
+        if market is not None:
+            code = self._market_codes.get(market)
+            if code is None:
+                return
+
+        markets = self._markets
+        for i in self._range(start, end):
+            if code is None or markets[i] == code:
+                yield self._snapshot(i)
+
+    def slice(
+        self,
+        start: int = None,
+        end: int = None,
+        market: str = None
+    ) -> Dict[str, array]:
+        """
+        Rows of every snapshot in a time range concatenated into columns: "timestamps", the
+        int64 columns of HistorySnapshot and "payment_codes". The data is copied out of the file.
+        """
+
+        columns = {name: array("q") for name in ("timestamps",) + INT_COLUMNS}
+        columns["payment_codes"] = array("I")
+
+        for snapshot in self.snapshots(start, end, market):
+            columns["timestamps"].extend(repeat(snapshot.timestamp, len(snapshot)))
+            for name in INT_COLUMNS:
+                columns[name].frombytes(getattr(snapshot, name).cast("B"))
+            columns["payment_codes"].frombytes(snapshot.payment_codes.cast("B"))
+
+        return columns
+
+    def close(self) -> None:
+        self._view.release()
+        try:
+            self._mmap.close()
+        except BufferError:
+            # Snapshots still hold views into the mapping; it is unmapped once they are gone.
+            pass
+        self._file.close()
+
+    def __enter__(self) -> "AdHistoryReader":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
@@ -0,0 +1,158 @@
+import asyncio
+import json
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Optional, Tuple, Union
+
+from ._p2p_helper import P2PMethods
+from ._p2p_method import P2PMethod
+
+_DEFAULT_TTL = {
+    P2PMethods.GET_ACCOUNT_INFORMATION: 5.0,
+    P2PMethods.GET_CURRENT_BALANCE: 1.0,
+}
+
+
+def _url(method: Union[P2PMethod, str]) -> str:
+    return method.url if isinstance(method, P2PMethod) else method
+
+
+class ResponseCache:
+    """
+    TTL cache for read endpoints with single-flight request coalescing.
+
+    Only endpoints with a TTL are cached, and only successful results are stored. Concurrent
+    identical calls share one in-flight request, so N tasks cost one HTTP call. Within
+    `stale_while_revalidate` seconds after expiry the old result is returned immediately
+    while a single background request refreshes it.
+
+    Args:
+        ttl (Dict[P2PMethod | str, float], optional): Seconds a result stays fresh, by method or endpoint path.
+            Default: 5 s for account information, 1 s for balances.
+        max_entries (int, optional): Least recently used entries are evicted above this size. Default 256.
+        stale_while_revalidate (float, optional): Seconds a stale result may still be served. Default 0.
+    """
+
+    def __init__(
+        self,
+        ttl: Dict[Union[P2PMethod, str], float] = None,
+        max_entries: int = 256,
+        stale_while_revalidate: float = 0.0
+    ):
+        ttl = _DEFAULT_TTL if ttl is None else ttl
+        self._ttl = {_url(method): seconds for method, seconds in ttl.items()}
+        self._max_entries = max_entries
+        self._stale_while_revalidate = stale_while_revalidate
+
+        self._entries: "OrderedDict[tuple, Tuple[float, object]]" = OrderedDict()
+        self._inflight: Dict[tuple, asyncio.Future] = {}
+
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    def ttl_for(self, method: Union[P2PMethod, str]) -> Optional[float]:
+        return self._ttl.get(_url(method))
+
+    @staticmethod
+    def _key(method: Union[P2PMethod, str], params: dict) -> tuple:
+        return (_url(method), json.dumps(params, sort_keys=True, default=str))
+
+    async def get_or_fetch(
+        self,
+        method: P2PMethod,
+        params: dict,
+        fetch: Callable[[], Awaitable[Tuple[bool, object]]]
+    ) -> Tuple[bool, object]:
+        ttl = self.ttl_for(method)
+        if ttl is None:
+            return await fetch()
+
+        key = self._key(method, params)
+        entry = self._entries.get(key)
+
+        if entry is not None:
+            age = time.monotonic() - entry[0]
+            if age < ttl:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return True, entry[1]
+            if age < ttl + self._stale_while_revalidate:
+                self._entries.move_to_end(key)
+                self.stale_hits += 1
+                if key not in self._inflight:
+                    self._start(key, fetch)
+                return True, entry[1]
+
+        future = self._inflight.get(key)
+        if future is not None:
+            self.coalesced += 1
+        else:
+            self.misses += 1
+            future = self._start(key, fetch)
+
+        # A cancelled caller must not cancel the request other callers are waiting for.
+        return await asyncio.shield(future)
+
+    def _start(self, key: tuple, fetch: Callable[[], Awaitable[Tuple[bool, object]]]) -> asyncio.Future:
+        future = asyncio.ensure_future(fetch())
+        self._inflight[key] = future
+
+        def done(future: asyncio.Future) -> None:
+            # Invalidated while in flight: the result may predate the change, so it is not stored.
+            if self._inflight.get(key) is not future:
+                return None
+
+            del self._inflight[key]
+            if future.cancelled() or future.exception() is not None:
+                return None
+
+            status, data = future.result()
+            if status:
+                self._store(key, data)
+
+        future.add_done_callback(done)
+        future.add_done_callback(_consume_exception)
+        return future
+
+    def _store(self, key: tuple, data) -> None:
+        self._entries[key] = (time.monotonic(), data)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, method: Union[P2PMethod, str] = None, params: dict = None) -> None:
+        """
+        Drop cached results: all of them, all of one method, or one method with given params.
+        """
+
+        if method is None:
+            self._entries.clear()
+            self._inflight.clear()
+        elif params is not None:
+            key = self._key(method, params)
+            self._entries.pop(key, None)
+            self._inflight.pop(key, None)
+        else:
+            url = _url(method)
+            for cache in (self._entries, self._inflight):
+                for key in [key for key in cache if key[0] == url]:
+                    del cache[key]
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "inflight": len(self._inflight),
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+        }
+
+
+def _consume_exception(future: asyncio.Future) -> None:
+    # A background refresh, or a request whose callers were all cancelled, has nobody to read its
+    # exception. Read it here so it is not reported as never retrieved.
+    if not future.cancelled():
+        future.exception()
@@ -0,0 +1,274 @@
+import asyncio
+import base64
+import gzip
+import json
+import time
+from collections import defaultdict, deque
+from typing import Deque, Dict, Iterable, Optional, Tuple
+from urllib.parse import urlsplit
+
+from multidict import CIMultiDict
+
+from ._exceptions import CassetteMissError
+from ._transport import P2PTransport, TransportResponse
+
+CASSETTE_VERSION = 1
+
+# Compared lowercase. The API key and the signature are enough to replay a request, so they are
+# never written.
+DEFAULT_REDACTED_HEADERS = frozenset({
+    "x-bapi-api-key",
+    "x-bapi-sign",
+    "authorization",
+    "cookie",
+    "set-cookie",
+})
+REDACTED = "***"
+
+
+def _body_text(data) -> Optional[str]:
+    if data is None:
+        return None
+    if isinstance(data, bytes):
+        return data.decode("utf-8", errors="replace")
+    return str(data)
+
+
+def _normalize_body(body: Optional[str]) -> Optional[str]:
+    # Codecs differ in whitespace and key order, so JSON bodies are matched by value.
+    if not body:
+        return body
+    try:
+        return json.dumps(json.loads(body), sort_keys=True, separators=(",", ":"))
+    except ValueError:
+        return body
+
+
+def _match_key(http_method: str, url: str, body: Optional[str]) -> Tuple[str, str, Optional[str]]:
+    # Host is left out, so a cassette recorded against mainnet replays under any base_url.
+    parts = urlsplit(url)
+    path = parts.path + (f"?{parts.query}" if parts.query else "")
+    return http_method.upper(), path, _normalize_body(body)
+
+
+def _redact_fields(value, fields: frozenset):
+    if isinstance(value, dict):
+        return {
+            key: REDACTED if key in fields else _redact_fields(item, fields)
+            for key, item in value.items()
+        }
+    if isinstance(value, list):
+        return [_redact_fields(item, fields) for item in value]
+    return value
+
+
+class RecordingTransport:
+    """
+    Transport that passes requests to a real one and writes every request/response pair to a
+    cassette: gzip-compressed JSON lines.
+
+    The API key and signature headers are never written. `redact_fields` replaces the values of
+    the given keys, at any depth, in JSON request and response bodies, e.g. real names or phone
+    numbers. Streamed uploads are recorded by size only.
+
+    Args:
+        path (str): Cassette file.
+        transport (P2PTransport, optional): Transport that sends the requests. A new one by default.
+        redact_headers (Iterable[str], optional): Header names not written, case-insensitive.
+        redact_fields (Iterable[str], optional): JSON keys whose values are not written.
+        append (bool, optional): Add to an existing cassette instead of replacing it. Default False.
+    """
+
+    def __init__(
+        self,
+        path,
+        transport: P2PTransport = None,
+        redact_headers: Iterable[str] = DEFAULT_REDACTED_HEADERS,
+        redact_fields: Iterable[str] = (),
+        append: bool = False
+    ):
+        self._owns_transport = transport is None
+        self._transport = transport if transport is not None else P2PTransport()
+        self._redact_headers = frozenset(header.lower() for header in redact_headers)
+        self._redact_fields = frozenset(redact_fields)
+
+        self._file = gzip.open(path, "at" if append else "wt", encoding="utf-8")
+        self._started = time.monotonic()
+        self._write({"version": CASSETTE_VERSION, "created": time.time()})
+
+        self.recorded = 0
+
+    def _write(self, entry: dict) -> None:
+        self._file.write(json.dumps(entry, separators=(",", ":")) + "\n")
+
+    def _headers(self, headers) -> list:
+        if not headers:
+            return []
+        return [
+            [key, REDACTED if key.lower() in self._redact_headers else value]
+            for key, value in headers.items()
+        ]
+
+    def _redacted_body(self, body: Optional[str]) -> Optional[str]:
+        if not body or not self._redact_fields:
+            return body
+        try:
+            return json.dumps(_redact_fields(json.loads(body), self._redact_fields), separators=(",", ":"))
+        except ValueError:
+            return body
+
+    @property
+    def closed(self) -> bool:
+        return self._file.closed
+
+    def pool_stats(self) -> dict:
+        return self._transport.pool_stats()
+
+    async def request(
+        self,
+        http_method: str,
+        url: str,
+        headers: dict = None,
+        data=None
+    ) -> TransportResponse:
+        started = time.monotonic()
+        response = await self._transport.request(http_method, url, headers=headers, data=data)
+        elapsed = time.monotonic() - started
+
+        streamed = data is not None and not isinstance(data, (bytes, str))
+        entry = {
+            "t": round(started - self._started, 6),
+            "elapsed": round(elapsed, 6),
+            "method": http_method.upper(),
+            "url": url,
+            "headers": self._headers(headers),
+            "body": None if streamed else self._redacted_body(_body_text(data)),
+            "status": response.status,
+            "response_headers": self._headers(response.headers),
+        }
+        if streamed:
+            entry["streamed"] = True
+
+        try:
+            entry["response"] = self._redacted_body(response.body.decode("utf-8"))
+        except UnicodeDecodeError:
+            entry["response_b64"] = base64.b64encode(response.body).decode()
+
+        self._write(entry)
+        self.recorded += 1
+        return response
+
+    async def close(self) -> None:
+        if not self._file.closed:
+            self._file.close()
+        if self._owns_transport:
+            await self._transport.close()
+
+    async def __aenter__(self) -> "RecordingTransport":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
+
+
+class _Recorded:
+    __slots__ = ("status", "headers", "body", "elapsed")
+
+    def __init__(self, entry: dict):
+        self.status = entry["status"]
+        self.headers = entry.get("response_headers") or []
+        if "response_b64" in entry:
+            self.body = base64.b64decode(entry["response_b64"])
+        else:
+            self.body = (entry.get("response") or "").encode("utf-8")
+        self.elapsed = entry.get("elapsed", 0.0)
+
+
+class ReplayTransport:
+    """
+    Transport that answers from a cassette, with no network access.
+
+    Requests are matched by HTTP method, path with query, and body (JSON compared by value), so
+    timestamps and signatures do not matter. Identical requests get their recorded responses in
+    order. When they run out, the last one is repeated if `repeat` is set, otherwise
+    CassetteMissError is raised.
+
+    Args:
+        path (str): Cassette file written by RecordingTransport.
+        speed (float, optional): Replay each response after its recorded latency divided by
+            `speed`: 1 is real time, 100 is 100x faster. None answers immediately. Default None.
+        repeat (bool, optional): Reuse the last response of a request once they run out. Default True.
+    """
+
+    def __init__(
+        self,
+        path,
+        speed: float = None,
+        repeat: bool = True
+    ):
+        self._speed = speed
+        self._repeat = repeat
+        self._responses: Dict[tuple, Deque[_Recorded]] = defaultdict(deque)
+        self._last: Dict[tuple, _Recorded] = {}
+        self._closed = False
+
+        self.entries = 0
+        self.replayed = 0
+        self.misses = 0
+
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            for line in f:
+                entry = json.loads(line)
+                if "method" not in entry:
+                    # A cassette header line.
+                    continue
+                body = None if entry.get("streamed") else entry.get("body")
+                self._responses[_match_key(entry["method"], entry["url"], body)].append(_Recorded(entry))
+                self.entries += 1
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def pool_stats(self) -> dict:
+        return {
+            "limit": 0,
+            "limit_per_host": 0,
+            "acquired": 0,
+            "idle": 0,
+            "requests": self.replayed,
+            "connections_created": 0,
+            "connections_reused": 0,
+        }
+
+    async def request(
+        self,
+        http_method: str,
+        url: str,
+        headers: dict = None,
+        data=None
+    ) -> TransportResponse:
+        streamed = data is not None and not isinstance(data, (bytes, str))
+        if streamed and hasattr(data, "aclose"):
+            await data.aclose()
+
+        key = _match_key(http_method, url, None if streamed else _body_text(data))
+        queue = self._responses.get(key)
+
+        if queue:
+            recorded = queue.popleft()
+            self._last[key] = recorded
+        elif self._repeat and key in self._last:
+            recorded = self._last[key]
+        else:
+            self.misses += 1
+            raise CassetteMissError(f"No recorded response for {key[0]} {key[1]} {key[2] or ''}".rstrip())
+
+        if self._speed:
+            await asyncio.sleep(recorded.elapsed / self._speed)
+
+        self.replayed += 1
+        return TransportResponse(recorded.status, CIMultiDict(recorded.headers), recorded.body)
+
+    async def close(self) -> None:
+        self._closed = True
@@ -1,438 +1,480 @@
-from typing import List
+from typing import Callable, Union
 
+from ._fixed_point import BALANCE_SCALE, DEFAULT_PRICE_SCALE, DEFAULT_QUANTITY_SCALE, _nested_scale, to_fixed
+
+
+class _Field:
+    """
+    Model attribute read from the raw API dict on first access and cached in a slot afterwards.
+
+    A key missing from the raw dict, or holding null, reads as None, or as default_factory() if it is given.
+    """
+
+    __slots__ = ("key", "convert", "default_factory", "slot")
 
-class Currency:
     def __init__(
         self,
-        currencyId: str,
-        exchangeId: str,
-        id: str,
-        orgId: str,
-        scale: int
+        key: str,
+        convert: Callable = None,
+        default_factory: Callable = None
     ):
-        self.currency_id = currencyId
-        self.exchange_id = int(exchangeId)
-        self.id = int(id)
-        self.org_id = int(orgId)
-        self.scale = scale
+        self.key = key
+        self.convert = convert
+        self.default_factory = default_factory
+        # Member descriptor of the cache slot, filled in by _ModelMeta.
+        self.slot = None
+
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            return self
+
+        try:
+            return self.slot.__get__(obj, owner)
+        except AttributeError:
+            pass
+
+        value = obj._data.get(self.key)
+        if value is None:
+            if self.default_factory is not None:
+                value = self.default_factory()
+        elif self.convert is not None:
+            value = self.convert(value)
+
+        self.slot.__set__(obj, value)
+        return value
+
+    def __set__(self, obj, value) -> None:
+        self.slot.__set__(obj, value)
+
+
+class _FixedField(_Field):
+    """
+    Model attribute decoded into a fixed-point integer, see to_fixed().
 
+    `scale` is a number of decimals, or the name of the model attribute that holds it.
+    A key missing from the raw dict, holding null or a blank string, reads as None.
+    """
+
+    __slots__ = ("scale",)
 
-class Token:
     def __init__(
         self,
-        exchangeId: str,
-        id: str,
-        orgId: str,
-        scale: str,
-        sequence: int,
-        tokenId: str
+        key: str,
+        scale: Union[int, str]
     ):
-        self.token_id = tokenId
-        self.exchange_id = int(exchangeId)
-        self.id = int(id)
-        self.org_id = int(orgId)
+        super().__init__(key)
         self.scale = scale
-        self.sequence = sequence
 
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            return self
 
-class TradingPreferenceSet:
-    def __init__(
-        self,
-        completeRateDay30: str,
-        hasCompleteRateDay30: int,
-        hasNationalLimit: int,
-        hasOrderFinishNumberDay30: int,
-        hasRegisterTime: int,
-        hasUnPostAd: int,
-        isEmail: int,
-        isKyc: int,
-        isMobile: int,
-        nationalLimit: str,
-        orderFinishNumberDay30: int,
-        registerTimeThreshold: int
-    ):
-        self.complete_rate_day_30 = completeRateDay30
-        self.has_complete_rate_day_30 = bool(hasCompleteRateDay30)
-        self.has_national_limit = bool(hasNationalLimit)
-        self.has_order_finish_number_day_30 = bool(hasOrderFinishNumberDay30)
-        self.has_register_time = bool(hasRegisterTime)
-        self.has_un_post_ad = bool(hasUnPostAd)
-        self.is_email = bool(isEmail)
-        self.is_kyc = bool(isKyc)
-        self.id_mobile = bool(isMobile)
-        self.national_limit = nationalLimit
-        self.order_finish_number_day_30 = orderFinishNumberDay30
-        self.register_time_threshold = registerTimeThreshold
-
-
-class SymbolInfo:
-    def __init__(
-        self,
-        buyAd,
-        sellAd,
-        buyFeeRate: str,
-        currency: Currency,
-        currencyId: str,
-        currencyLowerMaxQuote: str,
-        currencyMaxQuote: str,
-        currencyMinQuote: str,
-        exchangeId: str,
-        id: str,
-        itemDownRange: str,
-        itemSideLimit: int,
-        itemUpRange: str,
-        kycCurrencyLimit: str,
-        lowerLimitAlarm: int,
-        orderAutoCancelMinute: int,
-        orderFinishMinute: int,
-        orgId: str,
-        sellFeeRate: str,
-        status: int,
-        token: Token,
-        tokenId: str,
-        tokenMaxQuote: str,
-        tokenMinQuote: str,
-        tradeSide: int,
-        upperLimitAlarm: int
-    ):
-        self.buy_ad = buyAd
-        self.buy_fee_rate = buyFeeRate
-        self.currency = currency
-        self.currency_id = currencyId
-        self.currency_lower_max_quote = float(currencyLowerMaxQuote)
-        self.currency_max_quote = float(currencyMaxQuote)
-        self.currency_lower_max_quote = float(currencyLowerMaxQuote)
-        self.currency_min_quote = float(currencyMinQuote)
-        self.exchange_id = int(exchangeId)
-        self.id = int(id)
-        self.item_down_range = float(itemDownRange)
-        self.item_side_limit = itemSideLimit
-        self.item_up_range = float(itemUpRange)
-        self.kyc_currency_limit = float(kycCurrencyLimit)
-        self.lower_limit_alarm = lowerLimitAlarm
-        self.order_auto_cancel_minute = orderAutoCancelMinute
-        self.order_finish_minute = orderFinishMinute
-        self.org_id = int(orgId)
-        self.sell_ad = sellAd
-        self.sell_fee_rate = sellFeeRate
-        self.status = status
-        self.token = token
-        self.token_id = tokenId
-        self.token_max_quote = float(tokenMaxQuote)
-        self.token_min_quote = float(tokenMinQuote)
-        self.trade_side = tradeSide
-        self.upper_limit_alarm = float(upperLimitAlarm)
-
-
-class PaymentTemplateItem:
-    def __init__(
-        self,
-        fieldName: str,
-        labelDialect: str,
-        placeholderDialect: str
-    ):
-        self.field_name = fieldName
-        self.label_dialect = labelDialect
-        self.placeholder_dialect = placeholderDialect
+        try:
+            return self.slot.__get__(obj, owner)
+        except AttributeError:
+            pass
 
+        value = obj._data.get(self.key)
+        if value is None or value == "":
+            value = None
+        else:
+            scale = self.scale if isinstance(self.scale, int) else getattr(obj, self.scale)
+            value = to_fixed(value, scale)
 
-class PaymentConfig:
-    def __init__(
-        self,
-        paymentDialect: str,
-        paymentName: str,
-        paymentTemplateItem: list,
-        paymentType: int
-    ):
-        self.peyment_dialect = paymentDialect
-        self.payment_name = paymentName
-        self.paymentTemplateItem = [PaymentTemplateItem(**item) for item in paymentTemplateItem]
-        self.payment_type = paymentType
+        self.slot.__set__(obj, value)
+        return value
 
 
-class PaymentTerm:
-    def __init__(
-        self,
-        accountNo: str,
-        bankName: str,
-        branchName: str,
-        businessName: str,
-        clabe: str,
-        concept: str,
-        debitCardNumber: str,
-        firstName: str,
-        id: str,
-        lastName: str,
-        mobile: str,
-        payMessage: str,
-        paymentConfig: dict,
-        paymentExt1: str,
-        paymentExt2: str,
-        paymentExt3: str,
-        paymentExt4: str,
-        paymentExt5: str,
-        paymentExt6: str,
-        paymentTemplateVersion: float,
-        paymentType: str,
-        qrcode: str,
-        realName: str,
-        realNameVerified: bool,
-        secondLastName: str,
-        visible: int
-    ):
-        self.account_no = accountNo if accountNo.strip() else None
-        self.bank_name = bankName if bankName.strip() else None
-        self.branch_name = branchName if branchName.strip() else None
-        self.business_name = businessName if businessName.strip() else None
-        self.clabe = clabe if clabe.strip() else None
-        self.concept = concept if concept.strip() else None
-        self.debit_card_number = debitCardNumber if debitCardNumber.strip() else None
-        self.first_name = firstName if firstName.strip() else None
-        self.id = int(id)
-        self.last_name = lastName if lastName.strip() else None
-        self.mobile = mobile if mobile.strip() else None
-        self.pay_message = payMessage if payMessage.strip() else None
-        self.payment_config = PaymentConfig(**paymentConfig)
-        self.payment_ext_1 = paymentExt1 if paymentExt1.strip() else None
-        self.payment_ext_2 = paymentExt2 if paymentExt2.strip() else None
-        self.payment_ext_3 = paymentExt3 if paymentExt3.strip() else None
-        self.payment_ext_4 = paymentExt4 if paymentExt4.strip() else None
-        self.payment_ext_5 = paymentExt5 if paymentExt5.strip() else None
-        self.payment_ext_6 = paymentExt6 if paymentExt6.strip() else None
-        self.payment_template_version = paymentTemplateVersion
-        self.payment_type = paymentType
-        self.qrcode = qrcode if qrcode.strip() else None
-        self.real_name = realName if realName.strip() else None
-        self.real_name_verified = realNameVerified
-        self.second_last_name = secondLastName if secondLastName.strip() else None
-        self.visible = bool(visible)
-
-
-class MarketAd:
-    def __init__(
-        self,
-        accountId: str,
-        createDate: str,
-        currencyId: str,
-        executedQuantity: str,
-        fee: str,
-        finishNum: str,
-        frozenQuantity: str,
-        id: str,
-        isOnline: bool,
-        itemType: str,
-        lastLogoutTime: str,
-        lastQuantity: str,
-        maxAmount: str,
-        minAmount: str,
-        nickName: str,
-        orderNum: int,
-        paymentPeriod: int,
-        payments: List[str],
-        premium: str,
-        price: str,
-        priceType: int,
-        quantity: str,
-        recentExecuteRate: int,
-        recentOrderNum: int,
-        remark: str,
-        side: int,
-        status: int,
-        symbolInfo: SymbolInfo,
-        tokenId: str,
-        tokenName: str,
-        tradingPreferenceSet: TradingPreferenceSet,
-        userId: str,
-        verificationOrderAmount: str,
-        verificationOrderLabels: list,
-        verificationOrderSwitch: bool,
-        version: float,
-        updateDate: str = None,
-        subsidyAd: bool = None,
-        paymentTerms: list = None,
-        feeRate = None,
-        authTag: List[str] = None,
-        ban: bool = None,
-        baned: bool = None,
-        blocked: str = None,
-        makerContact: bool = None,
-        recommend: bool = None,
-        recommendTag: str = None,
-        userMaskId: str = None,
-        userType: str = None,
-        authStatus: int = None,
-    ):
-        self.account_id = int(accountId)
-        self.auth_status = authStatus
-        self.auth_tag = authTag
-        self.ban = ban
-        self.baned = baned
-        self.blocked = blocked
-        self.create_date = int(createDate)
-        self.currency_id = currencyId
-        self.eexecuted_quantity = float(executedQuantity) if executedQuantity.strip() else None
-        self.fee = float(fee) if fee.strip() else None
-        self.finish_num = finishNum
-        self.frozen_quantity = float(frozenQuantity) if frozenQuantity.strip() else None
-        self.id = int(id)
-        self.is_online = isOnline
-        self.item_type = itemType
-        self.last_lagout_time = int(lastLogoutTime)
-        self.last_quantity = float(lastQuantity) if lastQuantity.strip() else None
-        self.maker_contract = makerContact
-        self.max_amount = float(maxAmount)
-        self.min_amount = float(minAmount)
-        self.nickname = nickName
-        self.order_num = orderNum
-        self.payment_period = paymentPeriod
-        self.payments = payments
-        self.premium = bool(premium)
-        self.price = float(price)
-        self.quantity = float(quantity)
-        self.recent_execute_rate = recentExecuteRate
-        self.recommend = recommend
-        self.remark = remark
-        self.side = "buy" if int(side) == 0 else "sell"
-        self.status = status
-        self.symbol_info = symbolInfo
-        self.token_id = tokenId
-        self.trading_preference_set = tradingPreferenceSet
-        self.user_id = userId
-        self.user_mask_id = userMaskId
-        self.user_type = userType
-        self.verification_order_amount = int(verificationOrderAmount)
-        self.verification_order_labels = verificationOrderLabels
-        self.verification_order_switch = verificationOrderSwitch
-        self.version = version
-        self.price_type = priceType
-        self.recent_order_num = recentOrderNum
-        self.token_name = tokenName
-        self.recommend_tag = recommendTag
-        self.update_date = updateDate
-        self.subsidy_ad = subsidyAd
-        self.payment_terms = [PaymentTerm(**item) for item in paymentTerms] if paymentTerms else []
-        self.fee_rate = feeRate
-
-
-class CoinBalance:
-    def __init__(
-        self,
-        bonus: str,
-        coin: str,
-        transferBalance: str,
-        walletBalance: str
-    ):
-        self.bonus = float(bonus) if bonus.strip() else None
-        self.name = coin
-        self.transfer_balance = float(transferBalance) if transferBalance.strip else None
-        self.wallet_balance = float(walletBalance) if walletBalance.strip() else None
+class _ModelMeta(type):
+    """
+    Gives every _Field of a model class its own cache slot, so instances carry no __dict__.
+    """
 
+    def __new__(mcls, name, bases, namespace):
+        fields = {key: value for key, value in namespace.items() if isinstance(value, _Field)}
+        namespace["__slots__"] = tuple(namespace.get("__slots__", ())) + tuple(f"_{key}_" for key in fields)
 
-class PrivilegeInfo:
-    def __init__(self, name: str, data: str):
-        self.name = name
-        self.data = data
+        cls = super().__new__(mcls, name, bases, namespace)
 
+        for key, field in fields.items():
+            field.slot = cls.__dict__[f"_{key}_"]
 
-class AccountInfo:
-    def __init__(
-        self,
-        accountCreateDays: int,
-        accountId: str,
-        averageReleaseTime: str,
-        averageTransferTime: str,
-        badAppraiseCount: int,
-        blocked: str,
-        canSubOnline: bool,
-        contactConfig: bool,
-        contactCount: int,
-        curPrivilegeInfo: list,
-        defaultNickName: bool,
-        email: str,
-        executeNum: int,
-        firstTradeDays: int,
-        goodAppraiseCount: int,
-        goodAppraiseRate: str,
-        hasUnPostAd: int,
-        isOnline: bool,
-        kycCountryCode: str,
-        kycLevel: int,
-        last30TradeCurrency: str,
-        lastLogoutTime: str,
-        lostRoleAffected: bool,
-        mobile: str,
-        nickName: str,
-        openApiSwitch: int,
-        orderNum: int,
-        paymentCount: int,
-        paymentRealNameUneditable: bool,
-        realName: str,
-        realNameEn: str,
-        realNameMask: str,
-        recentFinishCount: int,
-        recentRate: float,
-        recentTradeAmount: str,
-        registerTime: str,
-        totalFinishBuyCount: int,
-        totalFinishCount: int,
-        totalFinishSellCount: int,
-        totalTradeAmount: str,
-        userCancelCountLimit: int,
-        userCurPrivilege: list,
-        userId: str,
-        userTag: list,
-        userType: str,
-        vipLevel: int,
-        vipProfit: str,
-        whiteFlag: int,
-        authStatus: int = None,
-    ):
-        self.account_create_days = accountCreateDays
-        self.account_id = int(accountId)
-        self.auth_status = authStatus
-        self.average_release_time = int(averageReleaseTime)
-        self.average_transfer_time = int(averageTransferTime)
-        self.bad_appraise_count = badAppraiseCount
-        self.blocked = blocked
-        self.can_sub_online = canSubOnline
-        self.contact_config = contactConfig
-        self.contact_count = contactCount
-        self.cur_privilege_info = [PrivilegeInfo(**info) for info in curPrivilegeInfo]
-        self.default_nickname = defaultNickName
-        self.email = email if email.strip() else None
-        self.execute_num = executeNum
-        self.first_trade_days = firstTradeDays
-        self.good_appraise_count = goodAppraiseCount
-        self.good_appraise_rate = float(goodAppraiseRate)
-        self.has_un_post_ad = bool(hasUnPostAd)
-        self.is_online = isOnline
-        self.kyc_country_code = kycCountryCode
-        self.kyc_level = kycLevel
-        self.last_30_days_trade_currency = last30TradeCurrency
-        self.last_logout_time = int(lastLogoutTime)
-        self.last_role_affected = lostRoleAffected
-        self.mobile = mobile if mobile.strip() else None
-        self.nickname = nickName
-        self.open_api_switch = bool(openApiSwitch)
-        self.order_num = orderNum
-        self.payment_count = paymentCount
-        self.payment_real_name_uneditable = paymentRealNameUneditable
-        self.real_name = realName
-        self.real_name_en = realNameEn
-        self.real_name_mask = realNameMask
-        self.recent_finish_count = recentFinishCount
-        self.recent_rate = recentRate
-        self.recent_trade_amount = float(recentTradeAmount) if recentTradeAmount.strip() else None
-        self.register_time = int(registerTime)
-        self.total_finish_buy_count = totalFinishBuyCount
-        self.total_finish_count = totalFinishCount
-        self.total_finish_sell_count = totalFinishSellCount
-        self.total_trade_amount = float(totalTradeAmount) if totalTradeAmount.strip() else None
-        self.user_cur_privilege = userCurPrivilege
-        self.user_id = int(userId)
-        self.user_tag = userTag
-        self.user_type = userType
-        self.vip_level = vipLevel
-        self.vip_profit = vipProfit
-        self.white_flag = whiteFlag
-        self.user_cancel_count_limit = userCancelCountLimit
+        return cls
+
+
+class _Model(metaclass=_ModelMeta):
+    """
+    Lazy view over a raw API dict.
+
+    Construction only stores a reference to the dict. String to number conversions and nested
+    models are decoded when an attribute is first read.
+    """
+
+    __slots__ = ("_data",)
+
+    def __init__(self, **data):
+        self._data = data
+
+    @classmethod
+    def from_dict(cls, data: dict):
+        """
+        Wrap `data` without copying it. Faster than cls(**data).
+        """
+
+        obj = cls.__new__(cls)
+        obj._data = data
+        return obj
+
+    def to_dict(self) -> dict:
+        """
+        The raw API dict the model wraps. Not a copy.
+        """
+
+        return self._data
+
+
+def _float_or_none(value: str):
+    return float(value) if value.strip() else None
+
+
+def _str_or_none(value: str):
+    return value if value.strip() else None
+
+
+def _model(cls) -> Callable:
+    def convert(value):
+        return cls.from_dict(value) if isinstance(value, dict) else value
+    return convert
+
+
+def _model_list(cls) -> Callable:
+    def convert(value):
+        return [cls.from_dict(item) for item in value]
+    return convert
+
+
+class Currency(_Model):
+    currency_id = _Field("currencyId")
+    exchange_id = _Field("exchangeId", int)
+    id = _Field("id", int)
+    org_id = _Field("orgId", int)
+    scale = _Field("scale")
+
+
+class Token(_Model):
+    token_id = _Field("tokenId")
+    exchange_id = _Field("exchangeId", int)
+    id = _Field("id", int)
+    org_id = _Field("orgId", int)
+    scale = _Field("scale")
+    sequence = _Field("sequence")
+
+
+class TradingPreferenceSet(_Model):
+    complete_rate_day_30 = _Field("completeRateDay30")
+    has_complete_rate_day_30 = _Field("hasCompleteRateDay30", bool)
+    has_national_limit = _Field("hasNationalLimit", bool)
+    has_order_finish_number_day_30 = _Field("hasOrderFinishNumberDay30", bool)
+    has_register_time = _Field("hasRegisterTime", bool)
+    has_un_post_ad = _Field("hasUnPostAd", bool)
+    is_email = _Field("isEmail", bool)
+    is_kyc = _Field("isKyc", bool)
+    id_mobile = _Field("isMobile", bool)
+    national_limit = _Field("nationalLimit")
+    order_finish_number_day_30 = _Field("orderFinishNumberDay30")
+    register_time_threshold = _Field("registerTimeThreshold")
+
+
+class SymbolInfo(_Model):
+    buy_ad = _Field("buyAd")
+    buy_fee_rate = _Field("buyFeeRate")
+    currency = _Field("currency", _model(Currency))
+    currency_id = _Field("currencyId")
+    currency_lower_max_quote = _Field("currencyLowerMaxQuote", float)
+    currency_max_quote = _Field("currencyMaxQuote", float)
+    currency_min_quote = _Field("currencyMinQuote", float)
+    exchange_id = _Field("exchangeId", int)
+    id = _Field("id", int)
+    item_down_range = _Field("itemDownRange", float)
+    item_side_limit = _Field("itemSideLimit")
+    item_up_range = _Field("itemUpRange", float)
+    kyc_currency_limit = _Field("kycCurrencyLimit", float)
+    lower_limit_alarm = _Field("lowerLimitAlarm")
+    order_auto_cancel_minute = _Field("orderAutoCancelMinute")
+    order_finish_minute = _Field("orderFinishMinute")
+    org_id = _Field("orgId", int)
+    sell_ad = _Field("sellAd")
+    sell_fee_rate = _Field("sellFeeRate")
+    status = _Field("status")
+    token = _Field("token", _model(Token))
+    token_id = _Field("tokenId")
+    token_max_quote = _Field("tokenMaxQuote", float)
+    token_min_quote = _Field("tokenMinQuote", float)
+    trade_side = _Field("tradeSide")
+    upper_limit_alarm = _Field("upperLimitAlarm", float)
+
+    currency_min_quote_fixed = _FixedField("currencyMinQuote", "price_scale")
+    currency_max_quote_fixed = _FixedField("currencyMaxQuote", "price_scale")
+    token_min_quote_fixed = _FixedField("tokenMinQuote", "quantity_scale")
+    token_max_quote_fixed = _FixedField("tokenMaxQuote", "quantity_scale")
+
+    @property
+    def price_scale(self) -> int:
+        """
+        Decimals of fiat prices and amounts: currency.scale.
+        """
+
+        return _nested_scale(self._data, "currency", DEFAULT_PRICE_SCALE)
+
+    @property
+    def quantity_scale(self) -> int:
+        """
+        Decimals of token amounts: token.scale.
+        """
+
+        return _nested_scale(self._data, "token", DEFAULT_QUANTITY_SCALE)
+
+
+class PaymentTemplateItem(_Model):
+    field_name = _Field("fieldName")
+    label_dialect = _Field("labelDialect")
+    placeholder_dialect = _Field("placeholderDialect")
+
+
+class PaymentConfig(_Model):
+    peyment_dialect = _Field("paymentDialect")
+    payment_name = _Field("paymentName")
+    paymentTemplateItem = _Field("paymentTemplateItem", _model_list(PaymentTemplateItem))
+    payment_type = _Field("paymentType")
+
+
+class PaymentTerm(_Model):
+    account_no = _Field("accountNo", _str_or_none)
+    bank_name = _Field("bankName", _str_or_none)
+    branch_name = _Field("branchName", _str_or_none)
+    business_name = _Field("businessName", _str_or_none)
+    clabe = _Field("clabe", _str_or_none)
+    concept = _Field("concept", _str_or_none)
+    debit_card_number = _Field("debitCardNumber", _str_or_none)
+    first_name = _Field("firstName", _str_or_none)
+    id = _Field("id", int)
+    last_name = _Field("lastName", _str_or_none)
+    mobile = _Field("mobile", _str_or_none)
+    pay_message = _Field("payMessage", _str_or_none)
+    payment_config = _Field("paymentConfig", _model(PaymentConfig))
+    payment_ext_1 = _Field("paymentExt1", _str_or_none)
+    payment_ext_2 = _Field("paymentExt2", _str_or_none)
+    payment_ext_3 = _Field("paymentExt3", _str_or_none)
+    payment_ext_4 = _Field("paymentExt4", _str_or_none)
+    payment_ext_5 = _Field("paymentExt5", _str_or_none)
+    payment_ext_6 = _Field("paymentExt6", _str_or_none)
+    payment_template_version = _Field("paymentTemplateVersion")
+    payment_type = _Field("paymentType")
+    qrcode = _Field("qrcode", _str_or_none)
+    real_name = _Field("realName", _str_or_none)
+    real_name_verified = _Field("realNameVerified")
+    second_last_name = _Field("secondLastName", _str_or_none)
+    visible = _Field("visible", bool)
+
+
+class MarketAd(_Model):
+    account_id = _Field("accountId", int)
+    auth_status = _Field("authStatus")
+    auth_tag = _Field("authTag")
+    ban = _Field("ban")
+    baned = _Field("baned")
+    blocked = _Field("blocked")
+    create_date = _Field("createDate", int)
+    currency_id = _Field("currencyId")
+    eexecuted_quantity = _Field("executedQuantity", _float_or_none)
+    fee = _Field("fee", _float_or_none)
+    finish_num = _Field("finishNum")
+    frozen_quantity = _Field("frozenQuantity", _float_or_none)
+    id = _Field("id", int)
+    is_online = _Field("isOnline")
+    item_type = _Field("itemType")
+    last_lagout_time = _Field("lastLogoutTime", int)
+    last_quantity = _Field("lastQuantity", _float_or_none)
+    maker_contract = _Field("makerContact")
+    max_amount = _Field("maxAmount", float)
+    min_amount = _Field("minAmount", float)
+    nickname = _Field("nickName")
+    order_num = _Field("orderNum")
+    payment_period = _Field("paymentPeriod")
+    payments = _Field("payments")
+    premium = _Field("premium", bool)
+    premium_percent = _Field("premium", _str_or_none)
+    price = _Field("price", float)
+    quantity = _Field("quantity", float)
+    recent_execute_rate = _Field("recentExecuteRate")
+    recommend = _Field("recommend")
+    remark = _Field("remark")
+    side = _Field("side", lambda value: "buy" if int(value) == 0 else "sell")
+    status = _Field("status")
+    symbol_info = _Field("symbolInfo", _model(SymbolInfo))
+    token_id = _Field("tokenId")
+    trading_preference_set = _Field("tradingPreferenceSet", _model(TradingPreferenceSet))
+    user_id = _Field("userId")
+    user_mask_id = _Field("userMaskId")
+    user_type = _Field("userType")
+    verification_order_amount = _Field("verificationOrderAmount", int)
+    verification_order_labels = _Field("verificationOrderLabels")
+    verification_order_switch = _Field("verificationOrderSwitch")
+    version = _Field("version")
+    price_type = _Field("priceType")
+    recent_order_num = _Field("recentOrderNum")
+    token_name = _Field("tokenName")
+    recommend_tag = _Field("recommendTag")
+    update_date = _Field("updateDate")
+    subsidy_ad = _Field("subsidyAd")
+    payment_terms = _Field("paymentTerms", _model_list(PaymentTerm), default_factory=list)
+    fee_rate = _Field("feeRate")
+
+    # Fixed-point counterparts, exact to compare, sort and add. Fiat values use price_scale,
+    # token values quantity_scale.
+    price_fixed = _FixedField("price", "price_scale")
+    min_amount_fixed = _FixedField("minAmount", "price_scale")
+    max_amount_fixed = _FixedField("maxAmount", "price_scale")
+    quantity_fixed = _FixedField("quantity", "quantity_scale")
+    last_quantity_fixed = _FixedField("lastQuantity", "quantity_scale")
+    frozen_quantity_fixed = _FixedField("frozenQuantity", "quantity_scale")
+    executed_quantity_fixed = _FixedField("executedQuantity", "quantity_scale")
+
+    @property
+    def price_scale(self) -> int:
+        """
+        Decimals of the price and the limits: symbolInfo.currency.scale, 2 if the ad has no symbolInfo.
+        """
+
+        return _nested_scale(self._data.get("symbolInfo"), "currency", DEFAULT_PRICE_SCALE)
+
+    @property
+    def quantity_scale(self) -> int:
+        """
+        Decimals of token quantities: symbolInfo.token.scale, 4 if the ad has no symbolInfo.
+        """
+
+        return _nested_scale(self._data.get("symbolInfo"), "token", DEFAULT_QUANTITY_SCALE)
+
+
+class CoinBalance(_Model):
+    bonus = _Field("bonus", _float_or_none)
+    name = _Field("coin")
+    transfer_balance = _Field("transferBalance", _float_or_none)
+    wallet_balance = _Field("walletBalance", _float_or_none)
+
+    # Balances carry no scale of their own, so these use BALANCE_SCALE (8) decimals.
+    bonus_fixed = _FixedField("bonus", BALANCE_SCALE)
+    transfer_balance_fixed = _FixedField("transferBalance", BALANCE_SCALE)
+    wallet_balance_fixed = _FixedField("walletBalance", BALANCE_SCALE)
+
+
+class PrivilegeInfo(_Model):
+    name = _Field("name")
+    data = _Field("data")
+
+
+class AccountInfo(_Model):
+    account_create_days = _Field("accountCreateDays")
+    account_id = _Field("accountId", int)
+    auth_status = _Field("authStatus")
+    average_release_time = _Field("averageReleaseTime", int)
+    average_transfer_time = _Field("averageTransferTime", int)
+    bad_appraise_count = _Field("badAppraiseCount")
+    blocked = _Field("blocked")
+    can_sub_online = _Field("canSubOnline")
+    contact_config = _Field("contactConfig")
+    contact_count = _Field("contactCount")
+    cur_privilege_info = _Field("curPrivilegeInfo", _model_list(PrivilegeInfo))
+    default_nickname = _Field("defaultNickName")
+    email = _Field("email", _str_or_none)
+    execute_num = _Field("executeNum")
+    first_trade_days = _Field("firstTradeDays")
+    good_appraise_count = _Field("goodAppraiseCount")
+    good_appraise_rate = _Field("goodAppraiseRate", float)
+    has_un_post_ad = _Field("hasUnPostAd", bool)
+    is_online = _Field("isOnline")
+    kyc_country_code = _Field("kycCountryCode")
+    kyc_level = _Field("kycLevel")
+    last_30_days_trade_currency = _Field("last30TradeCurrency")
+    last_logout_time = _Field("lastLogoutTime", int)
+    last_role_affected = _Field("lostRoleAffected")
+    mobile = _Field("mobile", _str_or_none)
+    nickname = _Field("nickName")
+    open_api_switch = _Field("openApiSwitch", bool)
+    order_num = _Field("orderNum")
+    payment_count = _Field("paymentCount")
+    payment_real_name_uneditable = _Field("paymentRealNameUneditable")
+    real_name = _Field("realName")
+    real_name_en = _Field("realNameEn")
+    real_name_mask = _Field("realNameMask")
+    recent_finish_count = _Field("recentFinishCount")
+    recent_rate = _Field("recentRate")
+    recent_trade_amount = _Field("recentTradeAmount", _float_or_none)
+    register_time = _Field("registerTime", int)
+    total_finish_buy_count = _Field("totalFinishBuyCount")
+    total_finish_count = _Field("totalFinishCount")
+    total_finish_sell_count = _Field("totalFinishSellCount")
+    total_trade_amount = _Field("totalTradeAmount", _float_or_none)
+    user_cur_privilege = _Field("userCurPrivilege")
+    user_id = _Field("userId", int)
+    user_tag = _Field("userTag")
+    user_type = _Field("userType")
+    vip_level = _Field("vipLevel")
+    vip_profit = _Field("vipProfit")
+    white_flag = _Field("whiteFlag")
+    user_cancel_count_limit = _Field("userCancelCountLimit")
+
+
+class Order(_Model):
+    amount = _Field("amount", float)
+    bulk_order_flag = _Field("bulkOrderFlag")
+    create_date = _Field("createDate", int)
+    currency_id = _Field("currencyId")
+    extension = _Field("extension")
+    fee = _Field("fee", _float_or_none)
+    id = _Field("id")
+    judge_info = _Field("judgeInfo")
+    notify_token_id = _Field("notifyTokenId")
+    notify_token_quantity = _Field("notifyTokenQuantity", _float_or_none)
+    order_type = _Field("orderType")
+    price = _Field("price", float)
+    quantity = _Field("quantity", _float_or_none)
+    self_unread_msg_count = _Field("selfUnreadMsgCount", int)
+    side = _Field("side", lambda value: "buy" if int(value) == 0 else "sell")
+    status = _Field("status", int)
+    target_nickname = _Field("targetNickName")
+    target_user_id = _Field("targetUserId")
+    token_id = _Field("tokenId")
+    transfer_last_seconds = _Field("transferLastSeconds", int)
+    appeal_last_seconds = _Field("appealLastSeconds", int)
+    user_id = _Field("userId")
+    seller_real_name = _Field("sellerRealName")
+    buyer_real_name = _Field("buyerRealName")
+    unread_msg_count = _Field("unreadMsgCount", int)
+
+
+class OrderDetail(Order):
+    account_id = _Field("accountId")
+    appeal_content = _Field("appealContent")
+    appeal_number = _Field("appealNumber")
+    appeal_type = _Field("appealType")
+    appeal_user_id = _Field("appealUserId")
+    cancel_reason = _Field("cancelReason")
+    confirmed_pay_term = _Field("confirmedPayTerm", _model(PaymentTerm))
+    fiat_balance = _Field("fiatBalance", _float_or_none)
+    item_id = _Field("itemId")
+    maker_fee = _Field("makerFee", _float_or_none)
+    maker_user_id = _Field("makerUserId")
+    nickname = _Field("nickName")
+    order_source = _Field("orderSource")
+    pay_code = _Field("payCode")
+    payment_term_list = _Field("paymentTermList", _model_list(PaymentTerm), default_factory=list)
+    payment_type = _Field("paymentType")
+    remark = _Field("remark")
+    target_account_id = _Field("targetAccountId")
+    taker_fee = _Field("takerFee", _float_or_none)
+    token_balance = _Field("tokenBalance", _float_or_none)
+    token_name = _Field("tokenName")
+    transfer_date = _Field("transferDate", int)
+    update_date = _Field("updateDate", int)
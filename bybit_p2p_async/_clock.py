@@ -0,0 +1,193 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+SERVER_TIME_PATH = "/v5/market/time"
+
+# A failed sync is not retried for this long, so an unreachable time endpoint does not cost
+# every request an extra round trip.
+_FAILED_SYNC_BACKOFF = 5.0
+
+
+class ServerClock:
+    """
+    Estimate of the Bybit server clock, used to stamp signed requests.
+
+    Every sample is a request sent at local time t0 and answered at t1 with server time ts. Its
+    offset is ts - (t0 + t1) / 2, accurate to half the round trip, so the sample with the
+    smallest round trip among the last `window` is used. Samples come from sync(), which queries
+    /v5/market/time, and from the "time" field of every API response.
+
+    Offsets are kept against time.monotonic(), so a step of the local wall clock does not
+    invalidate them.
+
+    Args:
+        samples (int, optional): Requests made by one sync(). Default 5.
+        window (int, optional): Recent samples the best one is chosen from. Default 64.
+        resync_interval (float, optional): Seconds without any sample after which the next request syncs first. Default 300.
+    """
+
+    def __init__(
+        self,
+        samples: int = 5,
+        window: int = 64,
+        resync_interval: float = 300.0
+    ):
+        self._samples_per_sync = samples
+        self._samples: deque = deque(maxlen=window)
+        self._resync_interval = resync_interval
+
+        # Server time in seconds is time.monotonic() + _offset.
+        self._offset: Optional[float] = None
+        self._rtt: Optional[float] = None
+        self._last_sample = 0.0
+        self._last_failure = None
+        self._lock = asyncio.Lock()
+
+        self.syncs = 0
+        self.passive_samples = 0
+
+    @property
+    def synced(self) -> bool:
+        return self._offset is not None
+
+    @property
+    def offset(self) -> Optional[float]:
+        """
+        Server time minus local wall clock time, milliseconds. None before the first sample.
+        """
+
+        if self._offset is None:
+            return None
+        return (time.monotonic() + self._offset - time.time()) * 1000
+
+    @property
+    def rtt(self) -> Optional[float]:
+        """
+        Round trip of the sample in use, milliseconds.
+        """
+
+        return self._rtt * 1000 if self._rtt is not None else None
+
+    def now_ms(self) -> int:
+        """
+        Current server time estimate in milliseconds, or local time before the first sample.
+        """
+
+        if self._offset is None:
+            return int(time.time() * 10 ** 3)
+        return int((time.monotonic() + self._offset) * 10 ** 3)
+
+    def add_sample(self, sent: float, received: float, server_ms: float) -> None:
+        """
+        Add a sample: a request sent and answered at `sent` and `received` (time.monotonic()),
+        with server time `server_ms` in milliseconds from the response.
+        """
+
+        rtt = received - sent
+        if rtt < 0:
+            return None
+
+        self._samples.append((rtt, server_ms / 1000 - (sent + received) / 2))
+        self._last_sample = received
+
+        rtt, offset = min(self._samples)
+        self._rtt = rtt
+        self._offset = offset
+
+    def observe(self, sent: float, received: float, response_data) -> None:
+        """
+        Take a passive sample from the "time" field of an API response.
+        """
+
+        server_ms = response_data.get("time") if isinstance(response_data, dict) else None
+        if server_ms:
+            self.passive_samples += 1
+            self.add_sample(sent, received, float(server_ms))
+
+    def needs_sync(self) -> bool:
+        now = time.monotonic()
+        if self._last_failure is not None and now - self._last_failure < _FAILED_SYNC_BACKOFF:
+            return False
+        return self._offset is None or now - self._last_sample > self._resync_interval
+
+    def invalidate(self) -> None:
+        """
+        Forget all samples, e.g. after the server rejected a timestamp.
+        """
+
+        self._samples.clear()
+        self._offset = None
+        self._rtt = None
+
+    async def sync(self, transport, base_url: str, codec) -> bool:
+        """
+        Query the server time endpoint `samples` times. Concurrent calls share one sync.
+
+        Returns:
+            bool: True if at least one sample was taken. Failures are logged, not raised.
+        """
+
+        started = time.monotonic()
+        async with self._lock:
+            # Another task synced, or failed to, while this one waited for the lock.
+            if self._last_sample > started:
+                return True
+            if self._last_failure is not None and self._last_failure > started:
+                return False
+
+            taken = 0
+            for _ in range(self._samples_per_sync):
+                try:
+                    sent = time.monotonic()
+                    response = await transport.request("GET", base_url + SERVER_TIME_PATH)
+                    received = time.monotonic()
+                    data = codec.loads(response.body)
+                except Exception as ex:
+                    logger.warning("Server time sync failed: %r", ex)
+                    break
+
+                server_ms = _server_time_ms(data)
+                if response.status != 200 or server_ms is None:
+                    logger.warning("Server time sync failed: HTTP %s", response.status)
+                    break
+
+                self.add_sample(sent, received, server_ms)
+                taken += 1
+
+            self.syncs += 1
+            self._last_failure = None if taken else time.monotonic()
+            return bool(taken)
+
+    def stats(self) -> dict:
+        return {
+            "synced": self.synced,
+            "offset_ms": self.offset,
+            "rtt_ms": self.rtt,
+            "samples": len(self._samples),
+            "syncs": self.syncs,
+            "passive_samples": self.passive_samples,
+        }
+
+
+def _server_time_ms(data) -> Optional[float]:
+    # Most precise first: nanoseconds of /v5/market/time, then the millisecond "time" every
+    # response carries, then whole seconds.
+    if not isinstance(data, dict):
+        return None
+
+    result = data.get("result")
+    if isinstance(result, dict) and result.get("timeNano"):
+        return int(result["timeNano"]) / 10 ** 6
+
+    if data.get("time"):
+        return float(data["time"])
+
+    if isinstance(result, dict) and result.get("timeSecond"):
+        return int(result["timeSecond"]) * 1000.0
+
+    return None
@@ -1,3 +1,7 @@
+from datetime import datetime as dt
+from datetime import timezone
+
+
 # stolen from https://github.com/bybit-exchange/pybit/blob/master/pybit/exceptions.py
 class FailedRequestError(Exception):
     """
@@ -9,15 +13,40 @@ class FailedRequestError(Exception):
         status_code -- The code number returned.
         time -- The time of the error.
         resp_headers -- The response headers from API. None, if the request caused an error locally.
+        ret_code -- The retCode the API answered with. None, if the request failed before that.
     """
 
-    def __init__(self, request, message, status_code, time, resp_headers):
+    def __init__(self, request, message, status_code, time, resp_headers, ret_code=None):
         self.request = request
         self.message = message
         self.status_code = status_code
         self.time = time
         self.resp_headers = resp_headers
+        self.ret_code = ret_code
         super().__init__(
-            f"{message.capitalize()} (ErrCode: {status_code}) (ErrTime: {time})"
+            f"{message.capitalize()} (ErrCode: {status_code if ret_code is None else ret_code}) (ErrTime: {time})"
             f".\nRequest → {request}."
-        )
\ No newline at end of file
+        )
+
+
+def ret_code_error(request, data) -> FailedRequestError:
+    """
+    FailedRequestError for a call that returned `data`, the (retCode, retMsg) tuple of a failed request.
+
+    Such responses come with HTTP status 200, so status_code is 200 and the retCode is in ret_code.
+    """
+
+    return FailedRequestError(
+        request=request,
+        message=str(data[1]),
+        status_code=200,
+        time=dt.now(timezone.utc).strftime("%H:%M:%S"),
+        resp_headers=None,
+        ret_code=data[0],
+    )
+
+
+class CassetteMissError(Exception):
+    """
+    Exception raised by ReplayTransport for a request the cassette has no response for.
+    """
@@ -0,0 +1,73 @@
+from decimal import ROUND_HALF_UP, Decimal, InvalidOperation
+from typing import Union
+
+# Used when an ad carries no symbolInfo: fiat prices and limits have 2 decimals, token amounts 4.
+DEFAULT_PRICE_SCALE = 2
+DEFAULT_QUANTITY_SCALE = 4
+# Balances come without a scale. 8 decimals hold every token Bybit lists.
+BALANCE_SCALE = 8
+
+_POWERS = [10 ** scale for scale in range(19)]
+
+
+def _power(scale: int) -> int:
+    return _POWERS[scale] if scale < len(_POWERS) else 10 ** scale
+
+
+def _nested_scale(data, key: str, default: int) -> int:
+    # "scale" of a nested currency or token dict. It comes as a number or as a string.
+    nested = data.get(key) if isinstance(data, dict) else None
+    if isinstance(nested, dict):
+        scale = nested.get("scale")
+        if scale is not None and scale != "":
+            return int(scale)
+    return default
+
+
+def to_fixed(value: Union[str, int, float, Decimal], scale: int) -> int:
+    """
+    Decimal number as an integer count of 10**-scale units: to_fixed("92.59", 2) == 9259.
+
+    Strings are parsed digit by digit, without going through float, so the result is exact.
+    Digits beyond `scale` are rounded half away from zero. A float is read through its shortest
+    repr, so to_fixed(0.1, 2) == 10.
+    """
+
+    if isinstance(value, int):
+        return value * _power(scale)
+    if isinstance(value, float):
+        value = repr(value)
+    elif isinstance(value, Decimal):
+        value = str(value)
+
+    whole, _, fraction = value.strip().partition(".")
+    digits = whole.lstrip("+-")
+    if len(fraction) <= scale and (digits or fraction) and (not digits or digits.isdigit()) and (not fraction or fraction.isdigit()):
+        # "-0.5" gives "-050": int() handles the sign and the leading zeros.
+        return int(whole + fraction.ljust(scale, "0"))
+
+    # Exponents, extra digits and anything unusual.
+    try:
+        return int(Decimal(value).scaleb(scale).quantize(Decimal(1), rounding=ROUND_HALF_UP))
+    except InvalidOperation:
+        raise ValueError(f"Not a decimal number: {value!r}")
+
+
+def from_fixed(value: int, scale: int) -> float:
+    """
+    Nearest float to a fixed-point value. Equal to float() of the API string it came from.
+    """
+
+    return value / _power(scale)
+
+
+def format_fixed(value: int, scale: int) -> str:
+    """
+    API string for a fixed-point value, with exactly `scale` decimals: format_fixed(9259, 2) == "92.59".
+    """
+
+    sign = "-" if value < 0 else ""
+    whole, fraction = divmod(abs(value), _power(scale))
+    if not scale:
+        return f"{sign}{whole}"
+    return f"{sign}{whole}.{fraction:0{scale}d}"
@@ -0,0 +1,204 @@
+import weakref
+from bisect import bisect_left
+from collections import defaultdict
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+# Seconds. Bybit round trips sit between a few and a few hundred milliseconds.
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 10.0)
+
+_PREFIX = "bybit_p2p"
+
+# (source id, metric name, labels, value). Samples of one metric and labels from distinct
+# sources are summed, the same source reported twice (e.g. a shared transport) counts once.
+GaugeSample = Tuple[int, str, Tuple[Tuple[str, str], ...], float]
+
+_GAUGE_HELP = {
+    "pool_connections_limit": "Connection pool size limit.",
+    "pool_connections_acquired": "Connections in use.",
+    "pool_connections_idle": "Keep-alive connections waiting in the pool.",
+    "rate_limit_tokens": "Requests the rate limiter allows right now, by group.",
+    "rate_limit_waiters": "Requests queued in the rate limiter, by group.",
+}
+
+
+class LatencyHistogram:
+    """
+    Cumulative-bucket latency histogram, Prometheus style.
+    """
+
+    __slots__ = ("bounds", "counts", "sum", "count")
+
+    def __init__(self, bounds: Tuple[float, ...]):
+        self.bounds = bounds
+        # One slot per bound plus +Inf. Counts are per bucket, made cumulative when read.
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> List[int]:
+        total = 0
+        result = []
+        for count in self.counts:
+            total += count
+            result.append(total)
+        return result
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Estimate of the q-quantile, interpolated within its bucket.
+        """
+
+        if not self.count:
+            return None
+
+        rank = q * self.count
+        seen = 0
+        lower = 0.0
+        for bound, count in zip(self.bounds, self.counts):
+            if count and seen + count >= rank:
+                return lower + (bound - lower) * (rank - seen) / count
+            seen += count
+            lower = bound
+        return self.bounds[-1]
+
+
+class Metrics:
+    """
+    Request metrics: per-endpoint latency histograms, HTTP status, retCode and error counters,
+    bytes sent and received, and connection pool and rate limiter gauges.
+
+    Clients record into it only when one is passed (metrics=...), otherwise the hot path pays a
+    single None check. One Metrics can be shared by many clients. render() returns the
+    Prometheus text exposition format.
+
+    Args:
+        buckets (Iterable[float], optional): Latency histogram bounds, seconds.
+    """
+
+    def __init__(
+        self,
+        buckets: Iterable[float] = DEFAULT_BUCKETS
+    ):
+        self._buckets = tuple(sorted(buckets))
+
+        self.latency: Dict[str, LatencyHistogram] = {}
+        self.statuses: Dict[Tuple[str, int], int] = defaultdict(int)
+        self.ret_codes: Dict[Tuple[str, int], int] = defaultdict(int)
+        self.errors: Dict[Tuple[str, str], int] = defaultdict(int)
+        self.retries: Dict[str, int] = defaultdict(int)
+        self.bytes_sent: Dict[str, int] = defaultdict(int)
+        self.bytes_received: Dict[str, int] = defaultdict(int)
+
+        self._collectors: List[weakref.WeakMethod] = []
+
+    def observe_response(
+        self,
+        endpoint: str,
+        status: int,
+        latency: float,
+        sent: int,
+        received: int
+    ) -> None:
+        histogram = self.latency.get(endpoint)
+        if histogram is None:
+            histogram = self.latency[endpoint] = LatencyHistogram(self._buckets)
+        histogram.observe(latency)
+
+        self.statuses[endpoint, status] += 1
+        self.bytes_sent[endpoint] += sent
+        self.bytes_received[endpoint] += received
+
+    def observe_ret_code(self, endpoint: str, ret_code: int) -> None:
+        self.ret_codes[endpoint, ret_code] += 1
+
+    def observe_error(self, endpoint: str, error: Exception) -> None:
+        self.errors[endpoint, type(error).__name__] += 1
+
+    def observe_retry(self, endpoint: str) -> None:
+        self.retries[endpoint] += 1
+
+    def add_collector(self, collector: Callable[[], Iterable[GaugeSample]]) -> None:
+        """
+        Register a bound method that reports gauges at render time. Held weakly, so a closed and
+        dropped client stops reporting.
+        """
+
+        self._collectors.append(weakref.WeakMethod(collector))
+
+    def quantile(self, endpoint: str, q: float) -> Optional[float]:
+        histogram = self.latency.get(endpoint)
+        return histogram.quantile(q) if histogram is not None else None
+
+    def _gauges(self) -> Dict[Tuple[str, tuple], float]:
+        by_source: Dict[Tuple[str, tuple], Dict[int, float]] = defaultdict(dict)
+        alive = []
+        for ref in self._collectors:
+            collector = ref()
+            if collector is None:
+                continue
+            alive.append(ref)
+            for source, name, labels, value in collector():
+                by_source[name, labels][source] = value
+        self._collectors = alive
+
+        return {key: sum(values.values()) for key, values in by_source.items()}
+
+    def render(self) -> str:
+        """
+        All metrics in the Prometheus text exposition format.
+        """
+
+        lines: List[str] = []
+
+        def header(name: str, kind: str, help: str) -> str:
+            name = f"{_PREFIX}_{name}"
+            lines.append(f"# HELP {name} {help}")
+            lines.append(f"# TYPE {name} {kind}")
+            return name
+
+        name = header("request_duration_seconds", "histogram", "Request latency, from send to the full response body.")
+        for endpoint, histogram in sorted(self.latency.items()):
+            labels = f'endpoint="{_escape(endpoint)}"'
+            for bound, count in zip(self._buckets + (float("inf"),), histogram.cumulative()):
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f'{name}_bucket{{{labels},le="{le}"}} {count}')
+            lines.append(f"{name}_sum{{{labels}}} {histogram.sum!r}")
+            lines.append(f"{name}_count{{{labels}}} {histogram.count}")
+
+        for metric, help, values, label in [
+            ("responses_total", "Responses by HTTP status.", self.statuses, "status"),
+            ("ret_codes_total", "API responses by retCode.", self.ret_codes, "ret_code"),
+            ("errors_total", "Requests failed without a response, by exception type.", self.errors, "error"),
+        ]:
+            name = header(metric, "counter", help)
+            for (endpoint, value), count in sorted(values.items(), key=lambda item: (item[0][0], str(item[0][1]))):
+                lines.append(f'{name}{{endpoint="{_escape(endpoint)}",{label}="{_escape(str(value))}"}} {count}')
+
+        for metric, help, values in [
+            ("retries_total", "Retried attempts.", self.retries),
+            ("sent_bytes_total", "Request body and query bytes.", self.bytes_sent),
+            ("received_bytes_total", "Response body bytes.", self.bytes_received),
+        ]:
+            name = header(metric, "counter", help)
+            for endpoint, count in sorted(values.items()):
+                lines.append(f'{name}{{endpoint="{_escape(endpoint)}"}} {count}')
+
+        gauges = self._gauges()
+        for metric in sorted({name for name, _ in gauges}):
+            name = header(metric, "gauge", _GAUGE_HELP.get(metric, metric))
+            for (gauge, labels), value in sorted(gauges.items()):
+                if gauge != metric:
+                    continue
+                label_text = ",".join(f'{key}="{_escape(str(val))}"' for key, val in labels)
+                lines.append(f"{name}{{{label_text}}} {value!r}" if label_text else f"{name} {value!r}")
+
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
@@ -0,0 +1,67 @@
+import mimetypes
+import os
+from typing import AsyncIterator, Callable
+
+import aiofiles
+
+_CHUNK_SIZE = 256 * 1024
+
+
+class MultipartFile:
+    """
+    multipart/form-data body with a single file, read from disk in chunks.
+
+    The body is never held in memory as a whole: feed() passes it chunk by chunk to a hash for
+    signing, and body() streams it to aiohttp. Both can be called again for a retry.
+
+    Args:
+        path (str): File to upload.
+        field_name (str, optional): Form field name. Default upload_file.
+        boundary (str, optional): Multipart boundary.
+        mime_type (str, optional): File content type. Guessed from the file name by default.
+        chunk_size (int, optional): Read size, bytes. Default 256 KiB.
+    """
+
+    def __init__(
+        self,
+        path,
+        field_name: str = "upload_file",
+        boundary: str = "boundary-for-file",
+        mime_type: str = None,
+        chunk_size: int = _CHUNK_SIZE
+    ):
+        self.path = path
+        self.chunk_size = chunk_size
+        self.boundary = boundary
+
+        filename = os.path.basename(str(path))
+        mime_type = mime_type or mimetypes.guess_type(filename)[0] or "application/octet-stream"
+
+        self.head = (
+            f"--{boundary}\r\n"
+            f"Content-Disposition: form-data; name=\"{field_name}\"; filename=\"{filename}\"\r\n"
+            f"Content-Type: {mime_type}\r\n\r\n"
+        ).encode()
+        self.tail = f"\r\n--{boundary}--\r\n".encode()
+        self.size = len(self.head) + os.path.getsize(path) + len(self.tail)
+
+    @property
+    def content_type(self) -> str:
+        return f"multipart/form-data; boundary={self.boundary}"
+
+    async def body(self) -> AsyncIterator[bytes]:
+        yield self.head
+        async with aiofiles.open(self.path, "rb") as f:
+            while True:
+                chunk = await f.read(self.chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+        yield self.tail
+
+    async def feed(self, update: Callable[[bytes], None]) -> None:
+        async for chunk in self.body():
+            update(chunk)
+
+    def __str__(self) -> str:
+        return f"<multipart file {self.path}, {self.size} bytes>"
@@ -0,0 +1,250 @@
+import asyncio
+import json
+import time
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from ._classes import Order, OrderDetail
+from ._exceptions import ret_code_error
+
+# Order statuses that never change again: cancelled, finished, cancelled by the system.
+FINAL_ORDER_STATUSES = frozenset({40, 50, 80})
+
+
+class OrderStore:
+    """
+    Local orders keyed by id, with the time the account's orders are synced up to.
+
+    save() and load() keep it in a JSON file, so a sync can continue where the previous process
+    stopped.
+    """
+
+    def __init__(self):
+        self._orders: Dict[str, Order] = {}
+        # Orders created before this time, ms, are in the store.
+        self.high_water_mark: Optional[int] = None
+
+    def upsert(self, order: Order) -> bool:
+        """
+        Add an order or update a stored one. Returns whether anything changed.
+
+        Only fields both versions have are compared, so details of an unchanged order are
+        stored without counting as a change, and a list row for an order stored with its
+        details updates the details in place.
+        """
+
+        key = str(order._data["id"])
+        old = self._orders.get(key)
+        if old is None:
+            self._orders[key] = order
+            return True
+
+        old_data, data = old._data, order._data
+        changed = any(field in old_data and old_data[field] != value for field, value in data.items())
+
+        if isinstance(old, OrderDetail) and not isinstance(order, OrderDetail):
+            if changed:
+                self._orders[key] = OrderDetail.from_dict({**old_data, **data})
+        elif changed or data.keys() - old_data.keys():
+            self._orders[key] = order
+        return changed
+
+    def get(self, order_id) -> Optional[Order]:
+        return self._orders.get(str(order_id))
+
+    def __getitem__(self, order_id) -> Order:
+        return self._orders[str(order_id)]
+
+    def __contains__(self, order_id) -> bool:
+        return str(order_id) in self._orders
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._orders)
+
+    def __len__(self) -> int:
+        return len(self._orders)
+
+    def values(self) -> List[Order]:
+        return list(self._orders.values())
+
+    def open_orders(self) -> List[Order]:
+        """
+        Orders whose status can still change.
+        """
+
+        return [order for order in self._orders.values() if order.status not in FINAL_ORDER_STATUSES]
+
+    def save(self, path) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "high_water_mark": self.high_water_mark,
+                    "orders": [order._data for order in self._orders.values()],
+                    "details": [key for key, order in self._orders.items() if isinstance(order, OrderDetail)],
+                },
+                f,
+                separators=(",", ":")
+            )
+
+    @classmethod
+    def load(cls, path) -> "OrderStore":
+        with open(path, encoding="utf-8") as f:
+            state = json.load(f)
+
+        store = cls()
+        store.high_water_mark = state.get("high_water_mark")
+        details = set(state.get("details") or ())
+        for data in state.get("orders") or ():
+            key = str(data["id"])
+            store._orders[key] = (OrderDetail if key in details else Order).from_dict(data)
+        return store
+
+
+class OrderSync:
+    """
+    Keeps an OrderStore up to date with the account's orders, fetching only what is new.
+
+    Each sync lists the orders created since the store's high-water mark, minus `overlap` to
+    catch orders that showed up late, up to now. The range is split into windows of `window`
+    seconds that overlap by `overlap` and are fetched concurrently; duplicates collapse in the
+    store. Open orders created before the range are refreshed one by one with get_order(), so
+    a long appeal does not widen every sync. The high-water mark moves only when every window
+    was fetched, so a failed sync is repeated in full by the next one.
+
+    Args:
+        client (P2P): Client to fetch orders with.
+        store (OrderStore, optional): Store to keep up to date. A new, empty one by default.
+        window (float, optional): Window length, seconds. Default 3600.
+        overlap (float, optional): Overlap between windows and with the previous sync, seconds. Default 120.
+        concurrency (int, optional): Windows and detail requests in flight. Default 4.
+        initial_lookback (float, optional): How far back the first sync of an empty store goes, seconds. Default 7 days.
+        page_size (int, optional): Orders per page. Default 30.
+        details (bool, optional): Fetch get_order() details of every new or changed order. Default False.
+        token_id (str, optional): Only orders of this token.
+        side (str, optional): Only "buy" or "sell" orders.
+    """
+
+    def __init__(
+        self,
+        client,
+        store: OrderStore = None,
+        window: float = 3600.0,
+        overlap: float = 120.0,
+        concurrency: int = 4,
+        initial_lookback: float = 7 * 86400.0,
+        page_size: int = 30,
+        details: bool = False,
+        token_id: str = None,
+        side: str = None
+    ):
+        self._client = client
+        self.store = store if store is not None else OrderStore()
+        self.window = window
+        self.overlap = overlap
+        self.initial_lookback = initial_lookback
+        self.page_size = page_size
+        self.details = details
+        self._filters = {"token_id": token_id, "side": side}
+        self._semaphore = asyncio.Semaphore(concurrency)
+
+        self.syncs = 0
+        self.last_sync: Optional[dict] = None
+
+    def windows(self, start: int, end: int) -> List[Tuple[int, int]]:
+        """
+        Overlapping (begin, end) windows covering [start, end], ms.
+        """
+
+        step = int(self.window * 10 ** 3)
+        overlap = int(self.overlap * 10 ** 3)
+        return [
+            (begin, min(end, begin + step + overlap))
+            for begin in range(start, end, step)
+        ] or [(start, end)]
+
+    async def _list_window(self, begin: int, end: int) -> List[Order]:
+        async with self._semaphore:
+            return [
+                order async for order in self._client.iter_orders(
+                    size=self.page_size,
+                    concurrency=1,
+                    begin_time=begin,
+                    end_time=end,
+                    **self._filters
+                )
+            ]
+
+    async def _detail(self, order_id: str) -> OrderDetail:
+        async with self._semaphore:
+            status, data = await self._client.get_order(order_id)
+
+        if not status:
+            raise ret_code_error(f"order {order_id}", data)
+        return data
+
+    async def sync(self, now: int = None) -> List[Order]:
+        """
+        Bring the store up to date.
+
+        Args:
+            now (int, optional): End of the range, ms. The current time by default.
+
+        Raises:
+            FailedRequestError: A page or an order detail was answered with a non-zero retCode.
+
+        Returns:
+            List[Order]: New orders and orders that changed, as now stored.
+        """
+
+        started = time.monotonic()
+        store = self.store
+        end = now if now is not None else int(time.time() * 10 ** 3)
+        if store.high_water_mark is not None:
+            start = store.high_water_mark - int(self.overlap * 10 ** 3)
+        else:
+            start = end - int(self.initial_lookback * 10 ** 3)
+
+        windows = self.windows(start, end)
+        stale = [
+            str(order._data["id"]) for order in store.open_orders()
+            if (order.create_date or 0) < start
+        ]
+
+        listed = await asyncio.gather(*(self._list_window(begin, window_end) for begin, window_end in windows))
+        refreshed = await asyncio.gather(*(self._detail(order_id) for order_id in stale))
+
+        changed: Dict[str, Order] = {}
+        for orders in listed:
+            for order in orders:
+                if store.upsert(order):
+                    changed[str(order._data["id"])] = order
+        for order in refreshed:
+            if store.upsert(order):
+                changed[str(order._data["id"])] = order
+
+        if self.details:
+            missing = [order_id for order_id, order in changed.items() if not isinstance(order, OrderDetail)]
+            for order in await asyncio.gather(*(self._detail(order_id) for order_id in missing)):
+                store.upsert(order)
+
+        store.high_water_mark = end
+        self.syncs += 1
+        self.last_sync = {
+            "start": start,
+            "end": end,
+            "windows": len(windows),
+            "listed": sum(len(orders) for orders in listed),
+            "refreshed": len(stale),
+            "changed": len(changed),
+            "duration": time.monotonic() - started,
+        }
+
+        return [store[order_id] for order_id in changed]
+
+    def stats(self) -> dict:
+        return {
+            "syncs": self.syncs,
+            "orders": len(self.store),
+            "open_orders": len(self.store.open_orders()),
+            "high_water_mark": self.store.high_water_mark,
+            "last_sync": self.last_sync,
+        }
@@ -1,4 +1,5 @@
 from ._p2p_method import P2PMethod
+from ._retry import IDEMPOTENT
 
 
 class P2PMethods:
@@ -7,17 +8,20 @@ class P2PMethods:
         "GET",
         [
             "accountType"
-        ]
+        ],
+        retry_policy=IDEMPOTENT
     )
     GET_ACCOUNT_INFORMATION = P2PMethod(
         "/v5/p2p/user/personal/info",
         "POST",
-        []
+        [],
+        retry_policy=IDEMPOTENT
     )
     GET_ADS_LIST = P2PMethod(
         "/v5/p2p/item/personal/list",
         "POST",
-        []
+        [],
+        retry_policy=IDEMPOTENT
     )
     GET_ONLINE_ADS = P2PMethod(
         "/v5/p2p/item/online",
@@ -26,6 +30,43 @@ class P2PMethods:
             "tokenId",
             "currencyId",
             "side"
+        ],
+        retry_policy=IDEMPOTENT
+    )
+    UPDATE_AD = P2PMethod(
+        "/v5/p2p/item/update",
+        "POST",
+        [
+            "id",
+            "priceType",
+            "premium",
+            "price",
+            "minAmount",
+            "maxAmount",
+            "remark",
+            "tradingPreferenceSet",
+            "paymentIds",
+            "actionType",
+            "quantity",
+            "paymentPeriod"
         ]
     )
-
+    GET_ORDERS = P2PMethod(
+        "/v5/p2p/order/simplifyList",
+        "POST",
+        [
+            "page",
+            "size"
+        ],
+        retry_policy=IDEMPOTENT,
+        # Integers here, unlike the "page" and "side" of the ads endpoints.
+        int_params=("page", "size", "status", "side")
+    )
+    GET_ORDER_DETAIL = P2PMethod(
+        "/v5/p2p/order/info",
+        "POST",
+        [
+            "orderId"
+        ],
+        retry_policy=IDEMPOTENT
+    )
@@ -1,24 +1,23 @@
 import asyncio
-import base64
-import hashlib
-import hmac
-import json
 import logging
-import os
 import time
+from concurrent.futures import Executor
 from datetime import datetime as dt
 from datetime import timezone
-from json import JSONDecodeError
 from typing import Optional
 
-import aiofiles
-import aiohttp
-from Crypto.Hash import SHA256
-from Crypto.PublicKey import RSA
-from Crypto.Signature import PKCS1_v1_5
-
+from ._clock import ServerClock
+from ._codec import JsonCodec, default_codec
 from ._exceptions import FailedRequestError
+from ._metrics import Metrics
+from ._multipart import MultipartFile
 from ._p2p_method import P2PMethod
+from ._rate_limiter import RateLimiter
+from ._request_plan import RequestPlan
+from ._retry import RetryBudget
+from ._scheduler import FairScheduler
+from ._signer import create_signer
+from ._transport import P2PTransport
 
 _SUBDOMAIN_TESTNET = "api-testnet"
 _SUBDOMAIN_MAINNET = "api"
@@ -26,6 +25,30 @@ _DOMAIN_MAIN = "bybit"
 _DOMAIN_ALT = "bytick"
 _TLD_MAIN = "com"
 
+# retCode for a timestamp outside recv_window.
+_RET_CODE_TIMESTAMP = 10002
+# How a successful response starts. Found near the start of the body, it lets raw-body requests
+# skip decoding.
+_RET_OK = b'"retCode":0,'
+
+logger = logging.getLogger(__name__)
+
+
+def _describe_payload(payload) -> str:
+    if isinstance(payload, bytes):
+        return payload.decode("utf-8", errors="replace")
+    return str(payload)
+
+
+def _payload_size(payload) -> int:
+    # Bytes on the wire: GET query strings are str, and non-ASCII characters take several bytes.
+    if isinstance(payload, MultipartFile):
+        return payload.size
+    if isinstance(payload, str):
+        return len(payload.encode("utf-8"))
+    return len(payload)
+
+
 class P2PManager:
     def __init__(
         self,
@@ -35,7 +58,23 @@ class P2PManager:
         recv_window: int = 5000,
         rsa: bool = False,
         alt_domain: bool = False,
-        tld: str = "com"
+        tld: str = "com",
+        transport: P2PTransport = None,
+        pool_limit: int = 100,
+        pool_limit_per_host: int = 0,
+        keepalive_timeout: float = 30.0,
+        dns_cache_ttl: Optional[int] = 60,
+        timeout: Optional[float] = None,
+        sign_executor: Optional[Executor] = None,
+        rate_limit: bool = True,
+        rate_limiter: RateLimiter = None,
+        retry_budget: RetryBudget = None,
+        codec: JsonCodec = None,
+        time_sync: bool = False,
+        clock: ServerClock = None,
+        metrics: Metrics = None,
+        base_url: str = None,
+        scheduler: FairScheduler = None
     ):
         self._testnet = testnet
         self._api_key = api_key
@@ -48,289 +87,307 @@ class P2PManager:
         self._domain = _DOMAIN_ALT if self._alt_domain else _DOMAIN_MAIN
         self._tld = tld
         self._url = f"https://{self._subdomain}.{self._domain}.{self._tld}"
+        # E.g. a proxy or a local fake server. Overrides testnet, alt_domain and tld.
+        if base_url is not None:
+            self._url = base_url.rstrip("/")
 
-        self._session = None
+        # The key is parsed once here, not on every request.
+        self._signer = create_signer(
+            api_key,
+            api_secret,
+            recv_window,
+            rsa=rsa,
+            executor=sign_executor
+        )
 
-    def _sign(
-        self,
-        use_rsa_authentication: bool,
-        param_str: str,
-        binary: bool = False
-    ):
-        def generate_hmac():
-            hash = hmac.new(
-                bytes(self._api_secret, "utf-8"),
-                param_str.encode("utf-8"),
-                hashlib.sha256
-            )
-            return hash.hexdigest()
-        
-        def generate_hmac_binary():
-            hash = hmac.new(
-                bytes(self._api_secret, "utf-8"),
-                param_str,
-                hashlib.sha256
-            )
-            return hash.hexdigest()
-        
-        def generate_rsa():
-            hash = SHA256.new(param_str.encode("utf-8"))
-            encoded_signature = base64.b64encode(
-                PKCS1_v1_5.new(RSA.importKey(self._api_secret)).sign(
-                    hash
-                )
-            )
-            return encoded_signature.decode()
-        
-        def generate_rsa_binary():
-            hash = SHA256.new(param_str)
-            encoded_signature = base64.b64encode(
-                PKCS1_v1_5.new(RSA.importKey(self._api_secret)).sign(
-                    hash
-                )
-            )
-            return encoded_signature.decode()
-        
-        if not use_rsa_authentication:
-            if binary:
-                return generate_hmac_binary()
-            return generate_hmac()
+        # A transport passed in from outside may be shared, so only the one created here is closed by close_session().
+        self._owns_transport = transport is None
+        self._transport = transport if transport is not None else P2PTransport(
+            limit=pool_limit,
+            limit_per_host=pool_limit_per_host,
+            keepalive_timeout=keepalive_timeout,
+            dns_cache_ttl=dns_cache_ttl,
+            timeout=timeout
+        )
+
+        if rate_limiter is not None:
+            self._rate_limiter = rate_limiter
         else:
-            if binary:
-                return generate_rsa_binary()
-            return generate_rsa()
-        
-    def _generate_sign(self, payload, timestamp):
-        sign_string = str(timestamp) + self._api_key + str(self._recv_window) + payload
-        return self._sign(self._rsa, sign_string)
-    
-    def _generate_sign_binary(self, payload, timestamp):
-        sign_string = f"{timestamp}{self._api_key}{self._recv_window}".encode() + payload
-        return self._sign(self._rsa, sign_string, True)
+            self._rate_limiter = RateLimiter() if rate_limit else None
+
+        self._retry_budget = retry_budget if retry_budget is not None else RetryBudget()
+        self._codec = codec if codec is not None else default_codec()
+        self._plans = {}
+        self._clock = clock if clock is not None else (ServerClock() if time_sync else None)
+
+        # Shared with other clients by P2PAccountPool, one queue per API key.
+        self._scheduler = scheduler
+
+        self._metrics = metrics
+        if metrics is not None:
+            metrics.add_collector(self._collect_gauges)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close_session()
+
+    def _plan(self, method: P2PMethod) -> RequestPlan:
+        plan = self._plans.get(method)
+        if plan is None:
+            plan = self._plans[method] = RequestPlan(method, self._url)
+        return plan
+
+    def pool_stats(self) -> dict:
+        return self._transport.pool_stats()
+
+    def _collect_gauges(self):
+        pool = self.pool_stats()
+        source = id(self._transport)
+        yield source, "pool_connections_limit", (), float(pool["limit"])
+        yield source, "pool_connections_acquired", (), float(pool["acquired"])
+        yield source, "pool_connections_idle", (), float(pool["idle"])
+
+        source = id(self._rate_limiter)
+        for group, stats in self.rate_limit_stats().items():
+            yield source, "rate_limit_tokens", (("group", group),), stats["tokens"]
+            yield source, "rate_limit_waiters", (("group", group),), float(stats["waiters"])
+
+    def metrics_text(self) -> str:
+        """
+        Metrics in the Prometheus text format. Requires metrics=Metrics().
+        """
+
+        if self._metrics is None:
+            raise ValueError("Metrics are disabled, pass metrics=Metrics()")
+        return self._metrics.render()
+
+    def clock_stats(self) -> dict:
+        if self._clock is None:
+            return {}
+        return self._clock.stats()
+
+    async def sync_time(self) -> bool:
+        """
+        Sample the server clock now. Requires time_sync=True or a clock.
+        """
+
+        if self._clock is None:
+            raise ValueError("Time sync is disabled, pass time_sync=True or a ServerClock")
+        return await self._clock.sync(self._transport, self._url, self._codec)
+
+    def rate_limit_stats(self) -> dict:
+        if self._rate_limiter is None:
+            return {}
+        return self._rate_limiter.stats()
     
-    def _cast_values(
+    async def close_session(self) -> None:
+        if not self._owns_transport:
+            return None
+
+        await self._transport.close()
+
+    async def _request(
         self,
-        params
+        method: P2PMethod,
+        params: dict = {},
+        raw_body: bool = False
     ):
-        str_params = [
-            "itemId",
-            "side",
-            "currency_id",
-            # get_ad_detail
-            "id",
-            # get_ad_detail
-            "id",
-            "priceType",
-            "premium",
-            "price",
-            "minAmount",
-            "maxAmount",
-            "remark",
-            "actionType",
-            "quantity",
-            "paymentPeriod",
-            # -> tradingPreferenceSet
-            "hasUnPostAd",
-            "isKyc",
-            "isEmail",
-            "isMobile",
-            "hasRegisterTime",
-            "registerTimeThreshold",
-            "orderFinishNumberDay30",
-            "completeRateDay30",
-            "nationalLimit",
-            "hasOrderFinishNumberDay30",
-            "hasCompleteRateDay30",
-            "hasNationalLimit",
-            # get_orders
-            "beginTime",
-            "endTime",
-            "tokenId",
-            "currencyId",
-            "sortType",
-            "page",
-            "coin",
-            "amount",
-            # get chat message
-            "startMessageId"
-
-            # switch active mode
-            "workStatus",
-            "memberId"
-        ]
-        int_params = [
-            "positionIdx",
-        ]
-
-        self._cast_dict_recursively(params, str_params, int_params)
-
-    def _cast_dict_recursively(self, dictionary, str_params, int_params):
-        for key, value in dictionary.items():
-            if value is None:
-                continue
-            if isinstance(value, dict):
-                self._cast_dict_recursively(value, str_params, int_params)
-            elif isinstance(value, list):
-                for i, item in enumerate(value):
-                    if isinstance(item, dict):
-                        self._cast_dict_recursively(item, str_params, int_params)
-                    else:
-                        if key in str_params and not isinstance(item, str):
-                            value[i] = str(item)
-                        elif key in int_params and not isinstance(item, int):
-                            value[i] = int(item)
-            elif isinstance(value, bool):
-                dictionary[key] = value
+        plan = self._plan(method)
+
+        missing_params = plan.missing(params)
+        if missing_params:
+            raise ValueError(f"Missing required parameters: {', '.join(missing_params)}")
+
+        contentType = "application/json"
+
+        if method.http_method == "FILE":
+            # Streamed from disk on every attempt, never loaded into memory as a whole.
+            payload = MultipartFile(params["upload_file"])
+            contentType = payload.content_type
+        elif method.http_method in ["GET", "POST"]:
+            payload = plan.encode(plan.prepare(params), self._codec)
+        else:
+            return False, f"Unsupported HTTP method: {method.http_method}"
+
+        policy = method.retry_policy
+        self._retry_budget.deposit()
+        attempt = 1
+
+        while True:
+            try:
+                status, data = await self._send(plan, payload, contentType, raw_body)
+            except Exception as ex:
+                if isinstance(ex, FailedRequestError):
+                    retry = ex.status_code in policy.statuses
+                else:
+                    if self._metrics is not None:
+                        self._metrics.observe_error(method.url, ex)
+                    retry = policy.should_retry_exception(ex)
+
+                if not retry or attempt >= policy.max_attempts or not self._retry_budget.withdraw():
+                    raise
+
+                logger.debug("Retrying %s after %r (attempt %s)", method.url, ex, attempt + 1)
             else:
-                if key in str_params and not isinstance(value, str):
-                    dictionary[key] = str(value)
-                elif key in int_params and not isinstance(value, int):
-                    dictionary[key] = int(value)
+                if not status and data[0] == _RET_CODE_TIMESTAMP and self._clock is not None:
+                    # The estimate is off: drop it, the next attempt syncs before signing.
+                    logger.debug("Timestamp rejected for %s, resyncing server time", method.url)
+                    self._clock.invalidate()
+
+                if status or data[0] not in policy.ret_codes:
+                    return status, data
+                if attempt >= policy.max_attempts or not self._retry_budget.withdraw():
+                    return status, data
+
+                logger.debug("Retrying %s after retCode %s (attempt %s)", method.url, data[0], attempt + 1)
 
-    def _generate_payload(
+            if self._metrics is not None:
+                self._metrics.observe_retry(method.url)
+
+            await asyncio.sleep(policy.backoff(attempt))
+            attempt += 1
+
+    async def _send(
         self,
-        http_method: str = "GET",
-        params: dict = None
+        plan: RequestPlan,
+        payload,
+        contentType: str,
+        raw_body: bool = False
     ):
-        http_method = http_method.upper()
-        if http_method == "GET":
-            payload = "&".join(
-                [
-                    str(k) + "=" + str(v)
-                    for k, v in sorted(params.items())
-                    if v is not None
-                ]
-            )
-            return payload
-        elif http_method == "POST":
-            self._cast_values(params)
-            return json.dumps(params)
-        
-    
-    async def _get_session(self):
-        if self._session is None or self._session.closed:
-            self._session = aiohttp.ClientSession()
-        return self._session
-    
-    async def close_session(self) -> None:
-        if self._session is None:
-            return None
+        method = plan.method
 
-        await self._session.close()
+        # Wait for a slot before the timestamp is taken, so queueing does not eat into recv_window.
+        if self._rate_limiter is not None:
+            await self._rate_limiter.acquire(method.rate_limit_group)
 
-    async def _request(
+        if self._scheduler is None:
+            return await self._send_signed(plan, payload, contentType, raw_body)
+
+        async with self._scheduler.slot(self._api_key):
+            return await self._send_signed(plan, payload, contentType, raw_body)
+
+    async def _send_signed(
         self,
-        method: P2PMethod,
-        params: dict = {}
+        plan: RequestPlan,
+        payload,
+        contentType: str,
+        raw_body: bool = False
     ):
-        try:
-            missing_params = [p for p in method.required_params if p not in params]
-            if missing_params:
-                await self.close_session()
-                raise ValueError(f"Missing required parameters: {', '.join(missing_params)}")
-            
-            for i in params.keys():
-                if isinstance(params[i], float) and params[i] == int(params[i]):
-                    params[i] = int(params[i])
+        method = plan.method
 
+        # Every attempt is signed again, with a fresh timestamp.
+        if self._clock is not None:
+            if self._clock.needs_sync():
+                await self._clock.sync(self._transport, self._url, self._codec)
+            timestamp = self._clock.now_ms()
+        else:
             timestamp = int(time.time() * 10 ** 3)
-            contentType = "application/json"
-
-            if method.http_method == "FILE":
-                filepath = params["upload_file"]
-                boundary = "boundary-for-file"
-                contentType = f"multipart/form-data; boundary={boundary}"
-                filename = os.path.basename(str(filepath))
-                mime_type = "image/png"
-                
-                async with aiofiles.open(filepath, 'rb') as f:
-                    binary_data = await f.read()
-
-                
-                payload = (
-                    f"--{boundary}\r\n"
-                    f"Content-Disposition: form-data; name=\"upload_file\"; filename=\"{filename}\"\r\n"
-                    f"Content-Type: {mime_type}\r\n\r\n"
-                ).encode() + binary_data + f"\r\n--{boundary}--\r\n".encode()
-                signature = self._generate_sign_binary(payload, timestamp)
-            else:
-                payload = self._generate_payload(
-                    method.http_method,
-                    params
-                )
-                signature = self._generate_sign(
-                    payload,
-                    timestamp
-                )
-
-            headers = {
-                'X-BAPI-API-KEY': self._api_key,
-                'X-BAPI-SIGN': signature,
-                'X-BAPI-SIGN-TYPE': '2',
-                'X-BAPI-TIMESTAMP': str(timestamp),
-                'X-BAPI-RECV-WINDOW': str(self._recv_window),
-                'Content-Type': contentType
-            }
-
-            endpoint = self._url + method.url
-
-            session = await self._get_session()
-
-            if method.http_method == "GET":
-                response = await session.get(
-                    endpoint + f"?{payload}" if payload != "" else "",
-                    headers=headers,
-                )
-            elif method.http_method in ["POST", "FILE"]:
-                response = await session.post(
-                    endpoint,
-                    headers=headers,
-                    data=payload
-                )
-            else:
-                return False, f"Unsupported HTTP method: {method.http_method}"
-            
-            if response.status != 200:
-                if response.status == 403:
-                    error_msg = "Access denied error. Possible causes: 1) your IP is located in the US or Mainland China, 2) IP banned due to ratelimit violation"
-                elif response.status == 401:
-                    error_msg = "Unauthorized. Possible causes: 1) incorrect API key and/or secret, 2) incorrect environment: Mainnet vs Testnet"
-                else:
-                    error_msg = f"HTTP status code is: {response.status}, expected: 200"
-
-                await self.close_session()
-                raise FailedRequestError(
-                    request=f"{endpoint}: {payload}",
-                    message=error_msg,
-                    status_code=response.status,
-                    time=dt.now(timezone.utc).strftime("%H:%M:%S"),
-                    resp_headers=headers,
-                )
-            
-            try:
-                response_data = await response.json()
-            except JSONDecodeError as ex:
-                await self.close_session()
-                raise FailedRequestError(
-                    request=f"{endpoint}: {payload}",
-                    message="Could not decode JSON.",
-                    status_code=response.status,
-                    time=dt.now(timezone.utc).strftime("%H:%M:%S"),
-                    resp_headers=headers,
-                )
-            
-            ret_code = "retCode"
-            ret_msg = "retMsg"
-
-            if ret_code not in response_data:
-                ret_code = "ret_code"
-            if ret_msg not in response_data:
-                ret_msg = "ret_msg"
-
-            if response_data[ret_code]:
-                return False, (response_data[ret_code], response_data[ret_msg])
 
+        if isinstance(payload, MultipartFile):
+            stream = self._signer.stream(timestamp)
+            await payload.feed(stream.update)
+            signature = await self._signer.afinish(stream)
+        else:
+            signature = await self._signer.asign(timestamp, payload)
+
+        headers = {
+            'X-BAPI-API-KEY': self._api_key,
+            'X-BAPI-SIGN': signature,
+            'X-BAPI-SIGN-TYPE': '2',
+            'X-BAPI-TIMESTAMP': str(timestamp),
+            'X-BAPI-RECV-WINDOW': str(self._recv_window),
+            'Content-Type': contentType
+        }
+
+        data = payload
+        if isinstance(payload, MultipartFile):
+            headers['Content-Length'] = str(payload.size)
+            data = payload.body()
+
+        endpoint = plan.endpoint
+
+        sent = time.monotonic()
+
+        if plan.http_method == "GET":
+            response = await self._transport.request(
+                "GET",
+                endpoint + f"?{payload}" if payload != "" else endpoint,
+                headers=headers
+            )
+        else:
+            response = await self._transport.request(
+                "POST",
+                endpoint,
+                headers=headers,
+                data=data
+            )
+
+        received = time.monotonic()
+
+        metrics = self._metrics
+        if metrics is not None:
+            metrics.observe_response(
+                method.url,
+                response.status,
+                received - sent,
+                _payload_size(payload),
+                len(response.body)
+            )
+
+        if self._rate_limiter is not None:
+            self._rate_limiter.update_from_headers(method.rate_limit_group, response.headers)
+        
+        if response.status != 200:
+            if response.status == 403:
+                error_msg = "Access denied error. Possible causes: 1) your IP is located in the US or Mainland China, 2) IP banned due to ratelimit violation"
+            elif response.status == 401:
+                error_msg = "Unauthorized. Possible causes: 1) incorrect API key and/or secret, 2) incorrect environment: Mainnet vs Testnet"
             else:
-                return True, response_data["result"]
-        except Exception:
-            raise Exception
+                error_msg = f"HTTP status code is: {response.status}, expected: 200"
+
+            raise FailedRequestError(
+                request=f"{endpoint}: {_describe_payload(payload)}",
+                message=error_msg,
+                status_code=response.status,
+                time=dt.now(timezone.utc).strftime("%H:%M:%S"),
+                resp_headers=response.headers,
+            )
+
+        if raw_body and _RET_OK in response.body[:32]:
+            # A successful response is handed over undecoded, errors are decoded below as usual.
+            if metrics is not None:
+                metrics.observe_ret_code(method.url, 0)
+            return True, response.body
+        
+        try:
+            response_data = self._codec.loads(response.body)
+        except self._codec.decode_errors:
+            raise FailedRequestError(
+                request=f"{endpoint}: {_describe_payload(payload)}",
+                message="Could not decode JSON.",
+                status_code=response.status,
+                time=dt.now(timezone.utc).strftime("%H:%M:%S"),
+                resp_headers=response.headers,
+            )
+        
+        if self._clock is not None:
+            self._clock.observe(sent, received, response_data)
+
+        ret_code = "retCode"
+        ret_msg = "retMsg"
+
+        if ret_code not in response_data:
+            ret_code = "ret_code"
+        if ret_msg not in response_data:
+            ret_msg = "ret_msg"
+
+        if metrics is not None:
+            metrics.observe_ret_code(method.url, response_data[ret_code])
+
+        if response_data[ret_code]:
+            return False, (response_data[ret_code], response_data[ret_msg])
+
+        else:
+            return True, response.body if raw_body else response_data["result"]
@@ -1,10 +1,22 @@
+from ._retry import NON_IDEMPOTENT
+
+
 class P2PMethod:
     def __init__(
         self,
         url,
         http_method,
-        required_params
+        required_params,
+        rate_limit_group=None,
+        retry_policy=None,
+        int_params=()
     ):
         self.url = url
         self.http_method = http_method
         self.required_params = required_params
+        # Requests of one group share a rate limit bucket. By default every endpoint is its own group.
+        self.rate_limit_group = rate_limit_group or url
+        # Unless a method is known to be idempotent, it is only retried when the request surely was not executed.
+        self.retry_policy = retry_policy or NON_IDEMPOTENT
+        # Fields this endpoint expects as integers, even where others expect them as strings.
+        self.int_params = frozenset(int_params)
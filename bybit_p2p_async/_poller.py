@@ -0,0 +1,319 @@
+import asyncio
+import functools
+import inspect
+import logging
+import random
+import time
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Union
+
+from ._ad_diff import AdDiff, AdSnapshotDiffer
+from ._exceptions import ret_code_error
+from ._rate_limiter import TokenBucket
+from ._scanner import MarketSpec
+
+logger = logging.getLogger(__name__)
+
+# Weight of the newest gap in the moving average behind the effective polling rate.
+_EWMA_ALPHA = 0.3
+
+
+class PolledMarket:
+    """
+    Polling state of one market.
+
+    Attributes:
+        spec (MarketSpec): The market.
+        priority (float): Higher priorities poll more often and win when the budget is short.
+        interval (float): Current interval before priority and jitter, seconds.
+        polls (int): Successful polls.
+        changes (int): Polls that found a change.
+        skipped (int): Polls missed because the budget or concurrency limit delayed this market.
+        errors (int): Failed polls.
+    """
+
+    __slots__ = (
+        "spec", "priority", "interval", "differ", "next_due", "inflight",
+        "polls", "changes", "skipped", "errors", "last_poll", "_gap"
+    )
+
+    def __init__(
+        self,
+        spec: MarketSpec,
+        priority: float,
+        interval: float
+    ):
+        self.spec = spec
+        self.priority = priority
+        self.interval = interval
+        self.differ = AdSnapshotDiffer()
+        self.next_due = 0.0
+        self.inflight = False
+
+        self.polls = 0
+        self.changes = 0
+        self.skipped = 0
+        self.errors = 0
+        self.last_poll: Optional[float] = None
+        self._gap: Optional[float] = None
+
+    @property
+    def effective_hz(self) -> float:
+        """
+        Polls per second actually achieved, smoothed. Decays while the market is not polled.
+        """
+
+        if not self._gap:
+            return 0.0
+        return 1.0 / max(self._gap, time.monotonic() - self.last_poll)
+
+    def _record_start(self, now: float) -> None:
+        if self.last_poll is not None:
+            gap = now - self.last_poll
+            self._gap = gap if self._gap is None else self._gap + _EWMA_ALPHA * (gap - self._gap)
+        self.last_poll = now
+
+
+class AdaptivePoller:
+    """
+    Polls markets with get_market_ads(), each at its own adaptive interval, within a global budget.
+
+    A market whose book changed since the last poll has its interval multiplied by `speed_up`
+    (polled sooner), a quiet one by `slow_down`, within [min_interval, max_interval]. The interval
+    is then divided by the market priority and randomized by +-`jitter` so markets do not poll in
+    lockstep.
+
+    All polls draw from one token bucket of `budget` requests per second, without bursts. When more
+    markets are due than the budget allows, the one with the largest priority-weighted lateness
+    goes first, and whole intervals a market waits past its due time are counted as skipped polls.
+
+    Args:
+        client (P2P): Client used for get_market_ads() calls.
+        specs (Iterable[MarketSpec] | Dict[MarketSpec, float]): Markets, optionally mapped to priorities.
+        budget (float, optional): Polls per second across all markets. Default 5.
+        min_interval (float, optional): Shortest interval, seconds. Default 1.
+        max_interval (float, optional): Longest interval, seconds. Default 60.
+        speed_up (float, optional): Interval factor after a change. Default 0.5.
+        slow_down (float, optional): Interval factor after no change. Default 1.5.
+        jitter (float, optional): Relative random spread of intervals. Default 0.1.
+        concurrency (int, optional): Polls in flight at the same time. Default 8.
+        on_change (Callable[[MarketSpec, AdDiff], Awaitable | None], optional): Called with every non-empty diff.
+        on_error (Callable[[MarketSpec, Exception], Awaitable | None], optional): Called with every failed poll.
+            Errors are logged if not given.
+    """
+
+    def __init__(
+        self,
+        client,
+        specs: Union[Iterable[MarketSpec], Dict[MarketSpec, float]],
+        budget: float = 5.0,
+        min_interval: float = 1.0,
+        max_interval: float = 60.0,
+        speed_up: float = 0.5,
+        slow_down: float = 1.5,
+        jitter: float = 0.1,
+        concurrency: int = 8,
+        on_change: Callable[[MarketSpec, AdDiff], Optional[Awaitable]] = None,
+        on_error: Callable[[MarketSpec, Exception], Optional[Awaitable]] = None
+    ):
+        self._client = client
+        self._budget = TokenBucket(budget, 1.0)
+        self._min_interval = min_interval
+        self._max_interval = max_interval
+        self._speed_up = speed_up
+        self._slow_down = slow_down
+        self._jitter = jitter
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._on_change = on_change
+        self._on_error = on_error
+
+        self._wakeup = asyncio.Event()
+        self._tasks: set = set()
+        self._running = False
+        self._started: Optional[float] = None
+        self.throttled = 0
+
+        self.markets: Dict[tuple, PolledMarket] = {}
+        priorities = specs if isinstance(specs, dict) else dict.fromkeys(specs, 1.0)
+        for spec, priority in priorities.items():
+            self.add(spec, priority)
+
+    def add(self, spec: MarketSpec, priority: float = 1.0) -> PolledMarket:
+        """
+        Start polling a market, immediately if the poller is running.
+        """
+
+        if priority <= 0:
+            raise ValueError(f"Priority of {spec!r} must be positive, got {priority}")
+
+        market = self.markets.get(spec.key)
+        if market is None:
+            market = self.markets[spec.key] = PolledMarket(spec, priority, self._min_interval)
+        market.priority = priority
+        self._wakeup.set()
+        return market
+
+    def remove(self, spec: MarketSpec) -> None:
+        self.markets.pop(spec.key, None)
+
+    def _effective_interval(self, market: PolledMarket) -> float:
+        return max(self._min_interval, market.interval / market.priority)
+
+    def _next_interval(self, market: PolledMarket) -> float:
+        return self._effective_interval(market) * (1.0 + random.uniform(-self._jitter, self._jitter))
+
+    def _pick(self, now: float) -> Optional[PolledMarket]:
+        # Lateness weighted by priority: a busy high-priority market goes first, but a market that
+        # keeps losing grows later and later until it wins, so nothing starves.
+        best = None
+        best_score = -1.0
+        for market in self.markets.values():
+            if market.inflight or market.next_due > now:
+                continue
+            score = (now - market.next_due) * market.priority
+            if score > best_score:
+                best, best_score = market, score
+        return best
+
+    def _sleep_time(self, now: float) -> float:
+        due = [market.next_due for market in self.markets.values() if not market.inflight]
+        return max(0.0, min(due) - now) if due else self._max_interval
+
+    async def run(self, duration: float = None) -> None:
+        """
+        Poll until stop() is called, or for `duration` seconds.
+        """
+
+        self._running = True
+        self._started = time.monotonic()
+        deadline = self._started + duration if duration is not None else None
+
+        try:
+            while self._running:
+                now = time.monotonic()
+                if deadline is not None and now >= deadline:
+                    break
+
+                market = self._pick(now)
+                if market is None:
+                    timeout = self._sleep_time(now)
+                    if deadline is not None:
+                        timeout = min(timeout, deadline - now)
+                    await self._wait(timeout)
+                    continue
+
+                if not self._budget.try_acquire():
+                    self.throttled += 1
+                    await self._wait((1.0 - self._budget.tokens) / self._budget.rate)
+                    continue
+
+                await self._semaphore.acquire()
+                self._start_poll(market)
+        finally:
+            self._running = False
+            for task in self._tasks:
+                task.cancel()
+            if self._tasks:
+                await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def stop(self) -> None:
+        self._running = False
+        self._wakeup.set()
+
+    async def _wait(self, timeout: float) -> None:
+        self._wakeup.clear()
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), max(timeout, 0.0))
+        except asyncio.TimeoutError:
+            pass
+
+    def _start_poll(self, market: PolledMarket) -> None:
+        now = time.monotonic()
+        # Whole intervals this market waited past its due time are polls it missed.
+        if market.last_poll is not None:
+            late = now - market.next_due
+            market.skipped += int(late // self._effective_interval(market)) if late > 0 else 0
+        market._record_start(now)
+        market.inflight = True
+
+        task = asyncio.ensure_future(self._poll(market))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        # Cleanup runs as a done callback rather than in _poll: a task cancelled before its first
+        # step never enters _poll, and would keep its concurrency slot and inflight flag.
+        task.add_done_callback(functools.partial(self._finish_poll, market))
+
+    def _finish_poll(self, market: PolledMarket, task: asyncio.Future) -> None:
+        market.next_due = time.monotonic() + self._next_interval(market)
+        market.inflight = False
+        self._semaphore.release()
+        self._wakeup.set()
+
+    async def _poll(self, market: PolledMarket) -> None:
+        try:
+            diff = await self._fetch(market)
+        except asyncio.CancelledError:
+            raise
+        except Exception as ex:
+            market.errors += 1
+            market.interval = min(self._max_interval, market.interval * self._slow_down)
+            await self._notify(self._on_error, market.spec, ex)
+        else:
+            market.polls += 1
+            if diff:
+                market.changes += 1
+                market.interval = max(self._min_interval, market.interval * self._speed_up)
+                await self._notify(self._on_change, market.spec, diff)
+            else:
+                market.interval = min(self._max_interval, market.interval * self._slow_down)
+
+    async def _fetch(self, market: PolledMarket) -> AdDiff:
+        status, data = await self._client.get_market_ads(**market.spec.kwargs())
+
+        if not status:
+            raise ret_code_error(repr(market.spec), data)
+
+        return market.differ.diff(data[1])
+
+    async def _notify(self, callback, spec: MarketSpec, value) -> None:
+        if callback is None:
+            if isinstance(value, Exception):
+                logger.warning("Polling %r failed: %s", spec, value)
+            return None
+
+        try:
+            result = callback(spec, value)
+            if inspect.isawaitable(result):
+                await result
+        except Exception:
+            logger.exception("Poller callback failed for %r", spec)
+
+    def stats(self) -> dict:
+        """
+        Per-market intervals, effective rates and counters, and the budget use.
+        """
+
+        elapsed = time.monotonic() - self._started if self._started is not None else 0.0
+        polls = sum(market.polls + market.errors for market in self.markets.values())
+        used = polls / elapsed if elapsed else 0.0
+
+        markets: List[dict] = [
+            {
+                "market": market.spec,
+                "priority": market.priority,
+                "interval": market.interval,
+                "effective_hz": market.effective_hz,
+                "polls": market.polls,
+                "changes": market.changes,
+                "skipped": market.skipped,
+                "errors": market.errors,
+            }
+            for market in self.markets.values()
+        ]
+
+        return {
+            "budget": self._budget.rate,
+            "budget_used_hz": used,
+            "budget_utilization": used / self._budget.rate if self._budget.rate else 0.0,
+            "throttled": self.throttled,
+            "markets": markets,
+        }
@@ -0,0 +1,165 @@
+import asyncio
+import time
+from typing import Dict, Optional
+
+_HEADER_LIMIT = "X-Bapi-Limit"
+_HEADER_LIMIT_STATUS = "X-Bapi-Limit-Status"
+_HEADER_LIMIT_RESET = "X-Bapi-Limit-Reset-Timestamp"
+
+
+class TokenBucket:
+    """
+    Token bucket refilled at `rate` tokens per second, holding at most `capacity` tokens.
+
+    Waiters are served in FIFO order. The bucket can also be blocked until a given moment,
+    which is how a server-reported reset time is applied.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: Optional[float] = None
+    ):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else rate
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._waiters = 0
+        self._lock = asyncio.Lock()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    @property
+    def tokens(self) -> float:
+        self._refill(time.monotonic())
+        return self._tokens
+
+    @property
+    def waiters(self) -> int:
+        return self._waiters
+
+    def try_acquire(self, tokens: float = 1.0) -> bool:
+        now = time.monotonic()
+        if now < self._blocked_until or self._waiters:
+            return False
+
+        self._refill(now)
+        if self._tokens < tokens:
+            return False
+
+        self._tokens -= tokens
+        return True
+
+    async def acquire(self, tokens: float = 1.0) -> None:
+        self._waiters += 1
+        try:
+            async with self._lock:
+                while True:
+                    now = time.monotonic()
+                    self._refill(now)
+                    if now >= self._blocked_until and self._tokens >= tokens:
+                        self._tokens -= tokens
+                        return None
+
+                    await asyncio.sleep(max(self._blocked_until - now, (tokens - self._tokens) / self.rate))
+        finally:
+            self._waiters -= 1
+
+    def block_until(self, moment: float) -> None:
+        """
+        Refuse tokens until `moment` (time.monotonic() clock).
+        """
+
+        # The refill clock stays where it is: tokens build up again during the block, and
+        # acquire() waits for whichever comes later, the block end or the next token.
+        self._refill(time.monotonic())
+        self._blocked_until = max(self._blocked_until, moment)
+        self._tokens = 0.0
+
+    def cap_tokens(self, tokens: float) -> None:
+        self._refill(time.monotonic())
+        self._tokens = min(self._tokens, tokens)
+
+    def set_limit(self, rate: float) -> None:
+        self._refill(time.monotonic())
+        self.rate = rate
+        self.capacity = rate
+        self._tokens = min(self._tokens, self.capacity)
+
+
+class RateLimiter:
+    """
+    Client-side rate limiter with one token bucket per endpoint group.
+
+    Bybit limits every endpoint separately and reports the current state in the X-Bapi-Limit,
+    X-Bapi-Limit-Status and X-Bapi-Limit-Reset-Timestamp response headers. Buckets start at
+    `default_rate` (or the rate from `group_rates`) and then follow those headers, so callers
+    wait for a slot instead of getting the IP banned.
+
+    Args:
+        default_rate (float, optional): Requests per second for a group with no known limit. Default 10.
+        group_rates (Dict[str, float], optional): Initial requests per second by group.
+    """
+
+    def __init__(
+        self,
+        default_rate: float = 10.0,
+        group_rates: Dict[str, float] = None
+    ):
+        self._default_rate = default_rate
+        self._group_rates = dict(group_rates or {})
+        self._buckets: Dict[str, TokenBucket] = {}
+
+    def bucket(self, group: str) -> TokenBucket:
+        bucket = self._buckets.get(group)
+        if bucket is None:
+            bucket = self._buckets[group] = TokenBucket(self._group_rates.get(group, self._default_rate))
+        return bucket
+
+    async def acquire(self, group: str) -> None:
+        await self.bucket(group).acquire()
+
+    def update_from_headers(self, group: str, headers) -> None:
+        if headers is None:
+            return None
+
+        limit = headers.get(_HEADER_LIMIT)
+        remaining = headers.get(_HEADER_LIMIT_STATUS)
+        if limit is None or remaining is None:
+            return None
+
+        try:
+            limit = int(limit)
+            remaining = int(remaining)
+        except ValueError:
+            return None
+
+        bucket = self.bucket(group)
+        if limit > 0 and limit != bucket.rate:
+            bucket.set_limit(float(limit))
+
+        if remaining <= 0:
+            reset = headers.get(_HEADER_LIMIT_RESET)
+            wait = 1.0
+            if reset is not None:
+                try:
+                    wait = max(0.0, int(reset) / 1000 - time.time())
+                except ValueError:
+                    pass
+            bucket.block_until(time.monotonic() + wait)
+        else:
+            # The server may have seen requests this bucket did not count, e.g. from another process.
+            bucket.cap_tokens(float(remaining))
+
+    def stats(self) -> Dict[str, dict]:
+        return {
+            group: {
+                "rate": bucket.rate,
+                "tokens": bucket.tokens,
+                "waiters": bucket.waiters,
+            }
+            for group, bucket in self._buckets.items()
+        }
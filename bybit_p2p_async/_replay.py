@@ -0,0 +1,288 @@
+import inspect
+import time
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+from ._ad_book import SIDE_BUY, SIDE_SELL, AdBook
+from ._ad_history import AdHistoryReader, HistorySnapshot, market_for_request
+from ._classes import MarketAd
+
+
+class SimulatedClock:
+    """
+    Clock for replays: it only moves when told to, and never backwards. Seconds, like time.time().
+    """
+
+    def __init__(
+        self,
+        start: float = 0.0
+    ):
+        self._now = start
+
+    def time(self) -> float:
+        return self._now
+
+    def time_ms(self) -> int:
+        return int(self._now * 10 ** 3)
+
+    def advance(self, seconds: float) -> None:
+        self._now += seconds
+
+    def set(self, now: float) -> None:
+        if now > self._now:
+            self._now = now
+
+
+class _Cached:
+    __slots__ = ("timestamp", "snapshot", "items", "ads", "book")
+
+    def __init__(self, snapshot: HistorySnapshot):
+        self.timestamp = snapshot.timestamp
+        self.snapshot = snapshot
+        self.items: Optional[List[dict]] = None
+        self.ads: Optional[List[MarketAd]] = None
+        self.book: Optional[AdBook] = None
+
+
+class ReplayClient:
+    """
+    Answers get_market_ads() and get_ad_book() from an ad history file, as the market was at the
+    simulated time. Strategy code written against P2P runs against it unchanged.
+
+    Every call reads the market as it was half the latency after the call and moves the clock
+    on by the whole latency, as a real round trip would. Ads are rebuilt once per recorded
+    snapshot, so polling faster than the recording costs almost nothing.
+
+    Args:
+        history (AdHistoryReader | str): Reader or path of a file written by AdHistoryWriter.
+        clock (SimulatedClock, optional): Simulated time. A new clock at the first recorded snapshot by default.
+        latency (float, optional): Simulated round trip of every call, seconds. Default 0.
+    """
+
+    def __init__(
+        self,
+        history: Union[AdHistoryReader, str],
+        clock: SimulatedClock = None,
+        latency: float = 0.0
+    ):
+        self._owns_history = not isinstance(history, AdHistoryReader)
+        self.history = AdHistoryReader(history) if self._owns_history else history
+        self.clock = clock if clock is not None else SimulatedClock((self.history.start or 0) / 10 ** 3)
+        self.latency = latency
+
+        self._cache: Dict[str, _Cached] = {}
+
+        self.requests = 0
+        self.snapshots_built = 0
+
+    def _snapshot(self, token_id: str, currency_id: str, side: str) -> Optional[_Cached]:
+        self.requests += 1
+        seen_at = self.clock.time() + self.latency / 2
+        self.clock.advance(self.latency)
+
+        market = market_for_request(token_id, currency_id, side)
+        cached = self._cache.get(market)
+        snapshot = self.history.snapshot_at(int(seen_at * 10 ** 3), market)
+        if snapshot is None:
+            return None
+        if cached is None or cached.timestamp != snapshot.timestamp:
+            cached = self._cache[market] = _Cached(snapshot)
+            self.snapshots_built += 1
+        return cached
+
+    async def get_market_ads(
+        self,
+        amount: Union[int, str] = None,
+        currency_id: str = "USD",
+        page: Union[int, str] = 1,
+        payment: List[str] = [],
+        side: str = "buy",
+        size: Union[int, str] = 10,
+        token_id: str = "USDT",
+        raw: bool = False,
+        fields: Iterable[str] = None,
+        **filters
+    ) -> Tuple[bool, Tuple[int, list]]:
+        """
+        Same arguments and result as P2P.get_market_ads(). Filters other than amount and payment
+        were applied when recording and are ignored here.
+        """
+
+        cached = self._snapshot(token_id, currency_id, side)
+        if cached is None:
+            return True, (0, [])
+
+        if cached.items is None:
+            cached.items = cached.snapshot.items()
+        items = cached.items
+
+        filtered = bool(payment or amount)
+        if filtered:
+            wanted = set(payment)
+            amount = float(amount) if amount else None
+            items = [
+                item for item in items
+                if (not wanted or wanted.intersection(item["payments"]))
+                and (amount is None or float(item["minAmount"]) <= amount <= float(item["maxAmount"]))
+            ]
+
+        start = (int(page) - 1) * int(size)
+        stop = start + int(size)
+
+        if raw or fields is not None:
+            page_items = items[start:stop]
+            if fields is not None:
+                page_items = [{key: item[key] for key in fields if key in item} for item in page_items]
+            if raw:
+                return True, (len(items), page_items)
+            return True, (len(items), [MarketAd.from_dict(item) for item in page_items])
+
+        if filtered:
+            return True, (len(items), [MarketAd.from_dict(item) for item in items[start:stop]])
+
+        # Unfiltered pages of the same snapshot share their MarketAd objects.
+        if cached.ads is None:
+            cached.ads = [MarketAd.from_dict(item) for item in items]
+        return True, (len(items), cached.ads[start:stop])
+
+    async def get_ad_book(
+        self,
+        currency_id: str = "USD",
+        side: str = "buy",
+        token_id: str = "USDT",
+        amount: Union[int, str] = None,
+        payment: List[str] = [],
+        **filters
+    ) -> Tuple[bool, Tuple[int, AdBook]]:
+        """
+        Same arguments and result as P2P.get_ad_book(), with the whole recorded snapshot in the book.
+        """
+
+        cached = self._snapshot(token_id, currency_id, side)
+        if cached is None:
+            return True, (0, AdBook(side=SIDE_SELL if side.lower() == "buy" else SIDE_BUY))
+
+        if cached.book is None:
+            cached.book = cached.snapshot.to_book()
+        book = cached.book
+
+        if payment or amount:
+            book = book.filter(payments=payment or None, amount=float(amount) if amount else None)
+        return True, (len(book), book)
+
+    def close(self) -> None:
+        self._cache.clear()
+        if self._owns_history:
+            self.history.close()
+
+
+class ReplayEngine:
+    """
+    Runs a strategy over recorded market history as fast as it can, on a simulated clock.
+
+    The strategy is called as `strategy(client, now)` with a ReplayClient and the simulated
+    Unix time, and may be a coroutine function. With `interval` it is called every `interval`
+    simulated seconds, like a polling loop; without, once per recorded snapshot time. Calls the
+    strategy makes advance the clock by the client latency. Interval ticks that pass while the
+    strategy is busy are skipped and snapshot ticks come late, as they would live. Nothing
+    sleeps, and strategy errors stop the run.
+
+    Args:
+        history (AdHistoryReader | str): Reader or path of a file written by AdHistoryWriter.
+        strategy (Callable[[ReplayClient, float], Awaitable | None]): Called on every tick.
+        interval (float, optional): Simulated seconds between ticks. Every recorded snapshot by default.
+        latency (float, optional): Simulated round trip of every client call, seconds. Default 0.
+        start (int, optional): First timestamp, ms. The start of the history by default.
+        end (int, optional): Timestamp to stop before, ms. The end of the history by default.
+        markets (Iterable[str], optional): Markets whose snapshots are ticks when `interval` is not set,
+            e.g. ["USDT/RUB/buy"]. All by default.
+    """
+
+    def __init__(
+        self,
+        history: Union[AdHistoryReader, str],
+        strategy: Callable[[ReplayClient, float], Optional[Awaitable]],
+        interval: float = None,
+        latency: float = 0.0,
+        start: int = None,
+        end: int = None,
+        markets: Iterable[str] = None
+    ):
+        self.client = ReplayClient(history, latency=latency)
+        self.history = self.client.history
+        self.clock = self.client.clock
+        self._strategy = strategy
+        self._interval = interval
+        self._start = start if start is not None else (self.history.start or 0)
+        self._end = end if end is not None else (self.history.end or 0) + 1
+        self._markets = list(markets) if markets is not None else None
+
+        self.ticks = 0
+        self._wall = 0.0
+
+    def _tick_times(self):
+        if self._interval is not None:
+            now = self._start / 10 ** 3
+            end = self._end / 10 ** 3
+            while now < end:
+                yield now
+                now += self._interval
+            return
+
+        markets = self._markets if self._markets is not None else [None]
+        if len(markets) == 1:
+            timestamps = (snapshot.timestamp for snapshot in self.history.snapshots(self._start, self._end, markets[0]))
+        else:
+            timestamps = sorted({
+                snapshot.timestamp
+                for market in markets
+                for snapshot in self.history.snapshots(self._start, self._end, market)
+            })
+
+        last = None
+        for timestamp in timestamps:
+            if timestamp != last:
+                last = timestamp
+                yield timestamp / 10 ** 3
+
+    async def run(self) -> dict:
+        """
+        Replay the whole range. Returns stats().
+        """
+
+        started = time.perf_counter()
+        strategy, clock = self._strategy, self.clock
+
+        try:
+            for now in self._tick_times():
+                if self._interval is not None and now < clock.time():
+                    # The strategy was still busy at this tick: skip it, as a live loop would.
+                    continue
+                clock.set(now)
+                self.ticks += 1
+
+                result = strategy(self.client, clock.time())
+                if inspect.isawaitable(result):
+                    await result
+        finally:
+            self._wall += time.perf_counter() - started
+
+        return self.stats()
+
+    def stats(self) -> dict:
+        """
+        Ticks, books served, simulated and wall time, books per second and speed-up over real time.
+        """
+
+        simulated = max(0.0, self.clock.time() - self._start / 10 ** 3)
+        return {
+            "ticks": self.ticks,
+            "books": self.client.requests,
+            "snapshots_built": self.client.snapshots_built,
+            "simulated_seconds": simulated,
+            "wall_seconds": self._wall,
+            "books_per_second": self.client.requests / self._wall if self._wall else 0.0,
+            "speedup": simulated / self._wall if self._wall else 0.0,
+        }
+
+    def close(self) -> None:
+        self.client.close()
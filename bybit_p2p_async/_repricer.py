@@ -0,0 +1,351 @@
+import asyncio
+import inspect
+import logging
+import time
+from collections import deque
+from typing import Awaitable, Callable, Deque, Dict, Iterable, List, Optional, Tuple
+
+from ._ad_book import SIDE_BUY, AdBook
+from ._classes import MarketAd
+from ._exceptions import ret_code_error
+from ._fixed_point import format_fixed, to_fixed
+
+logger = logging.getLogger(__name__)
+
+
+class RepriceRule:
+    """
+    How one of the account's ads follows the market.
+
+    A sell ad is priced one tick under the best competing sell ad, a buy ad one tick over the
+    best competing buy ad, always within [min_price, max_price]. With no competitors left the
+    ad goes to the limit that suits it: max_price for sell ads, min_price for buy ads.
+
+    Args:
+        ad_id (int | str): Ad id.
+        token_id (str): Token of the ad, e.g. USDT.
+        currency_id (str): Currency of the ad, e.g. RUB.
+        side (str): Side of the ad as in get_ads_list(): "buy" or "sell".
+        min_price (float | str): Lowest price the ad may get.
+        max_price (float | str): Highest price the ad may get.
+        tick (float | str, optional): Step over the best competitor. One unit of the currency scale by default.
+        payments (Iterable[str], optional): Only compete with ads accepting any of these payment methods.
+        amount (float, optional): Only compete with ads that accept this fiat amount.
+        min_finish_rate (float, optional): Only compete with ads with at least this recent execution rate.
+        size (int, optional): Competing ads fetched per poll, best price first. Default 20.
+    """
+
+    def __init__(
+        self,
+        ad_id: int | str,
+        token_id: str,
+        currency_id: str,
+        side: str,
+        min_price: float | str,
+        max_price: float | str,
+        tick: float | str = None,
+        payments: Iterable[str] = None,
+        amount: float = None,
+        min_finish_rate: float = None,
+        size: int = 20
+    ):
+        self.ad_id = str(ad_id)
+        self.token_id = token_id
+        self.currency_id = currency_id
+        self.side = side.lower()
+        self.min_price = min_price
+        self.max_price = max_price
+        self.tick = tick
+        self.payments = list(payments) if payments is not None else None
+        self.amount = amount
+        self.min_finish_rate = min_finish_rate
+        self.size = size
+
+    @property
+    def market(self) -> Tuple[str, str, str]:
+        return (self.token_id, self.currency_id, self.side)
+
+    def __repr__(self) -> str:
+        return f"RepriceRule({self.ad_id}, {self.token_id}/{self.currency_id}/{self.side})"
+
+
+class _ManagedAd:
+    __slots__ = ("rule", "ad", "price", "updates", "failures", "last_update")
+
+    def __init__(self, rule: RepriceRule):
+        self.rule = rule
+        self.ad: Optional[MarketAd] = None
+        # Current price in units of the book's price scale.
+        self.price: Optional[int] = None
+        self.updates = 0
+        self.failures = 0
+        self.last_update: Optional[float] = None
+
+
+def _percentile(values, q: float) -> Optional[float]:
+    if not values:
+        return None
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+class AutoRepricer:
+    """
+    Keeps the account's ads priced against the market.
+
+    Every `interval` seconds the market of each rule is fetched once with get_ad_book(), sorted
+    by price, and every ad whose target price differs from its current one is updated, all
+    markets and updates concurrently. Prices are computed in fixed point, so ticks and limits
+    are exact. The account's own ads are read with get_ads_list() at start and every
+    `ads_refresh` seconds, and never count as competitors.
+
+    Reaction latency is measured from the start of the poll that saw the market change to the
+    end of the ad update; a change is picked up within one interval plus that latency. Cycles
+    that take longer than the interval are counted as overruns.
+
+    Args:
+        client (P2P): Client to poll and update with.
+        rules (Iterable[RepriceRule]): One rule per managed ad.
+        interval (float, optional): Seconds between polls. Default 2.
+        ads_refresh (float, optional): Seconds between reads of the account's own ads. Default 60.
+        dry_run (bool, optional): Compute and report new prices without updating ads. Default False.
+        on_update (Callable[[RepriceRule, str, str], Awaitable | None], optional): Called with the rule,
+            the old and the new price after every update.
+        on_error (Callable[[RepriceRule, Exception], Awaitable | None], optional): Called with every failed
+            poll or update. Errors are logged if not given.
+    """
+
+    def __init__(
+        self,
+        client,
+        rules: Iterable[RepriceRule],
+        interval: float = 2.0,
+        ads_refresh: float = 60.0,
+        dry_run: bool = False,
+        on_update: Callable[[RepriceRule, str, str], Optional[Awaitable]] = None,
+        on_error: Callable[[RepriceRule, Exception], Optional[Awaitable]] = None
+    ):
+        self._client = client
+        self.interval = interval
+        self.ads_refresh = ads_refresh
+        self.dry_run = dry_run
+        self._on_update = on_update
+        self._on_error = on_error
+
+        self.ads: Dict[str, _ManagedAd] = {}
+        for rule in rules:
+            self.ads[rule.ad_id] = _ManagedAd(rule)
+
+        self._own_user_ids: set = set()
+        self._ads_read_at: Optional[float] = None
+        self._running = False
+
+        self.cycles = 0
+        self.overruns = 0
+        self.reaction_latencies: Deque[float] = deque(maxlen=1000)
+        self.cycle_durations: Deque[float] = deque(maxlen=1000)
+
+    def _markets(self) -> Dict[Tuple[str, str, str], List[_ManagedAd]]:
+        markets: Dict[Tuple[str, str, str], List[_ManagedAd]] = {}
+        for managed in self.ads.values():
+            markets.setdefault(managed.rule.market, []).append(managed)
+        return markets
+
+    async def refresh_ads(self) -> None:
+        """
+        Read the managed ads from get_ads_list(), one listing per market.
+        """
+
+        async def read(market):
+            token_id, currency_id, side = market
+            return [
+                ad async for ad in self._client.iter_ads_list(
+                    available=True, side=side, token_id=token_id, currency_id=currency_id, size=50
+                )
+            ]
+
+        markets = self._markets()
+        results = await asyncio.gather(*(read(market) for market in markets), return_exceptions=True)
+
+        for (market, managed_ads), result in zip(markets.items(), results):
+            if isinstance(result, Exception):
+                for managed in managed_ads:
+                    await self._notify_error(managed.rule, result)
+                continue
+
+            by_id = {str(ad.id): ad for ad in result}
+            for managed in managed_ads:
+                ad = by_id.get(managed.rule.ad_id)
+                managed.ad = ad
+                if ad is None:
+                    logger.warning("Ad %s is not among the account's available ads, not repricing it", managed.rule.ad_id)
+                    managed.price = None
+                    continue
+                managed.price = ad.price_fixed
+                if ad.user_id:
+                    self._own_user_ids.add(int(ad.user_id))
+
+        self._ads_read_at = time.monotonic()
+
+    def target_price(self, managed: _ManagedAd, book: AdBook) -> int:
+        """
+        Price the rule asks for against `book`, in units of the book's price scale.
+        """
+
+        rule, scale = managed.rule, book.price_scale
+        low, high = to_fixed(rule.min_price, scale), to_fixed(rule.max_price, scale)
+        tick = to_fixed(rule.tick, scale) if rule.tick is not None else 1
+
+        index = book.best_match(
+            payments=rule.payments,
+            amount=rule.amount,
+            min_finish_rate=rule.min_finish_rate,
+            exclude_user_ids=self._own_user_ids
+        )
+        best = book.fixed_prices[index] if index is not None else None
+
+        if book.side == SIDE_BUY:
+            target = best + tick if best is not None else low
+        else:
+            target = best - tick if best is not None else high
+        return min(high, max(low, target))
+
+    async def _update(self, managed: _ManagedAd, scale: int, target: int, seen: float) -> None:
+        rule = managed.rule
+        old_price = format_fixed(managed.price, scale) if managed.price is not None else None
+        new_price = format_fixed(target, scale)
+
+        if not self.dry_run:
+            try:
+                status, data = await self._client.update_ad_price(managed.ad, new_price)
+            except Exception as ex:
+                managed.failures += 1
+                await self._notify_error(rule, ex)
+                return None
+
+            if not status:
+                managed.failures += 1
+                await self._notify_error(rule, ret_code_error(f"update ad {rule.ad_id} to {new_price}", data))
+                return None
+
+        done = time.monotonic()
+        managed.price = target
+        managed.updates += 1
+        managed.last_update = done
+        self.reaction_latencies.append(done - seen)
+
+        if self._on_update is not None:
+            await self._notify(self._on_update, rule, old_price, new_price)
+
+    async def _reprice_market(self, market: Tuple[str, str, str], managed_ads: List[_ManagedAd]) -> None:
+        token_id, currency_id, side = market
+        managed_ads = [managed for managed in managed_ads if managed.ad is not None]
+        if not managed_ads:
+            return None
+
+        started = time.monotonic()
+        try:
+            status, data = await self._client.get_ad_book(
+                token_id=token_id,
+                currency_id=currency_id,
+                # Competitors of a buy ad are the buy ads, listed for takers who sell.
+                side="sell" if side == "buy" else "buy",
+                size=max(managed.rule.size for managed in managed_ads),
+                sort_type="TRADE_PRICE"
+            )
+            if not status:
+                raise ret_code_error(f"ad book {token_id}/{currency_id}", data)
+        except Exception as ex:
+            for managed in managed_ads:
+                await self._notify_error(managed.rule, ex)
+            return None
+
+        book = data[1]
+        updates = []
+        for managed in managed_ads:
+            target = self.target_price(managed, book)
+            if target != managed.price:
+                updates.append(self._update(managed, book.price_scale, target, started))
+
+        if updates:
+            await asyncio.gather(*updates)
+
+    async def step(self) -> None:
+        """
+        One cycle: poll every market once and push the updates it calls for.
+        """
+
+        if self._ads_read_at is None or time.monotonic() - self._ads_read_at >= self.ads_refresh:
+            await self.refresh_ads()
+
+        started = time.monotonic()
+        await asyncio.gather(*(
+            self._reprice_market(market, managed_ads) for market, managed_ads in self._markets().items()
+        ))
+
+        duration = time.monotonic() - started
+        self.cycles += 1
+        self.cycle_durations.append(duration)
+        if duration > self.interval:
+            self.overruns += 1
+
+    async def run(self, duration: float = None) -> None:
+        """
+        Reprice every `interval` seconds until stop() is called or `duration` seconds pass.
+        """
+
+        self._running = True
+        deadline = time.monotonic() + duration if duration is not None else None
+
+        while self._running:
+            started = time.monotonic()
+            await self.step()
+
+            if deadline is not None and time.monotonic() >= deadline:
+                break
+            await asyncio.sleep(max(0.0, self.interval - (time.monotonic() - started)))
+
+        self._running = False
+
+    def stop(self) -> None:
+        self._running = False
+
+    async def _notify(self, callback, *args) -> None:
+        try:
+            result = callback(*args)
+            if inspect.isawaitable(result):
+                await result
+        except Exception:
+            logger.exception("Repricer callback failed for %r", args[0])
+
+    async def _notify_error(self, rule: RepriceRule, error: Exception) -> None:
+        if self._on_error is None:
+            logger.warning("Repricing %r failed: %s", rule, error)
+            return None
+        await self._notify(self._on_error, rule, error)
+
+    def stats(self) -> dict:
+        """
+        Cycle counts and durations, reaction latency percentiles in seconds, and per-ad state.
+        """
+
+        latencies, durations = list(self.reaction_latencies), list(self.cycle_durations)
+        return {
+            "cycles": self.cycles,
+            "overruns": self.overruns,
+            "cycle_p50": _percentile(durations, 0.5),
+            "cycle_max": max(durations) if durations else None,
+            "reaction_p50": _percentile(latencies, 0.5),
+            "reaction_p99": _percentile(latencies, 0.99),
+            "reaction_max": max(latencies) if latencies else None,
+            "ads": [
+                {
+                    "ad_id": managed.rule.ad_id,
+                    "found": managed.ad is not None,
+                    "price": format_fixed(managed.price, managed.ad.price_scale) if managed.price is not None else None,
+                    "updates": managed.updates,
+                    "failures": managed.failures,
+                }
+                for managed in self.ads.values()
+            ],
+        }
@@ -0,0 +1,188 @@
+from typing import Any, Callable, Dict, List, Union
+
+from ._p2p_method import P2PMethod
+
+# Fields the API expects as strings, at any nesting level (e.g. inside tradingPreferenceSet).
+STR_PARAMS = frozenset({
+    "itemId",
+    "side",
+    "currency_id",
+    # get_ad_detail
+    "id",
+    # update_ad
+    "priceType",
+    "premium",
+    "price",
+    "minAmount",
+    "maxAmount",
+    "remark",
+    "actionType",
+    "quantity",
+    "paymentPeriod",
+    # -> tradingPreferenceSet
+    "hasUnPostAd",
+    "isKyc",
+    "isEmail",
+    "isMobile",
+    "hasRegisterTime",
+    "registerTimeThreshold",
+    "orderFinishNumberDay30",
+    "completeRateDay30",
+    "nationalLimit",
+    "hasOrderFinishNumberDay30",
+    "hasCompleteRateDay30",
+    "hasNationalLimit",
+    # get_orders
+    "beginTime",
+    "endTime",
+    "tokenId",
+    "currencyId",
+    "sortType",
+    "page",
+    "coin",
+    "amount",
+    # get chat message
+    "startMessageId",
+    # switch active mode
+    "workStatus",
+    "memberId",
+})
+INT_PARAMS = frozenset({
+    "positionIdx",
+})
+
+
+def _to_str(value):
+    return value if isinstance(value, str) else str(value)
+
+
+def _to_int(value):
+    return value if isinstance(value, int) else int(value)
+
+
+# Per-field cast schema.
+_CASTS: Dict[str, Callable[[Any], Any]] = {
+    **{key: _to_str for key in STR_PARAMS},
+    **{key: _to_int for key in INT_PARAMS},
+}
+
+
+def _cast_dict(params: dict, integral_floats: bool = False, casts: Dict[str, Callable[[Any], Any]] = _CASTS) -> dict:
+    """
+    Cast values by the schema. `params` is never modified: it is returned as is when nothing
+    needs a cast, otherwise a copy is made on the first change.
+
+    With integral_floats, floats like 5.0 become ints first, as the API rejects "5.0".
+    """
+
+    result = None
+
+    for key, original in params.items():
+        value = original
+        cls = value.__class__
+
+        # Most values are strings already, so they are checked first.
+        if cls is str:
+            if casts.get(key) is not _to_int:
+                continue
+            value = int(value)
+        elif cls is bool or value is None:
+            continue
+        elif isinstance(value, dict):
+            value = _cast_dict(value, casts=casts)
+        elif isinstance(value, list):
+            value = _cast_list(key, value, casts)
+        else:
+            if integral_floats and cls is float and value.is_integer():
+                value = int(value)
+            cast = casts.get(key)
+            if cast is not None:
+                value = cast(value)
+
+        if value is not original:
+            if result is None:
+                result = dict(params)
+            result[key] = value
+
+    return params if result is None else result
+
+
+def _cast_list(key: str, values: list, casts: Dict[str, Callable[[Any], Any]] = _CASTS) -> list:
+    cast = casts.get(key)
+    result = None
+
+    for i, item in enumerate(values):
+        if isinstance(item, dict):
+            new_item = _cast_dict(item, casts=casts)
+        elif cast is not None:
+            new_item = cast(item)
+        else:
+            continue
+
+        if new_item is not item:
+            if result is None:
+                result = list(values)
+            result[i] = new_item
+
+    return values if result is None else result
+
+
+class RequestPlan:
+    """
+    Everything about a P2PMethod that does not change between calls, worked out once.
+
+    Attributes:
+        method (P2PMethod): The compiled method.
+        endpoint (str): Full endpoint URL.
+        required (frozenset): Required parameter names.
+    """
+
+    __slots__ = ("method", "endpoint", "http_method", "required", "_required_order", "_casts")
+
+    def __init__(
+        self,
+        method: P2PMethod,
+        base_url: str
+    ):
+        self.method = method
+        self.endpoint = base_url + method.url
+        self.http_method = method.http_method.upper()
+        self.required = frozenset(method.required_params)
+        self._required_order = tuple(method.required_params)
+        self._casts = {**_CASTS, **{key: _to_int for key in method.int_params}} if method.int_params else _CASTS
+
+    def missing(self, params: dict) -> List[str]:
+        if self.required.issubset(params):
+            return []
+        return [p for p in self._required_order if p not in params]
+
+    def prepare(self, params: dict) -> dict:
+        """
+        Apply the casts of the API: integral floats become ints at the top level, then the
+        per-field schema, with the method's int_params taking precedence, is applied. Returns a
+        new dict only if something changed.
+        """
+
+        if self.http_method == "POST":
+            return _cast_dict(params, integral_floats=True, casts=self._casts)
+
+        result = None
+        for key, value in params.items():
+            if value.__class__ is float and value.is_integer():
+                if result is None:
+                    result = dict(params)
+                result[key] = int(value)
+
+        return params if result is None else result
+
+    def encode(self, params: dict, codec) -> Union[str, bytes]:
+        if self.http_method == "GET":
+            return "&".join(
+                [
+                    f"{k}={v}"
+                    for k, v in sorted(params.items())
+                    if v is not None
+                ]
+            )
+        # Bytes: the body is signed and sent as is.
+        return codec.dumps(params)
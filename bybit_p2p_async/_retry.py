@@ -0,0 +1,106 @@
+import asyncio
+import random
+from typing import Iterable
+
+import aiohttp
+
+# retCodes meaning the request was rejected before it was executed, so sending it again is always safe.
+# 10002: timestamp is outside of recv_window, 10006: too many visits.
+REJECTED_RET_CODES = frozenset({10002, 10006})
+# retCodes of transient server failures, where the request may or may not have been executed.
+# 10000: server timeout, 10016: internal server error.
+TRANSIENT_RET_CODES = frozenset({10000, 10016})
+TRANSIENT_STATUSES = frozenset({500, 502, 503, 504})
+
+
+class RetryPolicy:
+    """
+    When and how often a request is sent again.
+
+    Every attempt is signed with a fresh timestamp. Delays grow exponentially from `base_delay`
+    up to `max_delay` and use full jitter, so clients that failed together do not retry together.
+
+    Args:
+        max_attempts (int, optional): Attempts including the first one. 1 disables retries. Default 3.
+        base_delay (float, optional): Backoff before the second attempt, seconds. Default 0.2.
+        max_delay (float, optional): Backoff ceiling, seconds. Default 5.
+        statuses (Iterable[int], optional): HTTP statuses to retry.
+        ret_codes (Iterable[int], optional): Bybit retCodes to retry.
+        retry_connect_errors (bool, optional): Retry when a connection could not be established. Nothing was sent, so it is always safe. Default True.
+        retry_timeouts (bool, optional): Retry timeouts and dropped connections. The server may have executed the request, so only enable it for idempotent calls. Default False.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        base_delay: float = 0.2,
+        max_delay: float = 5.0,
+        statuses: Iterable[int] = (),
+        ret_codes: Iterable[int] = REJECTED_RET_CODES,
+        retry_connect_errors: bool = True,
+        retry_timeouts: bool = False
+    ):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.statuses = frozenset(statuses)
+        self.ret_codes = frozenset(ret_codes)
+        self.retry_connect_errors = retry_connect_errors
+        self.retry_timeouts = retry_timeouts
+
+    def backoff(self, attempt: int) -> float:
+        """
+        Delay before attempt number `attempt + 1`, where `attempt` starts from 1.
+        """
+
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+    def should_retry_exception(self, exc: BaseException) -> bool:
+        if isinstance(exc, aiohttp.ClientConnectorError):
+            return self.retry_connect_errors
+        if isinstance(exc, (asyncio.TimeoutError, aiohttp.ClientConnectionError)):
+            return self.retry_timeouts
+        return False
+
+
+# Reads: any transient failure is retried.
+IDEMPOTENT = RetryPolicy(
+    statuses=TRANSIENT_STATUSES,
+    ret_codes=REJECTED_RET_CODES | TRANSIENT_RET_CODES,
+    retry_timeouts=True
+)
+# Mutating calls: only failures where the request certainly was not executed.
+NON_IDEMPOTENT = RetryPolicy()
+NO_RETRY = RetryPolicy(max_attempts=1)
+
+
+class RetryBudget:
+    """
+    Caps retries at a share of the traffic, so a failing server is not hit by a retry storm.
+
+    Every request deposits `ratio` tokens and every retry spends one. The balance starts at
+    `max_tokens` and cannot exceed it, which leaves room for a few retries when traffic is low.
+    """
+
+    def __init__(
+        self,
+        ratio: float = 0.2,
+        max_tokens: float = 10.0
+    ):
+        self.ratio = ratio
+        self.max_tokens = max_tokens
+        self._tokens = max_tokens
+        self.retries = 0
+        self.exhausted = 0
+
+    def deposit(self) -> None:
+        self._tokens = min(self.max_tokens, self._tokens + self.ratio)
+
+    def withdraw(self) -> bool:
+        if self._tokens < 1:
+            self.exhausted += 1
+            return False
+
+        self._tokens -= 1
+        self.retries += 1
+        return True
@@ -0,0 +1,178 @@
+import asyncio
+import itertools
+import time
+from typing import Iterable, List, Optional
+
+from ._classes import MarketAd
+from ._exceptions import ret_code_error
+
+
+class MarketSpec:
+    """
+    One market to scan: get_market_ads() arguments for a token, currency, side and payment filter.
+
+    Args:
+        token_id (str, optional): Token id, like USDT or BTC. Default USDT.
+        currency_id (str, optional): Currency id, like USD or RUB. Default USD.
+        side (str, optional): 'buy' or 'sell'. Default 'buy'.
+        payment (List[str], optional): Payment method ids.
+        **params: Any other get_market_ads() argument, e.g. size or amount.
+    """
+
+    __slots__ = ("token_id", "currency_id", "side", "payment", "params")
+
+    def __init__(
+        self,
+        token_id: str = "USDT",
+        currency_id: str = "USD",
+        side: str = "buy",
+        payment: List[str] = None,
+        **params
+    ):
+        self.token_id = token_id
+        self.currency_id = currency_id
+        self.side = side.lower()
+        self.payment = list(payment) if payment else []
+        self.params = params
+
+    @property
+    def key(self) -> tuple:
+        return (self.token_id, self.currency_id, self.side, tuple(self.payment))
+
+    def kwargs(self) -> dict:
+        return {
+            **self.params,
+            "token_id": self.token_id,
+            "currency_id": self.currency_id,
+            "side": self.side,
+            "payment": self.payment,
+        }
+
+    @classmethod
+    def grid(
+        cls,
+        token_ids: Iterable[str],
+        currency_ids: Iterable[str],
+        sides: Iterable[str] = ("buy", "sell"),
+        payments: Iterable[Optional[List[str]]] = (None,),
+        **params
+    ) -> List["MarketSpec"]:
+        """
+        Every combination of the given tokens, currencies, sides and payment filters.
+        """
+
+        return [
+            cls(token_id, currency_id, side, payment, **params)
+            for token_id, currency_id, side, payment in itertools.product(token_ids, currency_ids, sides, payments)
+        ]
+
+    def __repr__(self) -> str:
+        return f"MarketSpec({self.token_id}/{self.currency_id} {self.side} {self.payment})"
+
+
+class MarketScanResult:
+    __slots__ = ("spec", "total_count", "ads", "started_at", "elapsed", "error")
+
+    def __init__(
+        self,
+        spec: MarketSpec,
+        total_count: int = None,
+        ads: List[MarketAd] = None,
+        started_at: float = None,
+        elapsed: float = None,
+        error: Exception = None
+    ):
+        self.spec = spec
+        self.total_count = total_count
+        self.ads = ads if ads is not None else []
+        self.started_at = started_at
+        self.elapsed = elapsed
+        self.error = error
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class MarketSnapshot:
+    """
+    Results of one scan, in the order of the specs.
+
+    Attributes:
+        results (List[MarketScanResult]): One result per market.
+        started_at (float): Unix time the scan started.
+        elapsed (float): Wall time of the whole scan, seconds.
+    """
+
+    def __init__(
+        self,
+        results: List[MarketScanResult],
+        started_at: float,
+        elapsed: float
+    ):
+        self.results = results
+        self.started_at = started_at
+        self.elapsed = elapsed
+        self._by_key = {result.spec.key: result for result in results}
+
+    def get(self, token_id: str, currency_id: str, side: str, payment: List[str] = None) -> Optional[MarketScanResult]:
+        return self._by_key.get((token_id, currency_id, side.lower(), tuple(payment or ())))
+
+    @property
+    def errors(self) -> List[MarketScanResult]:
+        return [result for result in self.results if not result.ok]
+
+    def __iter__(self):
+        return iter(self.results)
+
+    def __len__(self) -> int:
+        return len(self.results)
+
+
+class MarketScanner:
+    """
+    Polls a list of markets concurrently through one client.
+
+    All requests share the client's connection pool and rate limiter, and at most `concurrency`
+    of them are in flight at once. A failing market does not stop the scan, its error is
+    stored in its MarketScanResult.
+
+    Args:
+        client (P2P): Client used for get_market_ads() calls.
+        specs (Iterable[MarketSpec]): Markets to scan.
+        concurrency (int, optional): Requests in flight at the same time. Default 8.
+    """
+
+    def __init__(
+        self,
+        client,
+        specs: Iterable[MarketSpec],
+        concurrency: int = 8
+    ):
+        self._client = client
+        self.specs = list(specs)
+        self._semaphore = asyncio.Semaphore(concurrency)
+
+    async def _scan_one(self, spec: MarketSpec) -> MarketScanResult:
+        async with self._semaphore:
+            started_at = time.time()
+            started = time.perf_counter()
+            try:
+                status, data = await self._client.get_market_ads(**spec.kwargs())
+            except Exception as ex:
+                return MarketScanResult(spec, started_at=started_at, elapsed=time.perf_counter() - started, error=ex)
+
+            elapsed = time.perf_counter() - started
+
+        if not status:
+            error = ret_code_error(repr(spec), data)
+            return MarketScanResult(spec, started_at=started_at, elapsed=elapsed, error=error)
+
+        total_count, ads = data
+        return MarketScanResult(spec, total_count, ads, started_at, elapsed)
+
+    async def scan(self) -> MarketSnapshot:
+        started_at = time.time()
+        started = time.perf_counter()
+        results = await asyncio.gather(*(self._scan_one(spec) for spec in self.specs))
+        return MarketSnapshot(list(results), started_at, time.perf_counter() - started)
@@ -0,0 +1,108 @@
+import asyncio
+from collections import defaultdict, deque
+from contextlib import asynccontextmanager
+from typing import Deque, Dict, Hashable
+
+
+class FairScheduler:
+    """
+    Limits requests in flight across many clients and hands free slots out round-robin by key.
+
+    Each key (an account) queues its own waiters. When a slot frees up it goes to the next key in
+    turn, not to the oldest waiter overall, so an account with a thousand queued requests delays
+    another account's single request by at most one request per busy account.
+
+    Args:
+        concurrency (int, optional): Requests in flight at the same time. Default 32.
+    """
+
+    def __init__(
+        self,
+        concurrency: int = 32
+    ):
+        self.concurrency = concurrency
+        self._active = 0
+        self._queues: Dict[Hashable, Deque[asyncio.Future]] = defaultdict(deque)
+        # Keys with waiters, in serving order.
+        self._ring: Deque[Hashable] = deque()
+        self._waiting = 0
+
+        self.granted: Dict[Hashable, int] = defaultdict(int)
+
+    @property
+    def active(self) -> int:
+        return self._active
+
+    @property
+    def waiting(self) -> int:
+        return self._waiting
+
+    async def acquire(self, key: Hashable) -> None:
+        if self._active < self.concurrency and not self._waiting:
+            self._active += 1
+            self.granted[key] += 1
+            return None
+
+        future = asyncio.get_running_loop().create_future()
+        queue = self._queues[key]
+        if not queue:
+            self._ring.append(key)
+        queue.append(future)
+        self._waiting += 1
+
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # The slot was handed over just as the waiter was cancelled: pass it on.
+                self.release()
+            else:
+                self._forget(key, future)
+            raise
+
+    def _forget(self, key: Hashable, future: asyncio.Future) -> None:
+        queue = self._queues.get(key)
+        if queue is None or future not in queue:
+            return None
+
+        queue.remove(future)
+        self._waiting -= 1
+        if not queue:
+            del self._queues[key]
+            self._ring.remove(key)
+
+    def release(self) -> None:
+        while self._ring:
+            key = self._ring.popleft()
+            queue = self._queues[key]
+            future = queue.popleft()
+            self._waiting -= 1
+
+            if queue:
+                self._ring.append(key)
+            else:
+                del self._queues[key]
+
+            if not future.done():
+                # The slot moves to the waiter, the active count stays the same.
+                self.granted[key] += 1
+                future.set_result(None)
+                return None
+
+        self._active -= 1
+
+    @asynccontextmanager
+    async def slot(self, key: Hashable):
+        await self.acquire(key)
+        try:
+            yield
+        finally:
+            self.release()
+
+    def stats(self) -> dict:
+        return {
+            "concurrency": self.concurrency,
+            "active": self._active,
+            "waiting": self._waiting,
+            "waiting_by_key": {key: len(queue) for key, queue in self._queues.items()},
+        }
@@ -0,0 +1,142 @@
+import asyncio
+import base64
+import hashlib
+import hmac
+from concurrent.futures import Executor, ProcessPoolExecutor
+from functools import lru_cache
+from typing import Optional, Union
+
+from Crypto.Hash import SHA256
+from Crypto.PublicKey import RSA
+from Crypto.Signature import PKCS1_v1_5
+
+
+def _to_bytes(data: Union[str, bytes]) -> bytes:
+    return data.encode("utf-8") if isinstance(data, str) else data
+
+
+@lru_cache(maxsize=32)
+def _rsa_signer_for(api_secret: str):
+    return PKCS1_v1_5.new(RSA.importKey(api_secret))
+
+
+def _rsa_sign_in_process(api_secret: str, data: bytes) -> str:
+    # Runs in a worker process: the key is parsed once per worker and then taken from the cache.
+    return base64.b64encode(_rsa_signer_for(api_secret).sign(SHA256.new(data))).decode()
+
+
+class HmacSigner:
+    """
+    HMAC-SHA256 signer. The keyed hash is prepared once and copied for every signature.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        api_secret: str,
+        recv_window: int
+    ):
+        self._hmac = hmac.new(api_secret.encode("utf-8"), digestmod=hashlib.sha256)
+        self._prefix = f"{api_key}{recv_window}".encode("utf-8")
+
+    def sign_raw(self, data: Union[str, bytes]) -> str:
+        h = self._hmac.copy()
+        h.update(_to_bytes(data))
+        return h.hexdigest()
+
+    def sign(self, timestamp: int, payload: Union[str, bytes]) -> str:
+        h = self._hmac.copy()
+        h.update(str(timestamp).encode())
+        h.update(self._prefix)
+        h.update(_to_bytes(payload))
+        return h.hexdigest()
+
+    async def asign(self, timestamp: int, payload: Union[str, bytes]) -> str:
+        return self.sign(timestamp, payload)
+
+    def stream(self, timestamp: int):
+        """
+        Start an incremental signature: update() the returned object with the payload, then pass it to afinish().
+        """
+
+        h = self._hmac.copy()
+        h.update(str(timestamp).encode())
+        h.update(self._prefix)
+        return h
+
+    async def afinish(self, stream) -> str:
+        return stream.hexdigest()
+
+
+class RsaSigner:
+    """
+    RSA (PKCS#1 v1.5, SHA256) signer. The PEM key is parsed once at construction.
+
+    With an executor the signature is computed off the event loop: in a thread for ThreadPoolExecutor,
+    or in a worker process for ProcessPoolExecutor.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        api_secret: str,
+        recv_window: int,
+        executor: Optional[Executor] = None
+    ):
+        self._api_secret = api_secret
+        self._signer = PKCS1_v1_5.new(RSA.importKey(api_secret))
+        self._prefix = f"{api_key}{recv_window}".encode("utf-8")
+        self._executor = executor
+
+    def sign_raw(self, data: Union[str, bytes]) -> str:
+        return base64.b64encode(self._signer.sign(SHA256.new(_to_bytes(data)))).decode()
+
+    def _sign_string(self, timestamp: int, payload: Union[str, bytes]) -> bytes:
+        return str(timestamp).encode() + self._prefix + _to_bytes(payload)
+
+    def sign(self, timestamp: int, payload: Union[str, bytes]) -> str:
+        return self.sign_raw(self._sign_string(timestamp, payload))
+
+    async def asign(self, timestamp: int, payload: Union[str, bytes]) -> str:
+        if self._executor is None:
+            return self.sign(timestamp, payload)
+
+        loop = asyncio.get_running_loop()
+        data = self._sign_string(timestamp, payload)
+
+        if isinstance(self._executor, ProcessPoolExecutor):
+            return await loop.run_in_executor(self._executor, _rsa_sign_in_process, self._api_secret, data)
+        return await loop.run_in_executor(self._executor, self.sign_raw, data)
+
+    def stream(self, timestamp: int):
+        """
+        Start an incremental signature: update() the returned object with the payload, then pass it to afinish().
+        """
+
+        h = SHA256.new()
+        h.update(str(timestamp).encode())
+        h.update(self._prefix)
+        return h
+
+    def _finish(self, stream) -> str:
+        return base64.b64encode(self._signer.sign(stream)).decode()
+
+    async def afinish(self, stream) -> str:
+        if self._executor is None:
+            return self._finish(stream)
+
+        # Hash objects cannot be sent to another process, so a process pool falls back to the default thread pool.
+        executor = None if isinstance(self._executor, ProcessPoolExecutor) else self._executor
+        return await asyncio.get_running_loop().run_in_executor(executor, self._finish, stream)
+
+
+def create_signer(
+    api_key: str,
+    api_secret: str,
+    recv_window: int,
+    rsa: bool = False,
+    executor: Optional[Executor] = None
+) -> Union[HmacSigner, RsaSigner]:
+    if rsa:
+        return RsaSigner(api_key, api_secret, recv_window, executor)
+    return HmacSigner(api_key, api_secret, recv_window)
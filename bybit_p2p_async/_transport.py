@@ -0,0 +1,143 @@
+from typing import Optional
+
+import aiohttp
+
+
+class TransportResponse:
+    __slots__ = ("status", "headers", "body")
+
+    def __init__(
+        self,
+        status: int,
+        headers,
+        body: bytes
+    ):
+        self.status = status
+        self.headers = headers
+        self.body = body
+
+
+class P2PTransport:
+    """
+    Owns the aiohttp session and its TCP connection pool.
+
+    The pool is created lazily on the first request and is only closed by close().
+    Failed requests never tear it down, so keep-alive TLS connections survive errors.
+
+    Args:
+        limit (int, optional): Total number of simultaneous connections. 0 means unlimited. Default 100.
+        limit_per_host (int, optional): Simultaneous connections per host. 0 means unlimited. Default 0.
+        keepalive_timeout (float, optional): Seconds an idle connection is kept in the pool. Default 30.
+        dns_cache_ttl (int, optional): Seconds a resolved address is cached. None caches forever. Default 60.
+        timeout (float, optional): Total timeout of a single request in seconds. None keeps the aiohttp default.
+    """
+
+    def __init__(
+        self,
+        limit: int = 100,
+        limit_per_host: int = 0,
+        keepalive_timeout: float = 30.0,
+        dns_cache_ttl: Optional[int] = 60,
+        timeout: Optional[float] = None
+    ):
+        self._limit = limit
+        self._limit_per_host = limit_per_host
+        self._keepalive_timeout = keepalive_timeout
+        self._dns_cache_ttl = dns_cache_ttl
+        self._timeout = timeout
+
+        self._session = None
+        self._connector = None
+
+        self._requests = 0
+        self._connections_created = 0
+        self._connections_reused = 0
+
+    def _create_session(self) -> aiohttp.ClientSession:
+        self._connector = aiohttp.TCPConnector(
+            limit=self._limit,
+            limit_per_host=self._limit_per_host,
+            keepalive_timeout=self._keepalive_timeout,
+            ttl_dns_cache=self._dns_cache_ttl,
+            use_dns_cache=True
+        )
+
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_connection_create_end.append(self._on_connection_create_end)
+        trace_config.on_connection_reuseconn.append(self._on_connection_reuseconn)
+
+        if self._timeout is not None:
+            timeout = aiohttp.ClientTimeout(total=self._timeout)
+        else:
+            timeout = aiohttp.client.DEFAULT_TIMEOUT
+
+        return aiohttp.ClientSession(
+            connector=self._connector,
+            timeout=timeout,
+            trace_configs=[trace_config]
+        )
+
+    async def _on_connection_create_end(self, session, context, params) -> None:
+        self._connections_created += 1
+
+    async def _on_connection_reuseconn(self, session, context, params) -> None:
+        self._connections_reused += 1
+
+    async def get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = self._create_session()
+        return self._session
+
+    @property
+    def closed(self) -> bool:
+        return self._session is None or self._session.closed
+
+    async def request(
+        self,
+        http_method: str,
+        url: str,
+        headers: dict = None,
+        data=None
+    ) -> TransportResponse:
+        """
+        Send a request and read the whole response body, so the connection goes back to the pool right away.
+        """
+
+        session = await self.get_session()
+        self._requests += 1
+
+        async with session.request(http_method, url, headers=headers, data=data) as response:
+            body = await response.read()
+            return TransportResponse(response.status, response.headers, body)
+
+    def pool_stats(self) -> dict:
+        """
+        Connection pool statistics, useful for sizing limit and limit_per_host.
+
+        Returns:
+            dict: limit, limit_per_host, acquired (connections in use), idle (keep-alive connections
+            waiting in the pool), requests, connections_created and connections_reused counters.
+        """
+
+        acquired = 0
+        idle = 0
+
+        if self._connector is not None and not self._connector.closed:
+            acquired = len(getattr(self._connector, "_acquired", ()))
+            idle = sum(len(conns) for conns in getattr(self._connector, "_conns", {}).values())
+
+        return {
+            "limit": self._limit,
+            "limit_per_host": self._limit_per_host,
+            "acquired": acquired,
+            "idle": idle,
+            "requests": self._requests,
+            "connections_created": self._connections_created,
+            "connections_reused": self._connections_reused,
+        }
+
+    async def close(self) -> None:
+        if self._session is None:
+            return None
+
+        await self._session.close()
@@ -1,18 +1,190 @@
-from typing import List, Tuple, Union
-
-from ._classes import AccountInfo, CoinBalance, MarketAd
+import asyncio
+import math
+from collections import deque
+from typing import AsyncIterator, Awaitable, Callable, Iterable, List, Tuple, Union
+
+from ._ad_book import AdBook
+from ._cache import ResponseCache
+from ._classes import AccountInfo, CoinBalance, MarketAd, Order, OrderDetail
+from ._exceptions import ret_code_error
+from ._fixed_point import format_fixed
 from ._p2p_helper import P2PMethods
+from ._p2p_method import P2PMethod
 from ._p2p_manager import P2PManager
+from ._scanner import MarketScanner, MarketSnapshot, MarketSpec
+
+
+def _market_ads_params(
+    amount: int | str = None,
+    bulk_maker: bool = False,
+    can_trade: bool = False,
+    currency_id: str = "USD",
+    item_region: int = 1,
+    page: int | str = 1,
+    payment: List[str] = [],
+    payment_period: List[int] = [],
+    side: str = "buy",
+    size: int | str = 10,
+    sort_type: str = "OVERALL_RANKING",
+    token_id: str = "USDT",
+    va_maker: bool = False,
+    verification_filter: bool = False
+) -> dict:
+    side = side.lower()
+
+    params = {
+        "tokenId": token_id,
+        "currencyId": currency_id,
+        "side": "1" if side == "buy" else "0",
+        "verificationFilter": 2 if not verification_filter else 0,
+        "vaMaker": va_maker,
+        "page": str(page),
+        "size": str(size),
+        "itemRegion": item_region,
+        "canTrade": can_trade,
+        "bulkMaker": bulk_maker,
+        "payment": payment,
+        "paymentPeriod": payment_period,
+        "sortType": sort_type,
+    }
+
+    if amount:
+        params["amount"] = str(amount)
+
+    return params
+
+
+def _project(items: list, fields: Iterable[str]) -> list:
+    return [{key: item[key] for key in fields if key in item} for item in items]
 
 
 class P2PRequests(P2PManager):
+    def __init__(
+        self,
+        *args,
+        response_cache: ResponseCache = None,
+        **kwargs
+    ):
+        super().__init__(*args, **kwargs)
+        self._response_cache = response_cache
+
+    async def _cached_request(
+        self,
+        method: P2PMethod,
+        params: dict
+    ):
+        if self._response_cache is None:
+            return await self._request(method=method, params=params)
+
+        return await self._response_cache.get_or_fetch(
+            method,
+            params,
+            lambda: self._request(method=method, params=params)
+        )
+
+    def invalidate_cache(
+        self,
+        method: P2PMethod = None,
+        params: dict = None
+    ) -> None:
+        """
+        Drop cached responses: all of them, those of one method, or one method with given params.
+        """
+
+        if self._response_cache is not None:
+            self._response_cache.invalidate(method, params)
+
+    async def request_bytes(
+        self,
+        method: P2PMethod,
+        params: dict = {}
+    ) -> Tuple[bool, Union[Tuple[int, str], bytes]]:
+        """
+        Send a request and return the response body as is, without decoding it or building models.
+
+        A body that starts with retCode 0 is not decoded at all. Responses are never cached.
+
+        Returns:
+            Tuple[bool, Union[Tuple[int, str], bytes]]: Success status and the whole response body. If not success tuple is retCode and retMsg.
+        """
+
+        return await self._request(method=method, params=params, raw_body=True)
+
+    async def get_market_ads_bytes(
+        self,
+        **filters
+    ) -> Tuple[bool, Union[Tuple[int, str], bytes]]:
+        """
+        Get market ads as the undecoded response body.
+
+        Args:
+            **filters: Same arguments as get_market_ads().
+
+        Returns:
+            Tuple[bool, Union[Tuple[int, str], bytes]]: Success status and the response body. If not success tuple is retCode and retMsg.
+        """
+
+        return await self.request_bytes(P2PMethods.GET_ONLINE_ADS, _market_ads_params(**filters))
+
+    async def _iter_pages(
+        self,
+        fetch_page: Callable[[int], Awaitable[Tuple[bool, tuple]]],
+        size: int,
+        concurrency: int,
+        max_pages: int = None
+    ) -> AsyncIterator[MarketAd]:
+        """
+        Walk a paginated endpoint. `fetch_page(page)` returns the usual status and (total_count, items) tuple.
+
+        The first page tells how many pages there are. The rest are requested concurrently, keeping at most
+        `concurrency` requests in flight, and are yielded in page order.
+        """
+
+        def check(page, status, data):
+            if not status:
+                raise ret_code_error(f"page {page}", data)
+            return data[1]
+
+        status, data = await fetch_page(1)
+        items = check(1, status, data)
+        pages = math.ceil(int(data[0]) / size)
+        if max_pages is not None:
+            pages = min(pages, max_pages)
+
+        for item in items:
+            yield item
+
+        window = deque()
+        next_page = 2
+
+        try:
+            while next_page <= pages or window:
+                while next_page <= pages and len(window) < concurrency:
+                    window.append((next_page, asyncio.ensure_future(fetch_page(next_page))))
+                    next_page += 1
+
+                page, task = window.popleft()
+                status, data = await task
+                items = check(page, status, data)
+
+                # The book moved while paging and ran out early.
+                if not items:
+                    break
+
+                for item in items:
+                    yield item
+        finally:
+            for _, task in window:
+                task.cancel()
 
     async def get_current_balance(
         self,
         account_type: str = "FUND",
         with_bonus: bool = False,
         member_id: int | str = None,
-        coins: List[str] = None
+        coins: List[str] = None,
+        raw: bool = False,
+        fields: Iterable[str] = None
     ) -> Tuple[bool, Union[Tuple[int, str], Tuple[str, int, List[CoinBalance]]]]:
         """
         Obtain wallet balance, query asset information of each currency.
@@ -23,6 +195,8 @@ class P2PRequests(P2PManager):
             with_bonus (bool, optional): With bonus filter. Default False.
             member_id (int | str, options): User Id. It is required when you use master api key to check sub account coin balance.
             coins (List[str]): Coin names
+            raw (bool, optional): Return raw API dicts instead of CoinBalance instances. Default False.
+            fields (Iterable[str], optional): Keep only these API keys of every coin, e.g. ["coin", "walletBalance"].
 
         Returns:
             Tuple[str, int, List[CoinBalance]]: Success status and tuple. If success tuple is account_type, member_id and a list of CoinBalance. If not success tuple is retCode and retMsg.
@@ -39,7 +213,7 @@ class P2PRequests(P2PManager):
         if coins:
             params["coin"] = ",".join(coins)
 
-        status, data = await self._request(
+        status, data = await self._cached_request(
             method=P2PMethods.GET_CURRENT_BALANCE,
             params=params
         )
@@ -47,7 +221,11 @@ class P2PRequests(P2PManager):
         if not status:
             return status, data
 
-        balances = [CoinBalance(**coin) for coin in data["balance"]]
+        balances = data["balance"]
+        if fields is not None:
+            balances = _project(balances, fields)
+        if not raw:
+            balances = [CoinBalance.from_dict(coin) for coin in balances]
 
         return status, (data["accountType"], int(data["memberId"]), balances)
 
@@ -66,7 +244,9 @@ class P2PRequests(P2PManager):
         sort_type: str = "OVERALL_RANKING",
         token_id: str = "USDT",
         va_maker: bool = False,
-        verification_filter: bool = False
+        verification_filter: bool = False,
+        raw: bool = False,
+        fields: Iterable[str] = None
     ) -> Tuple[bool, Union[Tuple[int, str], Tuple[int, List[MarketAd]]]]:
         """
         Get market ads from the P2P marketplace.
@@ -85,33 +265,31 @@ class P2PRequests(P2PManager):
             token_id (str, optional): Token id, like USDT, BTC, ETH, or USDC.
             va_maker (bool, optional): Show only verified makers.
             verification_filter (bool, optional): Ads with no verification needed filter.
+            raw (bool, optional): Return raw API dicts instead of MarketAd instances. Default False.
+            fields (Iterable[str], optional): Keep only these API keys of every ad, e.g. ["id", "price", "lastQuantity"].
 
         Returns:
             Tuple[int, List[MarketAd]]: Success status and tuple. If success tuple is total_count and a list of MarketAd instances. If not success tuple is retCode and retMsg.
         """
 
-        side = side.lower()
-
-        params = {
-            "tokenId": token_id,
-            "currencyId": currency_id,
-            "side": "1" if side == "buy" else "0",
-            "verificationFilter": 2 if not verification_filter else 0,
-            "vaMaker": va_maker,
-            "page": str(page),
-            "size": str(size),
-            "itemRegion": item_region,
-            "canTrade": can_trade,
-            "bulkMaker": bulk_maker,
-            "payment": payment,
-            "paymentPeriod": payment_period,
-            "sortType": sort_type,
-        }
-
-        if amount:
-            params["amount"] = str(amount)
+        params = _market_ads_params(
+            amount=amount,
+            bulk_maker=bulk_maker,
+            can_trade=can_trade,
+            currency_id=currency_id,
+            item_region=item_region,
+            page=page,
+            payment=payment,
+            payment_period=payment_period,
+            side=side,
+            size=size,
+            sort_type=sort_type,
+            token_id=token_id,
+            va_maker=va_maker,
+            verification_filter=verification_filter
+        )
 
-        status, data = await self._request(
+        status, data = await self._cached_request(
             method=P2PMethods.GET_ONLINE_ADS,
             params=params
         )
@@ -121,26 +299,120 @@ class P2PRequests(P2PManager):
         
         total_count = data["count"]
         items = data["items"]
+        if fields is not None:
+            items = _project(items, fields)
+        if raw:
+            return status, (total_count, items)
 
-        ads = [MarketAd(**item) for item in items]
+        ads = [MarketAd.from_dict(item) for item in items]
         return status, (total_count, ads)
 
+    async def get_ad_book(
+        self,
+        **filters
+    ) -> Tuple[bool, Union[Tuple[int, str], Tuple[int, AdBook]]]:
+        """
+        Get market ads as an AdBook, built straight from the response without MarketAd objects.
+
+        Args:
+            **filters: Same arguments as get_market_ads().
+
+        Returns:
+            Tuple[bool, Union[Tuple[int, str], Tuple[int, AdBook]]]: Success status and tuple. If success tuple is total_count and an AdBook. If not success tuple is retCode and retMsg.
+        """
+
+        params = _market_ads_params(**filters)
+
+        status, data = await self._cached_request(
+            method=P2PMethods.GET_ONLINE_ADS,
+            params=params
+        )
+
+        if not status:
+            return status, data
+
+        return status, (data["count"], AdBook(data["items"], side=int(params["side"])))
+
+    async def iter_market_ads(
+        self,
+        size: int = 50,
+        concurrency: int = 5,
+        max_pages: int = None,
+        **filters
+    ) -> AsyncIterator[MarketAd]:
+        """
+        Iterate over all market ads matching the filters, page after page.
+
+        The first page gives the total count, then the remaining pages are fetched concurrently.
+        Ads are yielded in the same order as the API returns them.
+
+        Args:
+            size (int, optional): Page size. Default 50.
+            concurrency (int, optional): Pages requested at the same time. Default 5.
+            max_pages (int, optional): Stop after this many pages.
+            **filters: Any get_market_ads() argument except page and size.
+
+        Raises:
+            FailedRequestError: A page was answered with a non-zero retCode.
+
+        Yields:
+            MarketAd: Market ads in page order.
+        """
+
+        async def fetch_page(page):
+            return await self.get_market_ads(page=page, size=size, **filters)
+
+        async for ad in self._iter_pages(fetch_page, size, concurrency, max_pages):
+            yield ad
+
+    async def scan_markets(
+        self,
+        specs: Iterable[MarketSpec],
+        concurrency: int = 8
+    ) -> MarketSnapshot:
+        """
+        Get market ads for many markets at once.
+
+        Args:
+            specs (Iterable[MarketSpec]): Markets to scan, for example MarketSpec.grid(["USDT"], ["RUB", "KZT"]).
+            concurrency (int, optional): Requests in flight at the same time. Default 8.
+
+        Returns:
+            MarketSnapshot: One MarketScanResult per spec with total count, ads, timing and error.
+        """
+
+        return await MarketScanner(self, specs, concurrency).scan()
+
     async def get_account_information(
         self,
+        raw: bool = False,
+        fields: Iterable[str] = None,
         **kwargs
     ) -> Tuple[bool, Union[Tuple[int, str], AccountInfo]]:
         """
         Get Account Information
 
+        Args:
+            raw (bool, optional): Return the raw API dict instead of an AccountInfo instance. Default False.
+            fields (Iterable[str], optional): Keep only these API keys, e.g. ["nickName", "userId"].
+
         Return Tuple[bool, Union[Tuple[int, str], AccountInfo]]: Success status and AccountInfo instance if success. If not success tuple: retCode and retMsg.
         """
 
-        status, data = await self._request(
+        status, data = await self._cached_request(
             method=P2PMethods.GET_ACCOUNT_INFORMATION,
             params=kwargs
         )
 
-        return status, AccountInfo(**data)
+        if not status:
+            return status, data
+
+        if fields is not None:
+            data = {key: data[key] for key in fields if key in data}
+        if raw:
+            return status, data
+
+        return status, AccountInfo.from_dict(data)
 
     async def get_ads_list(
         self,
@@ -150,7 +422,9 @@ class P2PRequests(P2PManager):
         token_id: str = "USDT",
         page: int | str = 1,
         size: int | str = 10,
-        currency_id: str = "USD"
+        currency_id: str = "USD",
+        raw: bool = False,
+        fields: Iterable[str] = None
     ) -> Tuple[bool, Union[Tuple[int, str], Tuple[int, bool, List[MarketAd]]]]:
         """
         Get account ads list.
@@ -165,6 +439,8 @@ class P2PRequests(P2PManager):
             page (int | str, optional): Page number, default 1.
             size (int | str, optional): Page size, default 10,
             currency_id (str, optional): Currency id, for example: HKD, USD, EUR. Default USD.
+            raw (bool, optional): Return raw API dicts instead of MarketAd instances. Default False.
+            fields (Iterable[str], optional): Keep only these API keys of every ad.
         
         Returns:
             Tuple[bool, Union[Tuple[int, str], Tuple[int, bool, List[MarketAd]]]]: Success status and tuple. If success tuple is ads count, hidden flag and list of MarketAd instances. If not succes tuple is retCode and retMsg.
@@ -182,7 +458,7 @@ class P2PRequests(P2PManager):
         if item_id:
             params["itemId"] = str(item_id)
 
-        status, data = await self._request(
+        status, data = await self._cached_request(
             method=P2PMethods.GET_ADS_LIST,
             params=params
         )
@@ -190,4 +466,247 @@ class P2PRequests(P2PManager):
         if not status:
             return status, data
 
-        return status, (data["count"], data["hiddenFlag"], [MarketAd(**info) for info in data["items"]])
+        items = data["items"]
+        if fields is not None:
+            items = _project(items, fields)
+        if not raw:
+            items = [MarketAd.from_dict(info) for info in items]
+
+        return status, (data["count"], data["hiddenFlag"], items)
+
+    async def update_ad(
+        self,
+        ad_id: int | str,
+        price: float | str,
+        min_amount: float | str,
+        max_amount: float | str,
+        quantity: float | str,
+        payment_ids: List[str],
+        remark: str = "",
+        price_type: int = 0,
+        premium: float | str = "",
+        payment_period: int = 15,
+        trading_preference_set: dict = None,
+        action_type: str = "MODIFY"
+    ) -> Tuple[bool, Union[Tuple[int, str], dict]]:
+        """
+        Update or relist an ad.
+
+        Args:
+            ad_id (int | str): Ad id.
+            price (float | str): Price. Pass a string, e.g. from format_fixed(), to control the decimals.
+            min_amount (float | str): Minimum order amount, fiat.
+            max_amount (float | str): Maximum order amount, fiat.
+            quantity (float | str): Ad quantity, token.
+            payment_ids (List[str]): Payment term ids of the account (PaymentTerm.id), not payment types.
+            remark (str, optional): Ad remark.
+            price_type (int, optional): 0 fixed price, 1 floating price. Default 0.
+            premium (float | str, optional): Premium of a floating price ad, percent.
+            payment_period (int, optional): Payment period, minutes. Default 15.
+            trading_preference_set (dict, optional): Counterparty requirements, in API keys.
+            action_type (str, optional): "MODIFY" to update an online ad, "ACTIVE" to relist an offline one. Default "MODIFY".
+
+        Returns:
+            Tuple[bool, Union[Tuple[int, str], dict]]: Success status and the result dict (security risk fields). If not success tuple is retCode and retMsg.
+        """
+
+        params = {
+            "id": str(ad_id),
+            "priceType": price_type,
+            "premium": premium,
+            "price": price,
+            "minAmount": min_amount,
+            "maxAmount": max_amount,
+            "remark": remark,
+            "tradingPreferenceSet": trading_preference_set or {},
+            "paymentIds": [str(payment_id) for payment_id in payment_ids],
+            "actionType": action_type,
+            "quantity": quantity,
+            "paymentPeriod": payment_period,
+        }
+
+        return await self._request(
+            method=P2PMethods.UPDATE_AD,
+            params=params
+        )
+
+    async def update_ad_price(
+        self,
+        ad: MarketAd,
+        price: float | str
+    ) -> Tuple[bool, Union[Tuple[int, str], dict]]:
+        """
+        Change the price of one of the account's ads, keeping everything else as it is.
+
+        Args:
+            ad (MarketAd): The ad as returned by get_ads_list(), which includes its payment terms.
+            price (float | str): New price.
+
+        Returns:
+            Tuple[bool, Union[Tuple[int, str], dict]]: Same as update_ad().
+        """
+
+        trading_preference_set = ad.trading_preference_set
+        return await self.update_ad(
+            ad_id=ad.id,
+            price=price,
+            min_amount=format_fixed(ad.min_amount_fixed, ad.price_scale),
+            max_amount=format_fixed(ad.max_amount_fixed, ad.price_scale),
+            # The total quantity of the ad; last_quantity is only the part not yet filled.
+            quantity=format_fixed(ad.quantity_fixed, ad.quantity_scale),
+            payment_ids=[str(term.id) for term in ad.payment_terms],
+            remark=ad.remark or "",
+            price_type=int(ad.price_type or 0),
+            premium=ad.premium_percent or "",
+            payment_period=int(ad.payment_period or 15),
+            trading_preference_set=trading_preference_set.to_dict() if trading_preference_set is not None else None
+        )
+
+    async def iter_ads_list(
+        self,
+        size: int = 50,
+        concurrency: int = 5,
+        max_pages: int = None,
+        **filters
+    ) -> AsyncIterator[MarketAd]:
+        """
+        Iterate over all account ads, page after page. Works like iter_market_ads().
+
+        Args:
+            size (int, optional): Page size. Default 50.
+            concurrency (int, optional): Pages requested at the same time. Default 5.
+            max_pages (int, optional): Stop after this many pages.
+            **filters: Any get_ads_list() argument except page and size.
+
+        Raises:
+            FailedRequestError: A page was answered with a non-zero retCode.
+
+        Yields:
+            MarketAd: Account ads in page order.
+        """
+
+        async def fetch_page(page):
+            status, data = await self.get_ads_list(page=page, size=size, **filters)
+            if not status:
+                return status, data
+            return status, (data[0], data[2])
+
+        async for ad in self._iter_pages(fetch_page, size, concurrency, max_pages):
+            yield ad
+
+    async def get_orders(
+        self,
+        page: int | str = 1,
+        size: int | str = 30,
+        order_status: int = None,
+        begin_time: int | str = None,
+        end_time: int | str = None,
+        token_id: str = None,
+        side: str = None,
+        raw: bool = False,
+        fields: Iterable[str] = None
+    ) -> Tuple[bool, Union[Tuple[int, str], Tuple[int, List[Order]]]]:
+        """
+        Get the account's orders, newest first.
+
+        Args:
+            page (int | str, optional): Page number. Default 1.
+            size (int | str, optional): Page size. Default 30.
+            order_status (int, optional): Order status, e.g. 10 waiting for payment, 20 waiting for release, 50 finished.
+            begin_time (int | str, optional): Orders created at or after this time, ms.
+            end_time (int | str, optional): Orders created at or before this time, ms.
+            token_id (str, optional): Token id, like USDT.
+            side (str, optional): "buy" or "sell".
+            raw (bool, optional): Return raw API dicts instead of Order instances. Default False.
+            fields (Iterable[str], optional): Keep only these API keys of every order.
+
+        Returns:
+            Tuple[bool, Union[Tuple[int, str], Tuple[int, List[Order]]]]: Success status and tuple. If success tuple is total_count and a list of Order instances. If not success tuple is retCode and retMsg.
+        """
+
+        params = {
+            "page": page,
+            "size": int(size),
+        }
+
+        if order_status is not None:
+            params["status"] = int(order_status)
+        if begin_time is not None:
+            params["beginTime"] = begin_time
+        if end_time is not None:
+            params["endTime"] = end_time
+        if token_id:
+            params["tokenId"] = token_id
+        if side:
+            params["side"] = [0 if side.lower() == "buy" else 1]
+
+        status, data = await self._cached_request(
+            method=P2PMethods.GET_ORDERS,
+            params=params
+        )
+
+        if not status:
+            return status, data
+
+        items = data.get("items") or []
+        if fields is not None:
+            items = _project(items, fields)
+        if not raw:
+            items = [Order.from_dict(item) for item in items]
+
+        return status, (int(data["count"]), items)
+
+    async def iter_orders(
+        self,
+        size: int = 30,
+        concurrency: int = 5,
+        max_pages: int = None,
+        **filters
+    ) -> AsyncIterator[Order]:
+        """
+        Iterate over all orders matching the filters, page after page. Works like iter_market_ads().
+
+        Args:
+            size (int, optional): Page size. Default 30.
+            concurrency (int, optional): Pages requested at the same time. Default 5.
+            max_pages (int, optional): Stop after this many pages.
+            **filters: Any get_orders() argument except page and size.
+
+        Raises:
+            FailedRequestError: A page was answered with a non-zero retCode.
+
+        Yields:
+            Order: Orders in page order.
+        """
+
+        async def fetch_page(page):
+            return await self.get_orders(page=page, size=size, **filters)
+
+        async for order in self._iter_pages(fetch_page, size, concurrency, max_pages):
+            yield order
+
+    async def get_order(
+        self,
+        order_id: int | str,
+        raw: bool = False
+    ) -> Tuple[bool, Union[Tuple[int, str], OrderDetail]]:
+        """
+        Get order details.
+
+        Args:
+            order_id (int | str): Order id.
+            raw (bool, optional): Return the raw API dict instead of an OrderDetail instance. Default False.
+
+        Returns:
+            Tuple[bool, Union[Tuple[int, str], OrderDetail]]: Success status and OrderDetail instance if success. If not success tuple is retCode and retMsg.
+        """
+
+        status, data = await self._cached_request(
+            method=P2PMethods.GET_ORDER_DETAIL,
+            params={"orderId": str(order_id)}
+        )
+
+        if not status:
+            return status, data
+
+        return status, data if raw else OrderDetail.from_dict(data)
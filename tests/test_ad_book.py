@@ -0,0 +1,66 @@
+import random
+
+from benchmarks._payloads import market_ads
+from bybit_p2p_async import AdBook
+
+
+def _expected(book, min_price=None, max_price=None, payments=None, min_finish_rate=None, amount=None,
+              exclude_user_ids=None):
+    mask = book.payment_mask(payments) if payments is not None else None
+    excluded = set(exclude_user_ids or ())
+    return [
+        book.ids[i] for i in range(len(book))
+        if (min_price is None or book.prices[i] >= min_price)
+        and (max_price is None or book.prices[i] <= max_price)
+        and (mask is None or book.payment_masks[i] & mask)
+        and (min_finish_rate is None or book.finish_rates[i] >= min_finish_rate)
+        and (amount is None or book.min_amounts[i] <= amount <= book.max_amounts[i])
+        and book.user_ids[i] not in excluded
+    ]
+
+
+def test_filter_matches_a_row_by_row_scan():
+    rng = random.Random(7)
+    for side in (0, 1):
+        book = AdBook(market_ads(300, side=side, seed=side))
+        prices = sorted(book.prices)
+        for _ in range(200):
+            conditions = {}
+            if rng.random() < 0.5:
+                conditions["min_price"] = rng.choice(prices)
+            if rng.random() < 0.5:
+                conditions["max_price"] = rng.choice(prices)
+            if rng.random() < 0.5:
+                conditions["payments"] = rng.sample(sorted(book.payment_index), 2)
+            if rng.random() < 0.5:
+                conditions["min_finish_rate"] = rng.choice(list(book.finish_rates))
+            if rng.random() < 0.5:
+                conditions["amount"] = rng.uniform(0, 500000)
+            if rng.random() < 0.3:
+                conditions["exclude_user_ids"] = rng.sample(list(book.user_ids), 20)
+
+            filtered = book.filter(**conditions)
+            assert list(filtered.ids) == _expected(book, **conditions)
+            assert abs(filtered.depth() - sum(
+                min(high, quantity * price)
+                for high, quantity, price in zip(filtered.max_amounts, filtered.last_quantities, filtered.prices)
+            )) < 1e-6
+
+
+def test_payment_bits_follow_first_appearance():
+    items = market_ads(50)
+    seen = list(dict.fromkeys(payment for item in sorted(items, key=lambda item: float(item["price"]))
+                              for payment in item["payments"]))
+    assert list(AdBook(items).payment_index) == seen
+
+
+def test_best_match_is_the_first_row_of_filter():
+    book = AdBook(market_ads(300))
+    for amount in (1000.0, 50000.0, 10 ** 9):
+        for payments in (["75"], ["14", "581"], ["unknown"]):
+            filtered = book.filter(payments=payments, amount=amount)
+            index = book.best_match(payments=payments, amount=amount)
+            if len(filtered):
+                assert book.ids[index] == filtered.ids[0]
+            else:
+                assert index is None
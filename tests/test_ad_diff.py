@@ -0,0 +1,35 @@
+from benchmarks._payloads import market_ads
+from bybit_p2p_async import AdSnapshotDiffer
+
+
+def test_diff_reports_added_removed_and_unchanged_ads():
+    ads = market_ads(10)
+    differ = AdSnapshotDiffer()
+
+    first = differ.diff(ads[:8])
+    assert len(first.added) == 8 and first.unchanged == 0
+
+    second = differ.diff(ads[2:])
+    assert [ad["id"] for ad in second.added] == [ads[8]["id"], ads[9]["id"]]
+    assert [ad["id"] for ad in second.removed] == [ads[0]["id"], ads[1]["id"]]
+    assert not second.changed
+    assert second.unchanged == 6
+
+
+def test_floating_price_change_is_reported_with_the_version_unchanged():
+    ads = market_ads(3)
+    for ad in ads:
+        ad["priceType"] = 1
+        ad["premium"] = "101.5"
+
+    differ = AdSnapshotDiffer()
+    differ.diff(ads)
+
+    # The index moved: Bybit reprices the ad without touching version or updateDate.
+    moved = [dict(ad) for ad in ads]
+    moved[1]["price"] = "96.31"
+
+    diff = differ.diff(moved)
+    assert [change.id for change in diff.changed] == [ads[1]["id"]]
+    assert diff.changed[0].fields == ("price",)
+    assert diff.unchanged == 2
@@ -0,0 +1,32 @@
+import asyncio
+
+from benchmarks._fake_server import FakeBybitServer
+from bybit_p2p_async import AdHistoryReader, AdHistoryWriter, MarketSpec, P2P
+from bybit_p2p_async._ad_book import SIDE_SELL
+
+
+def test_market_ads_and_scans_are_filed_under_the_ad_side(tmp_path):
+    path = str(tmp_path / "history.bpah")
+
+    async def record():
+        async with FakeBybitServer() as server:
+            async with P2P(api_key="k", api_secret="s", base_url=server.url, rate_limit=False) as api:
+                status, (count, ads) = await api.get_market_ads(token_id="USDT", currency_id="RUB", side="buy", size=20)
+                snapshot = await api.scan_markets([MarketSpec("USDT", "RUB", side="buy", size=20)])
+
+        with AdHistoryWriter(path) as history:
+            history.append(ads, 1730000000000)
+            history.append_snapshot(snapshot, 1730000002000)
+        return ads
+
+    ads = asyncio.run(record())
+    assert {ad.side for ad in ads} == {"sell"}
+
+    with AdHistoryReader(path) as history:
+        assert history.markets == ["USDT/RUB/sell"]
+        snapshots = list(history.snapshots(market="USDT/RUB/sell"))
+        assert len(snapshots) == 2
+        for snapshot in snapshots:
+            assert snapshot.side == SIDE_SELL
+            assert {item["side"] for item in snapshot.items()} == {"1"}
+            assert snapshot.to_book().side == SIDE_SELL
@@ -0,0 +1,113 @@
+import asyncio
+
+from bybit_p2p_async import ResponseCache
+from bybit_p2p_async._p2p_method import P2PMethod
+
+METHOD = P2PMethod("/v5/test", "POST", [])
+
+
+class _Fetcher:
+    """
+    Returns 1, 2, 3... on successive calls, each after `release` is set.
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.release = asyncio.Event()
+        self.release.set()
+
+    async def __call__(self):
+        self.calls += 1
+        value = self.calls
+        await self.release.wait()
+        return True, value
+
+
+def test_concurrent_identical_calls_share_one_request():
+    async def scenario():
+        cache = ResponseCache({METHOD: 10.0})
+        fetch = _Fetcher()
+        fetch.release.clear()
+
+        calls = [asyncio.ensure_future(cache.get_or_fetch(METHOD, {"a": 1}, fetch)) for _ in range(5)]
+        await asyncio.sleep(0)
+        fetch.release.set()
+        results = await asyncio.gather(*calls)
+
+        # Other params are another request.
+        other = await cache.get_or_fetch(METHOD, {"a": 2}, fetch)
+        cached = await cache.get_or_fetch(METHOD, {"a": 1}, fetch)
+        return results, other, cached, fetch.calls, cache.stats()
+
+    results, other, cached, calls, stats = asyncio.run(scenario())
+
+    assert results == [(True, 1)] * 5
+    assert other == (True, 2)
+    assert cached == (True, 1)
+    assert calls == 2
+    assert stats["misses"] == 2
+    assert stats["coalesced"] == 4
+    assert stats["hits"] == 1
+
+
+def test_stale_result_is_served_while_one_refresh_runs():
+    async def scenario():
+        cache = ResponseCache({METHOD: 0.05}, stale_while_revalidate=10.0)
+        fetch = _Fetcher()
+
+        assert await cache.get_or_fetch(METHOD, {}, fetch) == (True, 1)
+        await asyncio.sleep(0.06)
+
+        fetch.release.clear()
+        stale = [await cache.get_or_fetch(METHOD, {}, fetch) for _ in range(3)]
+        assert cache.stats()["inflight"] == 1
+        fetch.release.set()
+        await asyncio.sleep(0.01)
+
+        fresh = await cache.get_or_fetch(METHOD, {}, fetch)
+        return stale, fresh, fetch.calls, cache.stats()
+
+    stale, fresh, calls, stats = asyncio.run(scenario())
+
+    assert stale == [(True, 1)] * 3
+    assert fresh == (True, 2)
+    assert calls == 2
+    assert stats["stale_hits"] == 3
+    assert stats["hits"] == 1
+
+
+def test_result_of_a_request_invalidated_in_flight_is_not_stored():
+    async def scenario():
+        cache = ResponseCache({METHOD: 10.0})
+        fetch = _Fetcher()
+        fetch.release.clear()
+
+        call = asyncio.ensure_future(cache.get_or_fetch(METHOD, {}, fetch))
+        await asyncio.sleep(0)
+        # E.g. the ad was just updated: the answer on the way may predate the update.
+        cache.invalidate(METHOD)
+        fetch.release.set()
+        first = await call
+
+        second = await cache.get_or_fetch(METHOD, {}, fetch)
+        return first, second, fetch.calls
+
+    first, second, calls = asyncio.run(scenario())
+
+    # The caller still gets its answer, but the next call asks again.
+    assert first == (True, 1)
+    assert second == (True, 2)
+    assert calls == 2
+
+
+def test_failed_results_are_not_cached():
+    async def scenario():
+        cache = ResponseCache({METHOD: 10.0})
+        answers = [(False, (10016, "error")), (True, "ok")]
+
+        async def fetch():
+            return answers.pop(0)
+
+        return [await cache.get_or_fetch(METHOD, {}, fetch) for _ in range(3)]
+
+    assert asyncio.run(scenario()) == [(False, (10016, "error")), (True, "ok"), (True, "ok")]
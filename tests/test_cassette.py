@@ -0,0 +1,53 @@
+import asyncio
+import gzip
+import json
+
+import pytest
+
+from benchmarks._fake_server import FakeBybitServer
+from bybit_p2p_async import P2P, RecordingTransport, ReplayTransport
+from bybit_p2p_async._exceptions import CassetteMissError
+
+
+def test_recorded_session_replays_without_the_server(tmp_path):
+    path = tmp_path / "session.jsonl.gz"
+
+    async def record():
+        async with FakeBybitServer() as server:
+            async with RecordingTransport(path, redact_fields=["email"]) as recorder:
+                async with P2P(api_key="secret-key", api_secret="s", base_url=server.url, transport=recorder, rate_limit=False) as api:
+                    info = await api.get_account_information()
+                    balance = await api.get_current_balance()
+                return info, balance, recorder.recorded
+
+    async def replay():
+        replayer = ReplayTransport(path, repeat=False)
+        async with P2P(api_key="other-key", api_secret="t", transport=replayer, rate_limit=False) as api:
+            info = await api.get_account_information()
+            balance = await api.get_current_balance()
+            with pytest.raises(CassetteMissError):
+                await api.get_current_balance()
+        return info, balance, replayer
+
+    recorded_info, recorded_balance, count = asyncio.run(record())
+    info, balance, replayer = asyncio.run(replay())
+
+    assert count == 2
+    assert replayer.entries == 2 and replayer.replayed == 2 and replayer.misses == 1
+    assert info[0] and balance[0]
+    assert info[1].nickname == recorded_info[1].nickname
+    assert info[1].email == "***"
+    coins = [(coin.name, coin.wallet_balance) for coin in balance[1][2]]
+    assert coins == [(coin.name, coin.wallet_balance) for coin in recorded_balance[1][2]]
+
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        text = f.read()
+    entries = [json.loads(line) for line in text.splitlines()][1:]
+
+    assert "secret-key" not in text
+    for entry in entries:
+        headers = dict(entry["headers"])
+        assert headers["X-BAPI-API-KEY"] == "***"
+        assert headers["X-BAPI-SIGN"] == "***"
+        assert headers["X-BAPI-TIMESTAMP"] != "***"
+    assert json.loads(entries[0]["response"])["result"]["email"] == "***"
@@ -0,0 +1,80 @@
+import asyncio
+import json
+import time
+
+from bybit_p2p_async import P2P, ServerClock
+from bybit_p2p_async._clock import SERVER_TIME_PATH
+from bybit_p2p_async._p2p_method import P2PMethod
+from bybit_p2p_async._retry import NON_IDEMPOTENT
+from bybit_p2p_async._transport import TransportResponse
+
+# How far the fake server's clock is ahead of the local one, ms.
+SKEW = 10000
+
+
+class _Transport:
+    """
+    A server whose clock is SKEW ahead. API requests get the given retCodes in turn.
+    """
+
+    closed = False
+
+    def __init__(self, *ret_codes):
+        self.ret_codes = list(ret_codes)
+        self.time_requests = 0
+        self.timestamps = []
+
+    async def request(self, http_method, url, headers=None, data=None):
+        server_ms = int(time.time() * 10 ** 3) + SKEW
+        if url.endswith(SERVER_TIME_PATH):
+            self.time_requests += 1
+            result = {"timeSecond": str(server_ms // 1000), "timeNano": str(server_ms * 10 ** 6)}
+            return TransportResponse(200, {}, json.dumps({"retCode": 0, "retMsg": "OK", "result": result, "time": server_ms}).encode())
+
+        self.timestamps.append(int(headers["X-BAPI-TIMESTAMP"]))
+        ret_code = self.ret_codes.pop(0)
+        return TransportResponse(200, {}, json.dumps({"retCode": ret_code, "retMsg": "", "result": {}, "time": server_ms}).encode())
+
+    def pool_stats(self) -> dict:
+        return {"limit": 0, "limit_per_host": 0, "acquired": 0, "idle": 0}
+
+    async def close(self) -> None:
+        pass
+
+
+def test_requests_are_stamped_with_server_time():
+    transport = _Transport(0)
+    clock = ServerClock(samples=3)
+
+    async def scenario():
+        async with P2P(api_key="k", api_secret="s", transport=transport, rate_limit=False, clock=clock) as api:
+            return await api._request(P2PMethod("/v5/test", "GET", []))
+
+    started = int(time.time() * 10 ** 3)
+    assert asyncio.run(scenario()) == (True, {})
+
+    assert transport.time_requests == 3
+    assert abs(transport.timestamps[0] - (started + SKEW)) < 1000
+    assert abs(clock.offset - SKEW) < 1000
+
+
+def test_rejected_timestamp_invalidates_the_clock_and_retries(monkeypatch):
+    monkeypatch.setattr(NON_IDEMPOTENT, "base_delay", 0.0)
+    # 10002: the timestamp is outside recv_window.
+    transport = _Transport(10002, 0)
+    clock = ServerClock(samples=1)
+    invalidated = []
+    invalidate = clock.invalidate
+    monkeypatch.setattr(clock, "invalidate", lambda: invalidated.append(True) or invalidate())
+
+    async def scenario():
+        async with P2P(api_key="k", api_secret="s", transport=transport, rate_limit=False, clock=clock) as api:
+            return await api._request(P2PMethod("/v5/test", "POST", [], retry_policy=NON_IDEMPOTENT))
+
+    assert asyncio.run(scenario()) == (True, {})
+
+    assert invalidated == [True]
+    assert len(transport.timestamps) == 2
+    # The second attempt synced again before it was signed.
+    assert transport.time_requests == 2
+    assert clock.syncs == 2
@@ -0,0 +1,46 @@
+import importlib.util
+
+import pytest
+
+from bybit_p2p_async import JsonCodec, MsgspecCodec, OrjsonCodec
+from bybit_p2p_async._codec import default_codec
+
+DATA = {"page": 1, "items": [{"id": "19", "price": "92.50", "payments": ["377"]}], "ok": True, "remark": "Привет"}
+
+
+def _codecs():
+    codecs = [JsonCodec]
+    for cls, module in ((OrjsonCodec, "orjson"), (MsgspecCodec, "msgspec")):
+        missing = importlib.util.find_spec(module) is None
+        codecs.append(pytest.param(cls, marks=pytest.mark.skipif(missing, reason=f"{module} is not installed")))
+    return codecs
+
+
+@pytest.mark.parametrize("cls", _codecs())
+def test_round_trip(cls):
+    codec = cls()
+    body = codec.dumps(DATA)
+
+    assert isinstance(body, bytes)
+    assert codec.loads(body) == DATA
+    # Any codec reads what another one wrote.
+    assert JsonCodec().loads(body) == DATA
+
+
+@pytest.mark.parametrize("cls", _codecs())
+def test_malformed_input_raises_a_decode_error(cls):
+    codec = cls()
+
+    with pytest.raises(codec.decode_errors):
+        codec.loads(b'{"retCode":0,')
+
+
+def test_default_codec_is_the_fastest_installed_one():
+    codec = default_codec()
+
+    try:
+        import orjson  # noqa: F401
+    except ImportError:
+        assert codec.name in ("msgspec", "json")
+    else:
+        assert codec.name == "orjson"
@@ -0,0 +1,24 @@
+import asyncio
+
+from benchmarks._fake_server import FakeBybitServer
+from bybit_p2p_async import P2P
+
+
+def test_signed_requests_pass_the_server_signature_check():
+    async def scenario():
+        async with FakeBybitServer(api_key="key", api_secret="secret") as server:
+            async with P2P(api_key="key", api_secret="secret", base_url=server.url, rate_limit=False, time_sync=True) as api:
+                results = [
+                    await api.get_market_ads(currency_id="RUB", size=3),
+                    await api.get_ads_list(size=3),
+                    await api.get_account_information(),
+                    await api.get_current_balance(),
+                ]
+                synced = api.clock_stats()["synced"]
+            return results, synced, server.requests
+
+    results, synced, requests = asyncio.run(scenario())
+
+    assert [status for status, _ in results] == [True] * 4
+    assert synced
+    assert requests > 4
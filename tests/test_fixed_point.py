@@ -0,0 +1,63 @@
+from decimal import Decimal
+
+import pytest
+
+from benchmarks._payloads import market_ad
+from bybit_p2p_async import format_fixed, from_fixed, to_fixed
+from bybit_p2p_async._classes import MarketAd
+
+
+@pytest.mark.parametrize("value, scale, expected", [
+    ("92.59", 2, 9259),
+    ("92.5", 2, 9250),
+    ("92", 2, 9200),
+    (".5", 2, 50),
+    ("92.585", 2, 9259),
+    ("92.584", 2, 9258),
+    ("1e-2", 2, 1),
+    ("-0.5", 2, -50),
+    ("-92.585", 2, -9259),
+    (0.1, 2, 10),
+    (7, 4, 70000),
+    (Decimal("1.00005"), 4, 10001),
+    ("12.3456", 0, 12),
+])
+def test_to_fixed(value, scale, expected):
+    assert to_fixed(value, scale) == expected
+
+
+def test_to_fixed_rejects_garbage():
+    with pytest.raises(ValueError):
+        to_fixed("12,5", 2)
+
+
+@pytest.mark.parametrize("value, scale, expected", [
+    (9259, 2, "92.59"),
+    (5, 2, "0.05"),
+    (-5, 2, "-0.05"),
+    (-9259, 2, "-92.59"),
+    (12, 0, "12"),
+    (10001, 4, "1.0001"),
+])
+def test_format_fixed_round_trips(value, scale, expected):
+    assert format_fixed(value, scale) == expected
+    assert to_fixed(expected, scale) == value
+    assert from_fixed(value, scale) == float(expected)
+
+
+def test_market_ad_values_use_the_scale_of_their_currency():
+    data = market_ad(0)
+    data["price"] = "510.7"
+    data["symbolInfo"]["currency"]["scale"] = 0
+    data["symbolInfo"]["token"]["scale"] = "6"
+    ad = MarketAd.from_dict(data)
+
+    assert (ad.price_scale, ad.quantity_scale) == (0, 6)
+    assert ad.price_fixed == 511
+    assert ad.quantity_fixed == to_fixed(data["quantity"], 6)
+
+    # Without symbolInfo fiat values have 2 decimals and token values 4.
+    del data["symbolInfo"]
+    ad = MarketAd.from_dict(data)
+    assert (ad.price_scale, ad.quantity_scale) == (2, 4)
+    assert ad.price_fixed == 51070
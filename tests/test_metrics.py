@@ -0,0 +1,45 @@
+import asyncio
+
+from bybit_p2p_async import Metrics, P2P
+from bybit_p2p_async._transport import TransportResponse
+
+BALANCE = "/v5/asset/transfer/query-account-coins-balance"
+
+
+class _Transport:
+    """
+    Answers every request with an empty successful result and keeps what was sent.
+    """
+
+    closed = False
+
+    def __init__(self):
+        self.requests = []
+
+    async def request(self, http_method, url, headers=None, data=None):
+        self.requests.append((http_method, url, data))
+        return TransportResponse(200, {}, b'{"retCode":0,"retMsg":"success","result":{"accountType":"FUND","memberId":"1","balance":[]},"time":0}')
+
+    def pool_stats(self) -> dict:
+        return {"limit": 0, "limit_per_host": 0, "acquired": 0, "idle": 0}
+
+    async def close(self) -> None:
+        pass
+
+
+def test_bytes_sent_counts_encoded_query_bytes():
+    metrics = Metrics()
+    transport = _Transport()
+
+    async def scenario():
+        async with P2P(api_key="k", api_secret="s", transport=transport, rate_limit=False, metrics=metrics) as api:
+            await api.get_current_balance(member_id="участник")
+
+    asyncio.run(scenario())
+
+    query = "accountType=FUND&memberId=участник&withBonus=0"
+    assert transport.requests[0][1].endswith(f"{BALANCE}?{query}")
+    assert len(query.encode("utf-8")) > len(query)
+    assert metrics.bytes_sent[BALANCE] == len(query.encode("utf-8"))
+    assert metrics.ret_codes[BALANCE, 0] == 1
+    assert f'sent_bytes_total{{endpoint="{BALANCE}"}} {len(query.encode("utf-8"))}' in metrics.render()
@@ -0,0 +1,33 @@
+from benchmarks import _legacy
+from benchmarks._payloads import market_ads
+from bybit_p2p_async._classes import MarketAd, PaymentTerm
+
+# Attributes the eager 1.0.1 models kept as the raw nested dicts or converted differently.
+NESTED = {"symbol_info", "trading_preference_set", "payment_terms"}
+
+
+def test_lazy_market_ad_reads_like_the_eager_one():
+    for raw in market_ads(20, side=0):
+        expected = vars(_legacy.MarketAd(**raw))
+        ad = MarketAd.from_dict(raw)
+
+        for name, value in expected.items():
+            if name not in NESTED:
+                assert getattr(ad, name) == value, name
+        assert [term.id for term in ad.payment_terms] == [int(term["id"]) for term in raw["paymentTerms"]]
+        assert all(isinstance(term, PaymentTerm) for term in ad.payment_terms)
+
+
+def test_fields_are_decoded_on_first_read_and_cached():
+    raw = market_ads(1)[0]
+    ad = MarketAd.from_dict(raw)
+
+    assert not hasattr(ad, "__dict__")
+    assert ad._data is raw
+
+    price = ad.price
+    assert price == float(raw["price"])
+    # A later change of the raw dict does not reach the decoded value.
+    raw["price"] = "1.00"
+    assert ad.price == price
+    assert ad.symbol_info is ad.symbol_info
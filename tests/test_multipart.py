@@ -0,0 +1,45 @@
+import asyncio
+
+from bybit_p2p_async._multipart import MultipartFile
+from bybit_p2p_async._signer import create_signer
+
+TIMESTAMP = 1760000000000
+
+
+def _read(upload: MultipartFile) -> bytes:
+    async def scenario():
+        return b"".join([chunk async for chunk in upload.body()])
+
+    return asyncio.run(scenario())
+
+
+def test_body_is_streamed_in_chunks_and_can_be_read_again(tmp_path):
+    path = tmp_path / "receipt.png"
+    content = bytes(range(256)) * 40
+    path.write_bytes(content)
+    upload = MultipartFile(path, chunk_size=1000)
+
+    body = _read(upload)
+
+    assert body == upload.head + content + upload.tail
+    assert b'filename="receipt.png"' in upload.head
+    assert b"Content-Type: image/png" in upload.head
+    assert upload.size == len(body)
+    assert upload.content_type == "multipart/form-data; boundary=boundary-for-file"
+    # A retry reads the file again.
+    assert _read(upload) == body
+
+
+def test_streamed_signature_equals_the_one_shot_one(tmp_path):
+    path = tmp_path / "statement.pdf"
+    path.write_bytes(b"%PDF" + b"x" * 5000)
+    upload = MultipartFile(path, chunk_size=512)
+    body = _read(upload)
+    signer = create_signer("key", "secret", 5000)
+
+    async def scenario():
+        stream = signer.stream(TIMESTAMP)
+        await upload.feed(stream.update)
+        return await signer.afinish(stream)
+
+    assert asyncio.run(scenario()) == signer.sign(TIMESTAMP, body)
@@ -0,0 +1,161 @@
+import asyncio
+import json
+
+from benchmarks import _payloads
+from benchmarks._fake_server import FakeBybitServer
+from bybit_p2p_async import JsonCodec, OrderStore, OrderSync, P2P
+from bybit_p2p_async._classes import OrderDetail
+from bybit_p2p_async._transport import TransportResponse
+
+NOW = 1760000000000
+MINUTE = 60 * 1000
+HOUR = 60 * MINUTE
+
+
+def _orders() -> list:
+    # 40 orders ten minutes apart, newest first. The newest one and two older ones are still open.
+    return [
+        _payloads.order(i, NOW - i * 10 * MINUTE, status=10 if i in (0, 5, 30) else 50)
+        for i in range(40)
+    ]
+
+
+def _sync(client, store=None, **kwargs) -> OrderSync:
+    return OrderSync(client, store, window=3600, overlap=60, initial_lookback=8 * 3600, page_size=4, **kwargs)
+
+
+def test_first_sync_lists_every_window():
+    async def scenario():
+        async with FakeBybitServer() as server:
+            server.orders = _orders()
+            async with P2P(api_key="k", api_secret="s", base_url=server.url, rate_limit=False) as api:
+                sync = _sync(api)
+                changed = await sync.sync(now=NOW)
+                return server.orders, sync, changed
+
+    orders, sync, changed = asyncio.run(scenario())
+    store = sync.store
+
+    assert sync.windows(NOW - 8 * HOUR, NOW) == [
+        (NOW - (8 - i) * HOUR, min(NOW, NOW - (7 - i) * HOUR + MINUTE)) for i in range(8)
+    ]
+    assert sync.last_sync["windows"] == 8
+    # Orders on a window boundary are listed by both windows and stored once.
+    assert sync.last_sync["listed"] > len(orders)
+    assert len(changed) == len(store) == len(orders)
+    assert set(store) == {order["id"] for order in orders}
+    assert sorted(order.id for order in store.open_orders()) == sorted(orders[i]["id"] for i in (0, 5, 30))
+    assert store.high_water_mark == NOW
+
+
+def test_incremental_sync_picks_up_new_orders_and_status_changes():
+    async def scenario():
+        async with FakeBybitServer() as server:
+            server.orders = orders = _orders()
+            async with P2P(api_key="k", api_secret="s", base_url=server.url, rate_limit=False) as api:
+                sync = _sync(api)
+                await sync.sync(now=NOW)
+
+                # Inside the overlap with the previous sync.
+                orders[0]["status"] = 20
+                # Long before it: only get_order() can see this one finish.
+                orders[30]["status"] = 50
+                new = _payloads.order(100, NOW + 5 * MINUTE, status=10)
+                orders.insert(0, new)
+
+                changed = await sync.sync(now=NOW + 10 * MINUTE)
+                return orders, sync, changed
+
+    orders, sync, changed = asyncio.run(scenario())
+    store = sync.store
+
+    assert sync.last_sync["start"] == NOW - MINUTE
+    assert sync.last_sync["windows"] == 1
+    # The open orders created before the listed range.
+    assert sync.last_sync["refreshed"] == 2
+    assert {order.id: order.status for order in changed} == {
+        orders[0]["id"]: 10,
+        orders[1]["id"]: 20,
+        orders[31]["id"]: 50,
+    }
+    assert isinstance(store[orders[31]["id"]], OrderDetail)
+    assert len(store) == 41
+    assert store.high_water_mark == NOW + 10 * MINUTE
+
+
+def test_load_after_save_continues_the_sync(tmp_path):
+    path = tmp_path / "orders.json"
+
+    async def scenario():
+        async with FakeBybitServer() as server:
+            server.orders = orders = _orders()
+            async with P2P(api_key="k", api_secret="s", base_url=server.url, rate_limit=False) as api:
+                sync = _sync(api)
+                await sync.sync(now=NOW)
+                orders[30]["status"] = 50
+                await sync.sync(now=NOW + MINUTE)
+                sync.store.save(path)
+
+                loaded = OrderStore.load(path)
+                assert loaded.high_water_mark == sync.store.high_water_mark
+                assert list(loaded) == list(sync.store)
+                for order_id, order in zip(sync.store, sync.store.values()):
+                    assert type(loaded[order_id]) is type(order)
+                    assert loaded[order_id]._data == order._data
+
+                resumed = _sync(api, loaded, details=True)
+                new = _payloads.order(100, NOW + 2 * MINUTE, status=10)
+                orders.insert(0, new)
+                first = await resumed.sync(now=NOW + 3 * MINUTE)
+
+                # A list row of an order stored with its details updates the details.
+                new["status"] = 20
+                second = await resumed.sync(now=NOW + 4 * MINUTE)
+                return new, resumed, first, second
+
+    new, resumed, first, second = asyncio.run(scenario())
+    store = resumed.store
+
+    assert resumed.last_sync["start"] == NOW + 3 * MINUTE - MINUTE
+    assert [order.id for order in first] == [new["id"]]
+    assert [order.id for order in second] == [new["id"]]
+    stored = store[new["id"]]
+    assert isinstance(stored, OrderDetail)
+    assert stored.status == 20
+    assert stored._data["nickName"] == "my_desk"
+
+
+class _Transport:
+    closed = False
+
+    def __init__(self):
+        self.bodies = []
+
+    async def request(self, http_method, url, headers=None, data=None):
+        self.bodies.append(data)
+        return TransportResponse(200, {}, b'{"retCode":0,"retMsg":"success","result":{"count":0,"items":[]},"time":0}')
+
+    def pool_stats(self) -> dict:
+        return {"limit": 0, "limit_per_host": 0, "acquired": 0, "idle": 0}
+
+    async def close(self) -> None:
+        pass
+
+
+def test_get_orders_sends_page_size_status_and_side_as_integers():
+    transport = _Transport()
+
+    async def scenario():
+        async with P2P(api_key="k", api_secret="s", transport=transport, rate_limit=False, codec=JsonCodec()) as api:
+            await api.get_orders(page="2", order_status=50, begin_time=NOW, token_id="USDT", side="sell")
+
+    asyncio.run(scenario())
+
+    assert json.loads(transport.bodies[0]) == {
+        "page": 2,
+        "size": 30,
+        "status": 50,
+        "beginTime": str(NOW),
+        "tokenId": "USDT",
+        "side": [1],
+    }
@@ -0,0 +1,67 @@
+import asyncio
+
+import pytest
+
+from bybit_p2p_async import P2P
+from bybit_p2p_async._exceptions import FailedRequestError
+
+
+class _Pages:
+    """
+    `total` items in pages of `size`, answered in reverse order of request to shuffle completion.
+    """
+
+    def __init__(self, total, size, fail_page=None):
+        self.total = total
+        self.size = size
+        self.fail_page = fail_page
+        self.requested = []
+        self.inflight = 0
+        self.max_inflight = 0
+
+    async def __call__(self, page):
+        self.requested.append(page)
+        self.inflight += 1
+        self.max_inflight = max(self.max_inflight, self.inflight)
+        await asyncio.sleep(0.001 * (10 - page % 10))
+        self.inflight -= 1
+
+        if page == self.fail_page:
+            return False, (10000, "server timeout")
+        start = (page - 1) * self.size
+        return True, (str(self.total), list(range(start, min(self.total, start + self.size))))
+
+
+def _walk(pages, **kwargs):
+    async def scenario():
+        api = P2P(api_key="k", api_secret="s")
+        return [item async for item in api._iter_pages(pages, pages.size, **kwargs)]
+
+    return asyncio.run(scenario())
+
+
+def test_pages_are_yielded_in_order_within_the_concurrency_limit():
+    pages = _Pages(total=95, size=10)
+
+    assert _walk(pages, concurrency=3) == list(range(95))
+    assert sorted(pages.requested) == list(range(1, 11))
+    assert pages.max_inflight == 3
+
+
+def test_max_pages_stops_early():
+    pages = _Pages(total=95, size=10)
+
+    assert _walk(pages, concurrency=3, max_pages=2) == list(range(20))
+    assert sorted(pages.requested) == [1, 2]
+
+
+def test_failed_page_raises_with_its_ret_code():
+    pages = _Pages(total=95, size=10, fail_page=4)
+
+    with pytest.raises(FailedRequestError) as error:
+        _walk(pages, concurrency=3)
+
+    assert error.value.ret_code == 10000
+    assert error.value.status_code == 200
+    assert error.value.request == "page 4"
+    assert "ErrCode: 10000" in str(error.value)
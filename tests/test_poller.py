@@ -0,0 +1,57 @@
+import asyncio
+
+import pytest
+
+from bybit_p2p_async import AdaptivePoller, MarketSpec
+
+
+class _Client:
+    def __init__(self):
+        self.calls = 0
+
+    async def get_market_ads(self, **kwargs):
+        self.calls += 1
+        return True, (0, [])
+
+
+def test_stop_right_after_scheduling_releases_the_market():
+    spec = MarketSpec("USDT", "RUB")
+
+    async def scenario():
+        client = _Client()
+        poller = AdaptivePoller(client, [spec], budget=100.0, min_interval=0.01, concurrency=1)
+        market = poller.markets[spec.key]
+
+        for _ in range(3):
+            # What run() does when stop() lands between scheduling a poll and its first step.
+            await poller._semaphore.acquire()
+            poller._start_poll(market)
+            poller.stop()
+            for task in list(poller._tasks):
+                task.cancel()
+            await asyncio.gather(*poller._tasks, return_exceptions=True)
+
+            assert not market.inflight
+            assert not poller._tasks
+
+        assert client.calls == 0
+        # With a leaked slot or a stuck inflight flag the restarted poller would never poll again.
+        await asyncio.wait_for(poller.run(duration=0.2), 2.0)
+        assert market.polls > 0
+
+    asyncio.run(scenario())
+
+
+def test_add_rejects_a_non_positive_priority():
+    spec = MarketSpec("USDT", "RUB")
+
+    async def scenario():
+        poller = AdaptivePoller(_Client(), [])
+        for priority in (0, -1.0):
+            with pytest.raises(ValueError):
+                poller.add(spec, priority)
+        with pytest.raises(ValueError):
+            AdaptivePoller(_Client(), {spec: 0.0})
+        assert not poller.markets
+
+    asyncio.run(scenario())
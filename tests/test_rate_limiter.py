@@ -0,0 +1,31 @@
+import asyncio
+import time
+
+from bybit_p2p_async import RateLimiter
+
+
+def test_reset_blocks_for_exactly_the_reset_delay():
+    limiter = RateLimiter(default_rate=5.0)
+    bucket = limiter.bucket("ads")
+    reset = 0.7
+
+    async def scenario():
+        limiter.update_from_headers("ads", {
+            "X-Bapi-Limit": "5",
+            "X-Bapi-Limit-Status": "0",
+            "X-Bapi-Limit-Reset-Timestamp": str(int((time.time() + reset) * 1000)),
+        })
+        assert limiter.stats()["ads"]["tokens"] >= 0.0
+
+        started = time.monotonic()
+        waiter = asyncio.ensure_future(limiter.acquire("ads"))
+        while not waiter.done():
+            assert limiter.stats()["ads"]["tokens"] >= 0.0
+            await asyncio.sleep(0.05)
+        return time.monotonic() - started
+
+    waited = asyncio.run(scenario())
+
+    # The header is in whole milliseconds, hence the small tolerance below the delay.
+    assert reset - 0.01 <= waited < reset + 0.1
+    assert bucket.tokens >= 0.0
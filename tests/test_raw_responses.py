@@ -0,0 +1,42 @@
+import asyncio
+import json
+
+from benchmarks._fake_server import FakeBybitServer
+from bybit_p2p_async import P2P
+from bybit_p2p_async._classes import MarketAd
+
+
+def test_raw_projected_and_undecoded_market_ads_agree():
+    async def scenario():
+        async with FakeBybitServer() as server:
+            async with P2P(api_key="k", api_secret="s", base_url=server.url, rate_limit=False) as api:
+                models = await api.get_market_ads(currency_id="RUB", size=5)
+                raw = await api.get_market_ads(currency_id="RUB", size=5, raw=True)
+                projected = await api.get_market_ads(currency_id="RUB", size=5, raw=True, fields=["id", "price"])
+                body = await api.get_market_ads_bytes(currency_id="RUB", size=5)
+        return models, raw, projected, body
+
+    models, raw, projected, body = asyncio.run(scenario())
+
+    status, (count, ads) = models
+    assert status and len(ads) == 5
+    assert all(isinstance(ad, MarketAd) for ad in ads)
+
+    assert raw[0] and raw[1][0] == count
+    assert [item["id"] for item in raw[1][1]] == [str(ad.id) for ad in ads]
+
+    assert projected[1][1] == [{"id": item["id"], "price": item["price"]} for item in raw[1][1]]
+
+    status, data = body
+    assert status and isinstance(data, bytes)
+    assert json.loads(data)["result"]["items"] == raw[1][1]
+
+
+def test_error_bodies_are_decoded_even_in_bytes_mode():
+    async def scenario():
+        # Signatures are checked, so the wrong secret gets retCode 10004.
+        async with FakeBybitServer(api_key="k", api_secret="right") as server:
+            async with P2P(api_key="k", api_secret="wrong", base_url=server.url, rate_limit=False) as api:
+                return await api.get_market_ads_bytes(currency_id="RUB")
+
+    assert asyncio.run(scenario()) == (False, (10004, "error sign!"))
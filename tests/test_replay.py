@@ -0,0 +1,40 @@
+import asyncio
+
+from benchmarks._fake_server import FakeBybitServer
+from bybit_p2p_async import AdHistoryWriter, P2P, ReplayClient
+from bybit_p2p_async._ad_book import SIDE_SELL
+
+
+def test_replay_answers_like_the_live_client(tmp_path):
+    path = str(tmp_path / "history.bpah")
+    request = {"token_id": "USDT", "currency_id": "RUB", "side": "buy"}
+
+    async def live():
+        async with FakeBybitServer() as server:
+            async with P2P(api_key="k", api_secret="s", base_url=server.url, rate_limit=False) as api:
+                _, (_, ads) = await api.get_market_ads(size=50, **request)
+                _, (_, book) = await api.get_ad_book(size=50, **request)
+        return ads, book
+
+    async def replay():
+        client = ReplayClient(path)
+        try:
+            _, (_, ads) = await client.get_market_ads(size=50, **request)
+            _, (_, book) = await client.get_ad_book(**request)
+            _, (_, empty) = await client.get_ad_book(token_id="USDT", currency_id="KZT", side="buy")
+        finally:
+            client.close()
+        return ads, book, empty
+
+    live_ads, live_book = asyncio.run(live())
+    with AdHistoryWriter(path) as history:
+        history.append(live_ads, 1730000000000)
+
+    replay_ads, replay_book, empty = asyncio.run(replay())
+
+    assert [(ad.id, ad.side, ad.price) for ad in replay_ads] == [(ad.id, ad.side, ad.price) for ad in live_ads]
+    assert replay_book.side == live_book.side == SIDE_SELL
+    assert replay_book.best_price() == live_book.best_price()
+    assert list(replay_book.ids) == list(live_book.ids)
+    assert list(replay_book.prices) == list(live_book.prices)
+    assert empty.side == SIDE_SELL
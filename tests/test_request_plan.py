@@ -0,0 +1,57 @@
+from bybit_p2p_async import JsonCodec
+from bybit_p2p_async._p2p_method import P2PMethod
+from bybit_p2p_async._request_plan import RequestPlan
+
+BASE_URL = "https://api.bybit.com"
+
+
+def _plan(http_method: str, required=()) -> RequestPlan:
+    return RequestPlan(P2PMethod("/v5/p2p/test", http_method, list(required)), BASE_URL)
+
+
+def test_post_params_are_cast_without_touching_the_caller_dict():
+    plan = _plan("POST")
+    params = {
+        "itemId": 19,
+        "side": 1,
+        "size": 10.0,
+        "paymentIds": ["377"],
+        "tradingPreferenceSet": {"isKyc": 1, "hasRegisterTime": False},
+        "positionIdx": "2",
+    }
+    original = {key: value for key, value in params.items()}
+
+    prepared = plan.prepare(params)
+
+    assert prepared == {
+        "itemId": "19",
+        "side": "1",
+        "size": 10,
+        "paymentIds": ["377"],
+        "tradingPreferenceSet": {"isKyc": "1", "hasRegisterTime": False},
+        "positionIdx": 2,
+    }
+    assert params == original
+    assert plan.encode(prepared, JsonCodec()) == JsonCodec().dumps(prepared)
+
+
+def test_params_needing_no_cast_are_returned_as_is():
+    plan = _plan("POST")
+    params = {"itemId": "19", "remark": "hi", "payments": ["377", "14"]}
+
+    assert plan.prepare(params) is params
+
+
+def test_get_query_is_sorted_and_skips_none():
+    plan = _plan("GET")
+    params = plan.prepare({"withBonus": 0, "accountType": "FUND", "coin": None, "size": 5.0})
+
+    assert plan.encode(params, JsonCodec()) == "accountType=FUND&size=5&withBonus=0"
+    assert plan.endpoint == BASE_URL + "/v5/p2p/test"
+
+
+def test_missing_required_params_are_listed_in_order():
+    plan = _plan("POST", ["itemId", "price", "quantity"])
+
+    assert plan.missing({"itemId": "19", "price": "92.5", "quantity": "1"}) == []
+    assert plan.missing({"price": "92.5"}) == ["itemId", "quantity"]
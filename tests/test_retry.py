@@ -0,0 +1,104 @@
+import asyncio
+
+import pytest
+
+from bybit_p2p_async import P2P, RetryBudget
+from bybit_p2p_async._exceptions import FailedRequestError
+from bybit_p2p_async._p2p_method import P2PMethod
+from bybit_p2p_async._retry import IDEMPOTENT, NON_IDEMPOTENT
+from bybit_p2p_async._transport import TransportResponse
+
+OK = b'{"retCode":0,"retMsg":"OK","result":{"ok":1},"time":0}'
+
+
+def _ret_code(code: int) -> bytes:
+    return b'{"retCode":%d,"retMsg":"error","result":{},"time":0}' % code
+
+
+class _Transport:
+    """
+    Answers with the given (status, body) pairs in turn, raising the exceptions among them.
+    """
+
+    closed = False
+
+    def __init__(self, *replies):
+        self.replies = list(replies)
+        self.requests = 0
+
+    async def request(self, http_method, url, headers=None, data=None):
+        self.requests += 1
+        reply = self.replies.pop(0)
+        if isinstance(reply, BaseException):
+            raise reply
+        status, body = reply
+        return TransportResponse(status, {}, body)
+
+    def pool_stats(self) -> dict:
+        return {"limit": 0, "limit_per_host": 0, "acquired": 0, "idle": 0}
+
+    async def close(self) -> None:
+        pass
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    for policy in (IDEMPOTENT, NON_IDEMPOTENT):
+        monkeypatch.setattr(policy, "base_delay", 0.0)
+
+
+def _call(transport, policy, retry_budget=None):
+    method = P2PMethod("/v5/test", "GET", [], retry_policy=policy)
+
+    async def scenario():
+        async with P2P(api_key="k", api_secret="s", transport=transport, rate_limit=False, retry_budget=retry_budget) as api:
+            return await api._request(method)
+
+    return asyncio.run(scenario())
+
+
+def test_idempotent_call_retries_5xx_and_transient_ret_codes():
+    transport = _Transport((502, b"Bad Gateway"), (200, _ret_code(10016)), (200, OK))
+
+    assert _call(transport, IDEMPOTENT) == (True, {"ok": 1})
+    assert transport.requests == 3
+
+
+def test_idempotent_call_gives_up_after_max_attempts():
+    transport = _Transport(*[(200, _ret_code(10000))] * 3)
+
+    assert _call(transport, IDEMPOTENT) == (False, (10000, "error"))
+    assert transport.requests == IDEMPOTENT.max_attempts
+
+
+def test_non_idempotent_call_does_not_retry_a_timeout_or_5xx():
+    transport = _Transport(asyncio.TimeoutError())
+    with pytest.raises(asyncio.TimeoutError):
+        _call(transport, NON_IDEMPOTENT)
+    assert transport.requests == 1
+
+    transport = _Transport((503, b""))
+    with pytest.raises(FailedRequestError):
+        _call(transport, NON_IDEMPOTENT)
+    assert transport.requests == 1
+
+
+def test_non_idempotent_call_retries_a_rejected_request():
+    # 10006: too many visits, the request was not executed.
+    transport = _Transport((200, _ret_code(10006)), (200, OK))
+
+    assert _call(transport, NON_IDEMPOTENT) == (True, {"ok": 1})
+    assert transport.requests == 2
+
+
+def test_retry_budget_stops_retries_once_spent():
+    budget = RetryBudget(ratio=0.0, max_tokens=1.0)
+    transport = _Transport((502, b""), (502, b""), (200, OK))
+
+    with pytest.raises(FailedRequestError) as error:
+        _call(transport, IDEMPOTENT, retry_budget=budget)
+
+    assert error.value.status_code == 502
+    assert transport.requests == 2
+    assert budget.retries == 1
+    assert budget.exhausted == 1
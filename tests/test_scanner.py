@@ -0,0 +1,45 @@
+import asyncio
+
+from bybit_p2p_async import MarketScanner, MarketSpec
+from bybit_p2p_async._exceptions import FailedRequestError
+
+
+class _Client:
+    def __init__(self):
+        self.inflight = 0
+        self.max_inflight = 0
+
+    async def get_market_ads(self, **kwargs):
+        self.inflight += 1
+        self.max_inflight = max(self.max_inflight, self.inflight)
+        await asyncio.sleep(0.001)
+        self.inflight -= 1
+
+        currency_id = kwargs["currency_id"]
+        if currency_id == "KZT":
+            return False, (10000, "Server Timeout")
+        if currency_id == "EUR":
+            raise ConnectionError("reset")
+        return True, (1, [f"{kwargs['token_id']}/{currency_id} {kwargs['side']}"])
+
+
+def test_scan_keeps_going_past_failing_markets():
+    specs = MarketSpec.grid(["USDT"], ["RUB", "KZT", "EUR", "USD"])
+    client = _Client()
+
+    async def scenario():
+        return await MarketScanner(client, specs, concurrency=3).scan()
+
+    snapshot = asyncio.run(scenario())
+
+    assert len(specs) == 8
+    assert [result.spec for result in snapshot] == specs
+    assert client.max_inflight == 3
+    assert snapshot.get("USDT", "RUB", "SELL").ads == ["USDT/RUB sell"]
+    assert snapshot.get("USDT", "USD", "buy").total_count == 1
+
+    errors = {result.spec.currency_id: result.error for result in snapshot.errors}
+    assert set(errors) == {"KZT", "EUR"}
+    assert isinstance(errors["KZT"], FailedRequestError)
+    assert errors["KZT"].ret_code == 10000
+    assert isinstance(errors["EUR"], ConnectionError)
@@ -0,0 +1,86 @@
+import asyncio
+
+import pytest
+
+from bybit_p2p_async import FairScheduler
+
+
+async def _worker(scheduler, key, order):
+    async with scheduler.slot(key):
+        order.append(key)
+        await asyncio.sleep(0)
+
+
+def test_free_slots_go_round_robin_by_key():
+    async def scenario():
+        scheduler = FairScheduler(concurrency=1)
+        order = []
+
+        await scheduler.acquire("a")
+        workers = []
+        for key in ["a", "a", "a", "b", "c"]:
+            workers.append(asyncio.ensure_future(_worker(scheduler, key, order)))
+            await asyncio.sleep(0)
+        assert scheduler.waiting == 5
+        assert scheduler.stats()["waiting_by_key"] == {"a": 3, "b": 1, "c": 1}
+
+        scheduler.release()
+        await asyncio.gather(*workers)
+        return order, scheduler
+
+    order, scheduler = asyncio.run(scenario())
+
+    # The busy account does not hold the others back.
+    assert order == ["a", "b", "c", "a", "a"]
+    assert scheduler.active == 0
+    assert scheduler.waiting == 0
+    assert dict(scheduler.granted) == {"a": 4, "b": 1, "c": 1}
+
+
+def test_waiter_cancelled_after_its_slot_was_granted_passes_it_on():
+    async def scenario():
+        scheduler = FairScheduler(concurrency=1)
+        await scheduler.acquire("a")
+
+        first = asyncio.ensure_future(scheduler.acquire("b"))
+        second = asyncio.ensure_future(scheduler.acquire("c"))
+        await asyncio.sleep(0)
+
+        # The slot goes to "b", which is cancelled before it gets to run.
+        scheduler.release()
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+
+        await asyncio.wait_for(second, 1.0)
+        active = scheduler.active
+        scheduler.release()
+        return active, scheduler
+
+    active, scheduler = asyncio.run(scenario())
+
+    assert active == 1
+    assert scheduler.active == 0
+    assert scheduler.waiting == 0
+
+
+def test_waiter_cancelled_in_the_queue_is_forgotten():
+    async def scenario():
+        scheduler = FairScheduler(concurrency=1)
+        await scheduler.acquire("a")
+
+        waiter = asyncio.ensure_future(scheduler.acquire("b"))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+
+        stats = scheduler.stats()
+        scheduler.release()
+        return stats, scheduler
+
+    stats, scheduler = asyncio.run(scenario())
+
+    assert stats["waiting"] == 0
+    assert stats["waiting_by_key"] == {}
+    assert scheduler.active == 0
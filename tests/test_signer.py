@@ -0,0 +1,53 @@
+import asyncio
+import base64
+import hashlib
+import hmac
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from Crypto.Hash import SHA256
+from Crypto.PublicKey import RSA
+from Crypto.Signature import PKCS1_v1_5
+
+from bybit_p2p_async._signer import HmacSigner, RsaSigner, create_signer
+
+TIMESTAMP = 1760000000000
+PAYLOAD = b'{"itemId":"1","side":"1"}'
+
+
+@pytest.fixture(scope="module")
+def rsa_key():
+    return RSA.generate(1024)
+
+
+def test_hmac_signature_matches_the_api_sign_string():
+    signer = create_signer("key", "secret", 5000)
+    expected = hmac.new(b"secret", f"{TIMESTAMP}key5000".encode() + PAYLOAD, hashlib.sha256).hexdigest()
+
+    assert isinstance(signer, HmacSigner)
+    assert signer.sign(TIMESTAMP, PAYLOAD) == expected
+    assert signer.sign(TIMESTAMP, PAYLOAD.decode()) == expected
+    # The prepared hash is copied, not consumed.
+    assert signer.sign(TIMESTAMP, PAYLOAD) == expected
+    assert asyncio.run(signer.asign(TIMESTAMP, PAYLOAD)) == expected
+
+
+def test_rsa_signature_verifies_with_the_public_key(rsa_key):
+    signer = create_signer("key", rsa_key.export_key().decode(), 5000, rsa=True)
+    signature = signer.sign(TIMESTAMP, PAYLOAD)
+
+    assert isinstance(signer, RsaSigner)
+    digest = SHA256.new(f"{TIMESTAMP}key5000".encode() + PAYLOAD)
+    assert PKCS1_v1_5.new(rsa_key.publickey()).verify(digest, base64.b64decode(signature))
+
+
+def test_rsa_signing_off_the_loop_gives_the_same_signature(rsa_key):
+    secret = rsa_key.export_key().decode()
+
+    async def scenario():
+        with ThreadPoolExecutor(2) as executor:
+            signer = create_signer("key", secret, 5000, rsa=True, executor=executor)
+            return await asyncio.gather(*(signer.asign(TIMESTAMP, PAYLOAD) for _ in range(4)))
+
+    expected = create_signer("key", secret, 5000, rsa=True).sign(TIMESTAMP, PAYLOAD)
+    assert asyncio.run(scenario()) == [expected] * 4
@@ -0,0 +1,49 @@
+import asyncio
+
+from aiohttp import web
+
+from bybit_p2p_async import P2PTransport
+
+
+async def _server():
+    async def handle(request):
+        if request.path == "/missing":
+            return web.Response(status=404, text="not found")
+        return web.json_response({"path": request.path, "body": await request.text()})
+
+    app = web.Application()
+    app.router.add_route("*", "/{tail:.*}", handle)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    return runner, f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}"
+
+
+def test_connections_are_kept_alive_across_requests_and_errors():
+    async def scenario():
+        runner, url = await _server()
+        transport = P2PTransport(limit=4)
+        try:
+            first = await transport.request("POST", url + "/a", data=b'{"a":1}')
+            missing = await transport.request("GET", url + "/missing")
+            second = await transport.request("GET", url + "/b")
+            stats = transport.pool_stats()
+            closed_before = transport.closed
+        finally:
+            await transport.close()
+            await runner.cleanup()
+        return first, missing, second, stats, closed_before, transport.closed
+
+    first, missing, second, stats, closed_before, closed_after = asyncio.run(scenario())
+
+    assert (first.status, first.body) == (200, b'{"path": "/a", "body": "{\\"a\\":1}"}')
+    assert missing.status == 404
+    assert second.status == 200
+    # One connection, reused by the requests after the first one, 404 included.
+    assert stats["requests"] == 3
+    assert stats["connections_created"] == 1
+    assert stats["connections_reused"] == 2
+    assert stats["idle"] == 1 and stats["acquired"] == 0
+    assert stats["limit"] == 4
+    assert not closed_before and closed_after
@@ -0,0 +1,32 @@
+import asyncio
+
+from benchmarks._fake_server import FakeBybitServer
+from bybit_p2p_async import P2P
+
+
+def test_update_ad_price_keeps_everything_but_the_price():
+    async def scenario():
+        async with FakeBybitServer() as server:
+            async with P2P(api_key="k", api_secret="s", base_url=server.url, rate_limit=False) as api:
+                status, (count, hidden, ads) = await api.get_ads_list(size=3)
+                ad = ads[0]
+                status, result = await api.update_ad_price(ad, "93.10")
+            return ad, status, server.updates
+
+    ad, status, updates = asyncio.run(scenario())
+    data = ad.to_dict()
+
+    assert status
+    assert len(updates) == 1
+    sent = updates[0]
+    assert sent["id"] == data["id"]
+    assert sent["price"] == "93.10"
+    # The total quantity, not the unfilled remainder.
+    assert sent["quantity"] == data["quantity"] != data["lastQuantity"]
+    assert sent["minAmount"] == data["minAmount"]
+    assert sent["maxAmount"] == data["maxAmount"]
+    assert sent["paymentIds"] == [term["id"] for term in data["paymentTerms"]]
+    # The request plan sends these fields as strings.
+    assert sent["tradingPreferenceSet"] == {key: str(value) for key, value in data["tradingPreferenceSet"].items()}
+    assert sent["remark"] == data["remark"]
+    assert sent["paymentPeriod"] == str(data["paymentPeriod"])